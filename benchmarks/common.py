@@ -0,0 +1,35 @@
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+
+@contextmanager
+def temporary_trace(data: bytes):
+    """
+    Write a trace into a temporary file.
+    :param data: Trace data.
+    :return: Path of the temporary file.
+    """
+    fd, path = tempfile.mkstemp(suffix='.ktrace')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        yield path
+    finally:
+        os.unlink(path)
+
+
+def timeit(func, repeat=3):
+    """
+    Measure the best run time of a function.
+    :param func: Function to run.
+    :param repeat: Number of runs.
+    :return: Best run time in seconds.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -0,0 +1,35 @@
+"""
+Measure the time it takes to decode flags and enum values, with the handlers decoders and by going over the enums.
+Run with `python -m benchmarks.flag_decoders`.
+"""
+from benchmarks.common import timeit
+from pykdebugparser.trace_handlers.bsd import serialize_open_flags
+from pykdebugparser.trace_handlers.mach import to_ast_reasons
+from pykdebugparser.trace_handlers.perf import to_sampler_action
+from pykdebugparser.trace_handlers.turnstile import TurnstileType, to_turnstile_type
+
+CALLS = 0x40000
+# Decoder, values it gets in traces and the same decoding without a table.
+DECODERS = {
+    'to_ast_reasons': (to_ast_reasons, (0x0, 0x1, 0x2, 0x80), to_ast_reasons.__wrapped__),
+    'to_sampler_action': (to_sampler_action, (0x9, 0x109), to_sampler_action.__wrapped__),
+    'serialize_open_flags': (serialize_open_flags, (0x0, 0x1000002, 0x601), serialize_open_flags.__wrapped__),
+    'to_turnstile_type': (to_turnstile_type, (1, 3, 6), TurnstileType),
+}
+
+
+def decode(decoder, values):
+    for i in range(CALLS):
+        decoder(values[i % len(values)])
+
+
+def main():
+    print(f'{"decoder":>22} {"enum":>10} {"table":>10}')
+    for name, (decoder, values, reference) in DECODERS.items():
+        reference_time = timeit(lambda: decode(reference, values))
+        decoder_time = timeit(lambda: decode(decoder, values))
+        print(f'{name:>22} {reference_time / CALLS * 1e9:>8.0f}ns {decoder_time / CALLS * 1e9:>8.0f}ns')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""
+Measure the time it takes to skip the stackshot at the beginning of a trace version 3.
+Run with `python -m benchmarks.header_skip`.
+"""
+from io import BytesIO
+
+from benchmarks.common import temporary_trace, timeit
+from pykdebugparser.kd_buf_parser import KdBufParser
+from pykdebugparser.mmap_reader import MmapReader
+from tests.builders import build_trace_v3
+
+STACKSHOT_SIZES = [0x100000, 0x1000000, 0x4000000]
+
+
+def skip_header(reader):
+    next(KdBufParser().parse_chunks(reader))
+
+
+def main():
+    print(f'{"stackshot":>12} {"stream":>12} {"mmap":>12}')
+    for size in STACKSHOT_SIZES:
+        trace = build_trace_v3([b'\x00' * 64], stackshot=b'\xaa' * size)
+        stream_time = timeit(lambda: skip_header(BytesIO(trace)))
+        with temporary_trace(trace) as path:
+            def skip_mapped():
+                with MmapReader.open(path) as reader:
+                    skip_header(reader)
+
+            mmap_time = timeit(skip_mapped)
+        print(f'{size >> 20:>10}MB {stream_time * 1000:>10.2f}ms {mmap_time * 1000:>10.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
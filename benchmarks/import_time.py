@@ -0,0 +1,40 @@
+"""
+Measure the import time of the parser modules and of each handlers family, each in a fresh interpreter.
+Run with `python -m benchmarks.import_time`.
+"""
+import subprocess
+import sys
+
+from pykdebugparser.trace_handlers import FAMILIES_CLASSES
+
+MODULES = ['pykdebugparser.traces_parser', 'pykdebugparser.pykdebugparser', 'pykdebugparser.__main__']
+REPEAT = 5
+
+
+def import_time(module: str) -> float:
+    """
+    Measure the best cumulative import time of a module.
+    :param module: Module to import.
+    :return: Import time in seconds.
+    """
+    best = float('inf')
+    for _ in range(REPEAT):
+        stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                capture_output=True, text=True, check=True).stderr
+        for line in stderr.splitlines():
+            _, cumulative, name = line.split('|')
+            if name.strip() == module:
+                best = min(best, int(cumulative) / 1000000)
+    return best
+
+
+def main():
+    for module in MODULES:
+        print(f'{module:<48} {import_time(module) * 1000:>8.1f}ms')
+    for family in FAMILIES_CLASSES:
+        module = f'pykdebugparser.trace_handlers.{family}'
+        print(f'{module:<48} {import_time(module) * 1000:>8.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
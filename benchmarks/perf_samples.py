@@ -0,0 +1,65 @@
+"""
+Measure the time it takes to parse kperf samples with user callstacks of different depths, in total and in the
+PERF_Event handler alone.
+Run with `python -m benchmarks.perf_samples`.
+"""
+from benchmarks.common import timeit
+from pykdebugparser.kevent import Kevent
+from pykdebugparser.trace_codes import default_trace_codes
+from pykdebugparser.traces_parser import TracesParser
+
+PERF_EVENT = 0x25000000
+PERF_THD_DATA = 0x25010004
+PERF_STK_UDATA = 0x25020010
+PERF_STK_UHDR = 0x25020018
+# SAMPLER_TH_INFO | SAMPLER_USTACK
+SAMPLE_WHAT = 0x09
+# CALLSTACK_VALID | CALLSTACK_64BIT
+CALLSTACK_FLAGS = 0x05
+SAMPLES = 0x1000
+STACK_DEPTHS = [8, 64, 256]
+
+
+def kevent(eventid, func_qualifier, values, tid=1):
+    data = b''.join(v.to_bytes(8, 'little') for v in values)
+    return Kevent(0, data, values, tid, eventid | func_qualifier, eventid, func_qualifier)
+
+
+def build_sample(depth):
+    """
+    Build the events of a single sample.
+    :param depth: Number of user callstack frames.
+    :return: Sample events, from its PERF_Event start to its end.
+    """
+    frames = [kevent(PERF_STK_UDATA, 0, (0x100000000 + i, 0x100000008 + i, 0x100000010 + i, 0x100000018 + i))
+              for i in range(0, depth, 4)]
+    sample = ([kevent(PERF_EVENT, 1, (SAMPLE_WHAT, 1, 0, 0)), kevent(PERF_THD_DATA, 0, (10, 1, 0, 1)),
+               kevent(PERF_STK_UHDR, 0, (CALLSTACK_FLAGS, depth, 0, 0))] +
+              frames + [kevent(PERF_EVENT, 2, (0, 0, 0, 0))])
+    return sample
+
+
+def parse(events):
+    parser = TracesParser(default_trace_codes(), {}, {})
+    for _ in parser.feed_generator(events):
+        pass
+
+
+def handle(sample):
+    parser = TracesParser(default_trace_codes(), {}, {})
+    for _ in range(SAMPLES):
+        parser.parse_event_list(sample)
+
+
+def main():
+    print(f'{"depth":>8} {"parse":>12} {"handler":>12}')
+    for depth in STACK_DEPTHS:
+        sample = build_sample(depth)
+        events = sample * SAMPLES
+        parse_time = timeit(lambda: parse(events))
+        handler_time = timeit(lambda: handle(sample))
+        print(f'{depth:>8} {parse_time / SAMPLES * 1e6:>10.2f}us {handler_time / SAMPLES * 1e6:>10.2f}us')
+
+
+if __name__ == '__main__':
+    main()
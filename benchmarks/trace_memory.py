@@ -0,0 +1,59 @@
+"""
+Measure the memory held by parsed traces, in bytes per trace, for a few common trace types and each ktraces retention.
+Kevents are decoded while measuring, as they are when parsing a trace, so the ones kept by the traces are counted.
+Run with `python -m benchmarks.trace_memory`.
+"""
+import tracemalloc
+
+from pykdebugparser.kevent import iter_kd_bufs, kd_buf_struct
+from pykdebugparser.trace_codes import default_trace_codes
+from pykdebugparser.traces_parser import TracesParser, KtracesRetention
+
+TRACES = 0x10000
+UNHANDLED = 0x1234560
+# Event ID, function qualifiers and number of unhandled events nested in each measured trace type.
+TRACE_TYPES = {
+    'read': (0x40c000c, (1, 2), 0),
+    'nested read': (0x40c000c, (1, 2), 4),
+    'vmfault': (0x1300008, (1, 2), 0),
+    'sched': (0x1400000, (0,), 0),
+}
+
+
+def build_kd_bufs(eventid, func_qualifiers, nested):
+    kd_bufs = bytearray()
+    for i in range(TRACES):
+        args = b''.join(v.to_bytes(8, 'little') for v in (3, 0x1000 + i, 0x100, 0))
+        for func_qualifier in func_qualifiers:
+            kd_bufs += kd_buf_struct.pack(i, args, 1, eventid | func_qualifier, 0, 0)
+            if func_qualifier == 1:
+                kd_bufs += kd_buf_struct.pack(i, args, 1, UNHANDLED, 0, 0) * nested
+    return bytes(kd_bufs)
+
+
+def traces_size(kd_bufs, retention) -> float:
+    """
+    Measure the memory held by the traces parsed from kevents.
+    :param kd_bufs: Raw kevents to parse.
+    :param retention: Ktraces retention.
+    :return: Bytes per trace.
+    """
+    parser = TracesParser(default_trace_codes(), {}, {}, retention=retention)
+    # Load the handlers before measuring.
+    parser.parse_event_list(list(iter_kd_bufs(kd_bufs[:64])))
+    tracemalloc.start()
+    traces = list(parser.feed_generator(iter_kd_bufs(kd_bufs)))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / len(traces)
+
+
+def main():
+    print(f'{"trace":>12}' + ''.join(f'{retention.value:>16}' for retention in KtracesRetention))
+    for name, trace_type in TRACE_TYPES.items():
+        kd_bufs = build_kd_bufs(*trace_type)
+        print(f'{name:>12}' + ''.join(f'{traces_size(kd_bufs, retention):>16.1f}' for retention in KtracesRetention))
+
+
+if __name__ == '__main__':
+    main()
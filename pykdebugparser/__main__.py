@@ -2,7 +2,8 @@ import json
 
 import click
 
-from pykdebugparser.kd_buf_parser import KdBufParser
+from pykdebugparser.kd_buf_parser import KdBufParser, TRACEV3_PROCESSES, TRACEV3_KERNEL_EXTENSIONS, TRACEV3_IMAGES
+from pykdebugparser.mmap_reader import MmapReader
 from pykdebugparser.pykdebugparser import PyKdebugParser
 
 
@@ -20,6 +21,16 @@ def print_with_count(generator, count: int):
         i += 1
 
 
+def map_dump(kdebug_dump):
+    """
+    Memory map the dump if possible, pipes and such are read as they are.
+    """
+    try:
+        return MmapReader(kdebug_dump)
+    except (OSError, ValueError):
+        return kdebug_dump
+
+
 class BasedIntParamType(click.ParamType):
     name = 'based int'
 
@@ -40,6 +51,10 @@ show_tid = click.option('--show-tid/--no-show-tid', default=False, help='Whether
 process_filter = click.option('--process', default=None, help='Process ID / name to filter. Omit for all.')
 class_filter = click.option('-cf', '--class-filters', multiple=True, type=BASED_INT,
                             help='Events class filter. Omit for all.')
+jobs = click.option('-j', '--jobs', type=click.INT, default=None,
+                    help='Number of processes decoding a tracev3 file in parallel. Omit to decode serially.')
+trace_jobs = click.option('-tj', '--trace-jobs', type=click.INT, default=None,
+                          help='Number of processes pairing and parsing traces, sharded by thread. Omit to parse serially.')
 subclass_filter = click.option('-sf', '--subclass-filters', multiple=True, type=BASED_INT,
                                help='Events subclass filter. Omit for all.')
 
@@ -51,13 +66,15 @@ subclass_filter = click.option('-sf', '--subclass-filters', multiple=True, type=
 @show_tid
 @class_filter
 @subclass_filter
-def kevents(kdebug_dump, count, tid, show_tid, class_filters, subclass_filters):
+@jobs
+def kevents(kdebug_dump, count, tid, show_tid, class_filters, subclass_filters, jobs):
     parser = PyKdebugParser()
+    parser.parallel = jobs
     parser.filter_class = class_filters
     parser.filter_subclass = subclass_filters
     parser.filter_tid = tid
     parser.show_tid = show_tid
-    print_with_count(parser.formatted_kevents(kdebug_dump), count)
+    print_with_count(parser.formatted_kevents(map_dump(kdebug_dump)), count)
 
 
 @cli.command()
@@ -69,15 +86,25 @@ def kevents(kdebug_dump, count, tid, show_tid, class_filters, subclass_filters):
 @class_filter
 @subclass_filter
 @click.option('--color/--no-color', default=True, help='Whether to print with color or not.')
-def traces(kdebug_dump, count, tid, process, show_tid, class_filters, subclass_filters, color):
+@click.option('--fd-paths/--no-fd-paths', default=False,
+              help='Whether to track the processes file descriptors and print the paths of I/O syscalls.')
+@jobs
+@trace_jobs
+def traces(kdebug_dump, count, tid, process, show_tid, class_filters, subclass_filters, color, fd_paths, jobs,
+           trace_jobs):
+    if fd_paths and trace_jobs:
+        raise click.UsageError('--fd-paths is not supported with --trace-jobs.')
     parser = PyKdebugParser()
+    parser.parallel = jobs
+    parser.parallel_traces = trace_jobs
     parser.filter_tid = tid
     parser.filter_process = process
     parser.filter_class = list(class_filters)
     parser.filter_subclass = list(subclass_filters)
     parser.show_tid = show_tid
     parser.color = color
-    print_with_count(parser.formatted_traces(kdebug_dump), count)
+    parser.track_fds = fd_paths
+    print_with_count(parser.formatted_traces(map_dump(kdebug_dump)), count)
 
 
 @cli.command()
@@ -86,19 +113,23 @@ def traces(kdebug_dump, count, tid, process, show_tid, class_filters, subclass_f
 @tid_filter
 @process_filter
 @show_tid
-def callstacks(kdebug_dump, count, tid, process, show_tid):
+@jobs
+@trace_jobs
+def callstacks(kdebug_dump, count, tid, process, show_tid, jobs, trace_jobs):
     parser = PyKdebugParser()
+    parser.parallel = jobs
+    parser.parallel_traces = trace_jobs
     parser.filter_tid = tid
     parser.filter_process = process
     parser.show_tid = show_tid
-    print_with_count(parser.formatted_callstacks(kdebug_dump), count)
+    print_with_count(parser.formatted_callstacks(map_dump(kdebug_dump)), count)
 
 
 @cli.command()
 @dump_input
 def processes(kdebug_dump):
     parser = KdBufParser({}, {})
-    list(parser.parse(kdebug_dump))
+    parser.read_metadata(map_dump(kdebug_dump), {TRACEV3_PROCESSES})
     print(json.dumps(parser.processes, indent=4))
 
 
@@ -106,7 +137,7 @@ def processes(kdebug_dump):
 @dump_input
 def kexts(kdebug_dump):
     parser = KdBufParser({}, {})
-    list(parser.parse(kdebug_dump))
+    parser.read_metadata(map_dump(kdebug_dump), {TRACEV3_KERNEL_EXTENSIONS})
     print(json.dumps(parser.kernel_extensions, indent=4))
 
 
@@ -114,7 +145,7 @@ def kexts(kdebug_dump):
 @dump_input
 def images(kdebug_dump):
     parser = KdBufParser({}, {})
-    list(parser.parse(kdebug_dump))
+    parser.read_metadata(map_dump(kdebug_dump), {TRACEV3_IMAGES})
     print(json.dumps(parser.images, indent=4))
 
 
@@ -129,7 +160,7 @@ def logs(kdebug_dump, count, tid, process, show_tid):
     parser.filter_tid = tid
     parser.filter_process = process
     parser.show_tid = show_tid
-    print_with_count(parser.formatted_logs(kdebug_dump), count)
+    print_with_count(parser.formatted_logs(map_dump(kdebug_dump)), count)
 
 
 if __name__ == '__main__':
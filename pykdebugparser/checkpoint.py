@@ -0,0 +1,98 @@
+from dataclasses import dataclass, field
+import pickle
+from typing import Optional
+
+CHECKPOINT_FORMAT_VERSION = 1
+# TracesParser attributes kept in a checkpoint.
+TRACES_PARSER_STATE = (
+    'on_going_unhandled', 'global_strings', 'tids_names', 'last_data_newthread', 'last_data_exec', 'evictions',
+    'open_events', 'peak_open_events', 'vnode_paths', 'fd_table',
+)
+
+
+@dataclass
+class Checkpoint:
+    """
+    Snapshot of the parsers state, allowing to resume parsing a trace from where it stopped.
+    """
+    version: bytes
+    offset: int
+    chunk_end: Optional[int]
+    completed: bool
+    threads_pids: dict
+    pids_names: dict
+    on_going_events: dict = field(default_factory=dict)
+    on_going_traces: dict = field(default_factory=dict)
+    traces_state: dict = field(default_factory=dict)
+    dyld_addresses: list = field(default_factory=list)
+    dyld_uuids: list = field(default_factory=list)
+
+    @classmethod
+    def capture(cls, kd_buf_parser, traces_parser=None, callstacks_parser=None) -> 'Checkpoint':
+        """
+        Snapshot the parsers state.
+        :param kd_buf_parser: KdBufParser parsing the trace with parse_resumable.
+        :param traces_parser: TracesParser fed by the kevents, if any.
+        :param callstacks_parser: CallstacksParser fed by the traces, if any.
+        :return: Captured checkpoint, sharing the parsers objects until it is saved.
+        """
+        checkpoint = cls(kd_buf_parser.version, kd_buf_parser.offset, kd_buf_parser.chunk_end,
+                         kd_buf_parser.completed, kd_buf_parser.threads_pids, kd_buf_parser.pids_names)
+        if traces_parser is not None:
+            checkpoint.on_going_events = traces_parser.on_going_events
+            checkpoint.on_going_traces = traces_parser.on_going_traces
+            checkpoint.traces_state = {name: getattr(traces_parser, name) for name in TRACES_PARSER_STATE}
+        if callstacks_parser is not None:
+            checkpoint.dyld_addresses = callstacks_parser.dyld_addresses
+            checkpoint.dyld_uuids = callstacks_parser.dyld_uuids
+        return checkpoint
+
+    def restore(self, kd_buf_parser, traces_parser=None, callstacks_parser=None):
+        """
+        Restore the parsers state, the next parse_resumable call continues from the checkpoint.
+        Parsers sharing the threads map keep sharing it.
+        :param kd_buf_parser: KdBufParser to resume parsing with.
+        :param traces_parser: TracesParser to resume feeding, if any.
+        :param callstacks_parser: CallstacksParser to resume feeding, if any.
+        """
+        kd_buf_parser.version = self.version
+        kd_buf_parser.offset = self.offset
+        kd_buf_parser.chunk_end = self.chunk_end
+        kd_buf_parser.completed = self.completed
+        kd_buf_parser.threads_pids.clear()
+        kd_buf_parser.threads_pids.update(self.threads_pids)
+        kd_buf_parser.pids_names.clear()
+        kd_buf_parser.pids_names.update(self.pids_names)
+        if traces_parser is not None:
+            # The dispatch table refers to the states, they are updated in place.
+            traces_parser.on_going_events.clear()
+            traces_parser.on_going_events.update(self.on_going_events)
+            traces_parser.on_going_traces.clear()
+            traces_parser.on_going_traces.update(self.on_going_traces)
+            for name, value in self.traces_state.items():
+                setattr(traces_parser, name, value)
+        if callstacks_parser is not None:
+            callstacks_parser.dyld_addresses[:] = self.dyld_addresses
+            callstacks_parser.dyld_uuids[:] = self.dyld_uuids
+
+    def save(self, path: str):
+        """
+        Save the checkpoint into a file.
+        :param path: Path of the checkpoint file.
+        """
+        with open(path, 'wb') as fd:
+            pickle.dump((CHECKPOINT_FORMAT_VERSION, self), fd, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> 'Checkpoint':
+        """
+        Load a checkpoint from a file.
+        Checkpoints are pickled, only load files you trust.
+        :param path: Path of the checkpoint file.
+        :return: Loaded checkpoint.
+        """
+        with open(path, 'rb') as fd:
+            version, checkpoint = pickle.load(fd)
+        if version != CHECKPOINT_FORMAT_VERSION:
+            raise ValueError(f'Unsupported checkpoint version {version}')
+        return checkpoint
@@ -0,0 +1,43 @@
+from functools import wraps
+
+# Number of distinct values each flags decoder remembers, values past it are decoded on each call.
+DECODER_CACHE_SIZE = 0x1000
+
+
+def flags_decoder(func):
+    """
+    Memoize a flags decoder per flags value, traces tend to repeat a handful of values.
+    Each call returns a new list, so traces don't share their decoded flags.
+    :param func: Decoder of a flags value into a list of enum members.
+    :return: Memoized decoder.
+    """
+    cache = {}
+
+    @wraps(func)
+    def decode(flags: int) -> list:
+        decoded = cache.get(flags)
+        if decoded is None:
+            decoded = tuple(func(flags))
+            if len(cache) < DECODER_CACHE_SIZE:
+                cache[flags] = decoded
+        return list(decoded)
+
+    return decode
+
+
+def enum_decoder(enum):
+    """
+    Create a decoder of values into enum members, from a table built once.
+    Same as calling the enum, without going through its metaclass.
+    :param enum: Enum to decode into.
+    :return: Decoder, raising ValueError for values that aren't members.
+    """
+    members = {member.value: member for member in enum}
+
+    def decode(value):
+        try:
+            return members[value]
+        except KeyError:
+            return enum(value)
+
+    return decode
@@ -0,0 +1,120 @@
+from functools import partial
+import posixpath
+from typing import Optional
+
+# fcntl commands duplicating a descriptor.
+F_DUPFD = 0
+F_DUPFD_CLOEXEC = 67
+# openat's dirfd of paths relative to the working directory, as an unsigned 64 bit argument.
+AT_FDCWD = 0xfffffffffffffffe
+
+
+class FdTable:
+    """
+    Per process mapping between file descriptors and paths, updated from the syscalls traces as they end.
+    Descriptors opened before the trace started, or inherited from a parent process, are unknown.
+    """
+
+    def __init__(self):
+        self.pids_fds = {}
+
+    def path(self, pid: int, fd: int) -> Optional[str]:
+        """
+        Get the path of an open file descriptor.
+        :param pid: Process ID.
+        :param fd: File descriptor.
+        :return: Path the descriptor was opened with, None if it is unknown.
+        """
+        fds = self.pids_fds.get(pid)
+        return None if fds is None else fds.get(fd)
+
+    def open(self, pid: int, fd: int, path: str):
+        self.pids_fds.setdefault(pid, {})[fd] = path
+
+    def close(self, pid: int, fd: int):
+        fds = self.pids_fds.get(pid)
+        if fds is not None:
+            fds.pop(fd, None)
+
+    def dup(self, pid: int, fd: int, new_fd: int):
+        path = self.path(pid, fd)
+        if path is None:
+            self.close(pid, new_fd)
+        else:
+            self.open(pid, new_fd, path)
+
+
+def _succeeded(events) -> bool:
+    return len(events) > 1 and not events[-1].values[0]
+
+
+def update_open(fd_table, pid, parser, events, dirfd=False):
+    if not _succeeded(events):
+        return
+    path = parser.parse_vnode(events).path
+    if dirfd and not path.startswith('/') and events[0].values[0] != AT_FDCWD:
+        base = fd_table.path(pid, events[0].values[0])
+        if base is not None:
+            path = posixpath.join(base, path)
+    fd_table.open(pid, events[-1].values[1], path)
+
+
+def update_close(fd_table, pid, parser, events):
+    if _succeeded(events):
+        fd_table.close(pid, events[0].values[0])
+
+
+def update_dup(fd_table, pid, parser, events):
+    if _succeeded(events):
+        fd_table.dup(pid, events[0].values[0], events[-1].values[1])
+
+
+def update_dup2(fd_table, pid, parser, events):
+    if _succeeded(events):
+        fd_table.dup(pid, events[0].values[0], events[0].values[1])
+
+
+def update_fcntl(fd_table, pid, parser, events):
+    if events[0].values[1] in (F_DUPFD, F_DUPFD_CLOEXEC):
+        update_dup(fd_table, pid, parser, events)
+
+
+# Syscalls changing the descriptors table, by event name.
+updates = {
+    'BSC_open': update_open,
+    'BSC_open_nocancel': update_open,
+    'BSC_open_dprotected_np': update_open,
+    'BSC_guarded_open_np': update_open,
+    'BSC_guarded_open_dprotected_np': update_open,
+    'BSC_openat': partial(update_open, dirfd=True),
+    'BSC_openat_nocancel': partial(update_open, dirfd=True),
+    'BSC_sys_close': update_close,
+    'BSC_sys_close_nocancel': update_close,
+    'BSC_guarded_close_np': update_close,
+    'BSC_sys_dup': update_dup,
+    'BSC_sys_dup2': update_dup2,
+    'BSC_sys_fcntl': update_fcntl,
+    'BSC_sys_fcntl_nocancel': update_fcntl,
+}
+
+# Syscalls whose first argument is a descriptor and whose traces get its path.
+io_events = frozenset((
+    'BSC_read', 'BSC_write', 'BSC_pread', 'BSC_pwrite', 'BSC_readv', 'BSC_writev',
+    'BSC_read_nocancel', 'BSC_write_nocancel', 'BSC_pread_nocancel', 'BSC_pwrite_nocancel',
+    'BSC_readv_nocancel', 'BSC_writev_nocancel',
+))
+
+
+def with_path(handler, path, parser, events):
+    """
+    Run an I/O handler and set the path of its descriptor on the parsed trace.
+    :param handler: Handler of the I/O syscall.
+    :param path: Path of the descriptor, None if it is unknown.
+    :param parser: Traces parser.
+    :param events: Syscall events.
+    :return: Parsed trace.
+    """
+    trace = handler(parser, events)
+    if trace is not None:
+        trace.path = path
+    return trace
@@ -1,19 +1,32 @@
-import struct
-from collections import namedtuple
+from collections import namedtuple, deque
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
 import io
+import os
 import plistlib
+from typing import Optional
 
 from construct import Adapter, Struct, Const, Padding, Int32ul, Int64ul, Array, GreedyRange, Byte, FixedSized, \
     CString, Prefixed, GreedyBytes, Aligned, Bytes, Select
 
-from pykdebugparser.kevent import from_kd_buf, KD_BUF_FORMAT
+from pykdebugparser.kevent import iter_kd_bufs, enumerate_kd_bufs, kd_bufs_fields, from_kd_bufs, \
+    kd_bufs_timestamps_range, KEVENT_SIZE, Kevent
+from pykdebugparser.mmap_reader import MmapReader
 from pykdebugparser.os_log_event import OsLogEvent
+from pykdebugparser.trace_index import TraceIndex, ChunkInfo
 
-KEVENT_SIZE = struct.calcsize(KD_BUF_FORMAT)
+# Number of kevents read at once from a version 2 trace.
+V2_CHUNK_EVENTS = 0x1000
+# Number of bytes scanned at once while searching for a tag.
+SEEK_WINDOW_SIZE = 0x100000
+# Number of bytes at the beginning of a trace hashed to tell it apart from a trace of the same size.
+HEADER_DIGEST_SIZE = 0x1000
 
 ProcessData = namedtuple('ProcessData', ['pid', 'name'])
 
 RAW_VERSION_SIZE = 4
+# Size of the trace version 3 header, up to its cpu info.
+V3_HEADER_SIZE = 0x3c
 RAW_VERSION2_BYTES = b'\x00\x02\xaa\x55'
 RAW_VERSION3_BYTES = b'\x00\x03\xaa\x55'
 TRACEV3_STACKSHOT_END = b'stackshot_out_fl'
@@ -27,6 +40,9 @@ TRACEV3_LOG_EVENTS = b'\x11\x80\x00\x00\x00\x00\x00\x00'
 TRACEV3_LOG_STRINGS = b'\x12\x80\x00\x00\x00\x00\x00\x00'
 TRACEV3_KERNEL_EXTENSIONS = b'\x05\x80\x00\x00\x00\x00\x00\x00'
 TRACEV3_IMAGES = b'\x04\x80\x00\x00\x01\x00\x00\x00'
+METADATA_TAGS = frozenset((
+    TRACEV3_DYLD_MODULES, TRACEV3_TRACE_CODES, TRACEV3_PROCESSES, TRACEV3_KERNEL_EXTENSIONS, TRACEV3_IMAGES,
+))
 
 kd_threadmap = Struct(
     'tid' / Int64ul,
@@ -88,13 +104,117 @@ kd_v3_additional_data = GreedyRange(Struct(
 def seek_until(reader, data: bytes):
     """
     Read from a stream until matching data.
-    Reading is aligned to the data size.
+    The stream is scanned in large windows and left positioned right after the match. Streams that can't be seeked
+    are consumed up to the match instead.
     :param reader: Stream to read from.
     :param data: Data to match.
     """
-    found = reader.read(len(data))
-    while found != data:
-        found = found[1:] + reader.read(1)
+    if hasattr(reader, 'find'):
+        position = reader.find(data)
+        if position == -1:
+            raise EOFError(f'{data!r} not found')
+        reader.seek(position + len(data))
+        return
+    if not reader.seekable():
+        _read_until(reader, data)
+        return
+
+    window = b''
+    while True:
+        buf = reader.read(SEEK_WINDOW_SIZE)
+        if not buf:
+            raise EOFError(f'{data!r} not found')
+        # Keep the window's tail, the data might cross the windows boundary.
+        window = window[max(len(window) - len(data) + 1, 0):] + buf
+        position = window.find(data)
+        if position != -1:
+            reader.seek(position + len(data) - len(window), io.SEEK_CUR)
+            return
+
+
+def _read_until(reader, data: bytes):
+    if not hasattr(reader, 'peek'):
+        found = reader.read(len(data))
+        while found != data:
+            byte = reader.read(1)
+            if not byte:
+                raise EOFError(f'{data!r} not found')
+            found = found[1:] + byte
+        return
+
+    # Buffered streams are scanned in their buffer, only the bytes up to the match are consumed.
+    tail = b''
+    while True:
+        buf = reader.peek(SEEK_WINDOW_SIZE)
+        if not buf:
+            raise EOFError(f'{data!r} not found')
+        window = tail + buf
+        position = window.find(data)
+        if position != -1:
+            reader.read(position + len(data) - len(tail))
+            return
+        reader.read(len(buf))
+        tail = window[max(len(window) - len(data) + 1, 0):]
+
+
+def _discard(reader, size: int):
+    while size:
+        data = reader.read(min(size, SEEK_WINDOW_SIZE))
+        if not data:
+            raise EOFError('Stream ended before the end of the events chunk')
+        size -= len(data)
+
+
+def read_view_function(reader):
+    """
+    Get the cheapest read function of a stream.
+    Memory mapped readers hand out views over the mapping instead of copies.
+    :param reader: Stream to read from.
+    :return: Read function of the stream.
+    """
+    return getattr(reader, 'read_view', reader.read)
+
+
+def trace_mtime_ns(reader) -> Optional[int]:
+    """
+    Get the modification time of a trace file.
+    :param reader: Stream of the trace.
+    :return: Modification time in nanoseconds, None if the stream isn't backed by a file.
+    """
+    if hasattr(reader, 'fileno'):
+        try:
+            return os.fstat(reader.fileno()).st_mtime_ns
+        except (OSError, io.UnsupportedOperation):
+            return None
+    try:
+        return os.stat(reader.name).st_mtime_ns
+    except (AttributeError, TypeError, OSError):
+        return None
+
+
+def trace_header_digest(reader) -> str:
+    """
+    Hash the beginning of a trace, where its version and header are.
+    :param reader: Seekable stream of the trace, positioned back at the beginning once hashed.
+    :return: Hex digest.
+    """
+    reader.seek(0)
+    digest = hashlib.sha256(reader.read(HEADER_DIGEST_SIZE)).hexdigest()
+    reader.seek(0)
+    return digest
+
+
+_worker_reader = None
+
+
+def _map_trace(path: str):
+    global _worker_reader
+    _worker_reader = MmapReader.open(path)
+
+
+def _decode_chunk(offset: int, count: int, event_filter) -> list:
+    _worker_reader.seek(offset)
+    return kd_bufs_fields(_worker_reader.read_view(count * KEVENT_SIZE), event_filter)
 
 
 class KdBufParser:
@@ -102,12 +222,12 @@ class KdBufParser:
     Parser for raw kd_buf buffer.
     """
 
-    def __init__(self, threads_pids=None, pids_names=None):
+    def __init__(self, threads_pids=None, pids_names=None, event_filter=None):
         self.threads_pids = {} if threads_pids is None else threads_pids
         self.pids_names = {} if pids_names is None else pids_names
         self.versions = {
-            RAW_VERSION2_BYTES: self.parse_v2,
-            RAW_VERSION3_BYTES: self.parse_v3,
+            RAW_VERSION2_BYTES: self.parse_v2_chunks,
+            RAW_VERSION3_BYTES: self.parse_v3_chunks,
         }
         self.trace_codes = ''
         self.images = {}
@@ -115,6 +235,13 @@ class KdBufParser:
         self.processes = {}
         self.kernel_extensions = {'Binaries': []}
         self.v3_header = None
+        self.index = None
+        self.event_filter = event_filter
+        # Position of parse_resumable, right after the last yielded kevent.
+        self.version = None
+        self.offset = None
+        self.chunk_end = None
+        self.completed = False
 
     def parse(self, reader: io.IOBase):
         """
@@ -122,9 +249,241 @@ class KdBufParser:
         :param reader: Stream to read from.
         :return: Generator for parsed kevents.
         """
+        return self._events_from_chunks(self.parse_chunks(reader))
+
+    def parse_file(self, path: str, parallel: int = None):
+        """
+        Parse kevents from a file, memory mapping it instead of reading it.
+        :param path: Path of the file to parse.
+        :param parallel: Number of processes decoding and filtering the events chunks of a trace version 3, each
+                         mapping the file by itself. Ignored for a trace version 2. Omit to decode serially.
+        :return: Generator for parsed kevents.
+        """
+        with MmapReader.open(path) as reader:
+            if parallel and reader.read(RAW_VERSION_SIZE) == RAW_VERSION3_BYTES:
+                yield from self._parse_parallel(reader, path, parallel)
+            else:
+                reader.seek(0)
+                yield from self.parse(reader)
+
+    def _parse_parallel(self, reader, path: str, parallel: int):
+        if self.index is not None:
+            chunks = [(chunk.offset, chunk.count) for chunk in self.index.chunks]
+        else:
+            self.parse_v3_header(reader)
+            # Chunks are walked over by their headers, their kevents are only read by the workers.
+            chunks = self.iter_v3_chunks(reader)
+        with ProcessPoolExecutor(parallel, initializer=_map_trace, initargs=(path,)) as executor:
+            # Keep a bounded number of chunks in flight, results are yielded in the original order.
+            pending = deque()
+            try:
+                for offset, count in chunks:
+                    pending.append(executor.submit(_decode_chunk, offset, count, self.event_filter))
+                    if len(pending) >= parallel * 2:
+                        yield from map(Kevent._make, pending.popleft().result())
+                while pending:
+                    yield from map(Kevent._make, pending.popleft().result())
+            finally:
+                for future in pending:
+                    future.cancel()
+        if self.index is not None:
+            reader.seek(self.index.additional_data_offset)
+        yield from self.parse_v3_additional_data(reader)
+
+    def parse_resumable(self, reader: io.IOBase):
+        """
+        Parse kevents from a seekable stream, keeping track of the position to resume from.
+        Once a kevent is yielded, `offset` points right after it. Parsing resumes from that position if it is set,
+        e.g. by restoring a checkpoint. Traces that are still being written can be parsed again as they grow.
+        :param reader: Seekable stream to read from.
+        :return: Generator for parsed kevents, followed by parsed os_log events once the trace is complete.
+        """
+        if self.completed:
+            return
+        if self.offset is None:
+            self.version = reader.read(RAW_VERSION_SIZE)
+            if self.version == RAW_VERSION2_BYTES:
+                self.set_thread_map(kd_header_v2.parse_stream(reader).threadmap)
+            elif self.version == RAW_VERSION3_BYTES:
+                self.parse_v3_header(reader)
+            else:
+                raise ValueError(f'Unknown trace version {self.version!r}')
+            self.offset = reader.tell()
+        else:
+            reader.seek(self.offset)
+        if self.version == RAW_VERSION2_BYTES:
+            yield from self._resume_v2(reader)
+        else:
+            yield from self._resume_v3(reader)
+
+    def _resume_v2(self, reader):
+        read_events = read_view_function(reader)
+        while True:
+            offset = reader.tell()
+            buf = read_events(KEVENT_SIZE * V2_CHUNK_EVENTS)
+            yield from self._resumable_events(buf[:len(buf) - len(buf) % KEVENT_SIZE], offset)
+            if len(buf) < KEVENT_SIZE * V2_CHUNK_EVENTS:
+                return
+
+    def _resume_v3(self, reader):
+        read_events = read_view_function(reader)
+        if self.chunk_end is not None and self.offset < self.chunk_end:
+            # Finish the chunk the position is in.
+            yield from self._resumable_events(read_events(self.chunk_end - self.offset), self.offset)
+        while True:
+            if self.chunk_end is not None:
+                reader.seek(self.chunk_end)
+                tag = reader.read(len(TRACEV3_MORE_EVENTS))
+                if len(tag) < len(TRACEV3_MORE_EVENTS) or self.offset < self.chunk_end:
+                    # The trace is still being written.
+                    return
+                if tag != TRACEV3_MORE_EVENTS:
+                    reader.seek(self.chunk_end)
+                    break
+            try:
+                seek_until(reader, TRACEV3_EVENTS_TAG)
+            except EOFError:
+                # The trace is still being written.
+                return
+            size = Int64ul.parse_stream(reader)
+            reader.read(8)  # All zeros, unknown.
+            offset = reader.tell()
+            self.offset = offset
+            self.chunk_end = offset + size // KEVENT_SIZE * KEVENT_SIZE
+            yield from self._resumable_events(read_events(self.chunk_end - offset), offset)
+        yield from self.parse_v3_additional_data(reader)
+        self.offset = reader.tell()
+        self.completed = True
+
+    def _resumable_events(self, kd_bufs, offset: int):
+        kd_bufs = kd_bufs[:len(kd_bufs) - len(kd_bufs) % KEVENT_SIZE]
+        # Filters are tested on the raw kd_bufs, only the matching ones are built into kevents.
+        for i, event in enumerate_kd_bufs(kd_bufs, self.event_filter):
+            self.offset = offset + (i + 1) * KEVENT_SIZE
+            yield event
+        self.offset = offset + len(kd_bufs)
+
+    def parse_arrays(self, reader: io.IOBase):
+        """
+        Parse kevents from a stream into columnar arrays, one for each chunk of events.
+        Requires numpy.
+        :param reader: Stream to read from.
+        :return: Generator for KeventArray objects, followed by parsed os_log events.
+        """
+        return self._arrays_from_chunks(self.parse_chunks(reader))
+
+    def parse_chunks(self, reader: io.IOBase):
+        """
+        Split a stream into raw kevents chunks.
+        :param reader: Stream to read from.
+        :return: Generator for raw kd_buf chunks, followed by parsed os_log events.
+        """
         version = reader.read(RAW_VERSION_SIZE)
         return self.versions[version](reader)
 
+    def read_metadata(self, reader: io.IOBase, tags=None):
+        """
+        Read the thread map and the additional data blocks of a trace, without decoding its kevents.
+        Events chunks are skipped using their sizes, streams that can't be seeked are read through them.
+        :param reader: Stream to read from.
+        :param tags: Tags of the additional data blocks to parse. Omit for all but the os_log events.
+        """
+        version = reader.read(RAW_VERSION_SIZE)
+        if version == RAW_VERSION2_BYTES:
+            self.set_thread_map(kd_header_v2.parse_stream(reader).threadmap)
+            return
+        if version != RAW_VERSION3_BYTES:
+            raise ValueError(f'Unknown trace version {version!r}')
+        self.parse_v3_header(reader)
+        read_ahead = b''
+        if self.index is not None:
+            reader.seek(self.index.additional_data_offset)
+        else:
+            seekable = reader.seekable()
+            chunks = self.iter_v3_chunks(reader)
+            while True:
+                try:
+                    _, count = next(chunks)
+                except StopIteration as stop:
+                    read_ahead = stop.value
+                    break
+                if not seekable:
+                    _discard(reader, count * KEVENT_SIZE)
+        if tags is None:
+            tags = METADATA_TAGS
+        for _ in self._v3_additional_data(reader, read_ahead, tags):
+            pass
+
+    def build_index(self, reader: io.IOBase) -> TraceIndex:
+        """
+        Index the events chunks of a trace version 3 in a single scan.
+        :param reader: Seekable stream to index, positioned at the beginning of the trace.
+        :return: Built index, also kept for later random access.
+        """
+        header_digest = trace_header_digest(reader)
+        if reader.read(RAW_VERSION_SIZE) != RAW_VERSION3_BYTES:
+            raise ValueError('Only trace version 3 can be indexed')
+        threadmap_offset = self.parse_v3_header(reader)
+        read_events = read_view_function(reader)
+        chunks = []
+        for offset, count in self.iter_v3_chunks(reader):
+            chunks.append(ChunkInfo(offset, count, *kd_bufs_timestamps_range(read_events(count * KEVENT_SIZE))))
+        additional_data_offset = reader.tell()
+        self.index = TraceIndex(reader.seek(0, io.SEEK_END), threadmap_offset, additional_data_offset, chunks,
+                                trace_mtime_ns(reader), header_digest)
+        return self.index
+
+    def load_index(self, reader: io.IOBase, path: str) -> TraceIndex:
+        """
+        Load a trace version 3 index from a sidecar file, building and saving it if it is missing or stale.
+        :param reader: Seekable stream of the indexed trace.
+        :param path: Path of the sidecar file.
+        :return: Loaded index, also kept for later random access.
+        """
+        try:
+            index = TraceIndex.load(path)
+        except (OSError, ValueError, KeyError):
+            # Missing, or saved by another version.
+            index = None
+        if index is not None and index.matches(reader.seek(0, io.SEEK_END), trace_mtime_ns(reader),
+                                               trace_header_digest(reader)):
+            self.index = index
+            reader.seek(index.threadmap_offset)
+            self.set_thread_map(kd_v3_threadmap.parse_stream(reader).threadmap)
+            return index
+        reader.seek(0)
+        self.build_index(reader).save(path)
+        return self.index
+
+    def seek_chunk(self, reader: io.IOBase, i: int):
+        """
+        Position the reader at an indexed events chunk.
+        :param reader: Stream of the indexed trace.
+        :param i: Index of the chunk.
+        """
+        reader.seek(self.index.chunks[i].offset)
+
+    def events_in_chunk(self, reader: io.IOBase, i: int):
+        """
+        Parse the kevents of an indexed events chunk.
+        :param reader: Stream of the indexed trace.
+        :param i: Index of the chunk.
+        :return: Generator for parsed kevents.
+        """
+        self.seek_chunk(reader, i)
+        return iter_kd_bufs(read_view_function(reader)(self.index.chunks[i].count * KEVENT_SIZE))
+
+    def event_at(self, reader: io.IOBase, n: int) -> Kevent:
+        """
+        Parse a single kevent of an indexed trace.
+        :param reader: Stream of the indexed trace.
+        :param n: Index of the kevent in the trace.
+        :return: Parsed kevent.
+        """
+        chunk_index, event_index = self.index.locate(n)
+        reader.seek(self.index.chunks[chunk_index].offset + event_index * KEVENT_SIZE)
+        return next(iter_kd_bufs(read_view_function(reader)(KEVENT_SIZE)))
+
     def set_thread_map(self, parsed_threadmap):
         self.threads_pids.clear()
         self.pids_names.clear()
@@ -138,41 +497,143 @@ class KdBufParser:
         :param reader: Stream to parse.
         :return: Generator for parsed kevents.
         """
+        return self._events_from_chunks(self.parse_v2_chunks(reader))
+
+    def parse_v3(self, reader: io.IOBase):
+        """
+        Parse trace version 3.
+        :param reader: Stream to parse.
+        :return: Generator for parsed kevents.
+        """
+        return self._events_from_chunks(self.parse_v3_chunks(reader))
+
+    def parse_v2_chunks(self, reader: io.IOBase):
+        """
+        Split trace version 2 into raw kevents chunks.
+        :param reader: Stream to parse.
+        :return: Generator for raw kd_buf chunks.
+        """
         parsed_header = kd_header_v2.parse_stream(reader)
         self.set_thread_map(parsed_header.threadmap)
+        read_events = read_view_function(reader)
         while True:
-            buf = reader.read(KEVENT_SIZE)
-            if not buf:
+            buf = read_events(KEVENT_SIZE * V2_CHUNK_EVENTS)
+            if len(buf) < KEVENT_SIZE:
                 break
-            yield from_kd_buf(buf)
+            yield buf[:len(buf) - len(buf) % KEVENT_SIZE]
 
-    def parse_v3(self, reader: io.IOBase):
+    def parse_v3_chunks(self, reader: io.IOBase):
         """
-        Parse trace version 3.
+        Split trace version 3 into raw kevents chunks.
         :param reader: Stream to parse.
-        :return: Generator for parsed kevents.
+        :return: Generator for raw kd_buf chunks, followed by parsed os_log events.
         """
-        self.v3_header = Aligned(8, kd_header_v3).parse_stream(reader)
+        self.parse_v3_header(reader)
+        read_events = read_view_function(reader)
+        chunks = self.iter_v3_chunks(reader)
+        while True:
+            try:
+                _, count = next(chunks)
+            except StopIteration as stop:
+                read_ahead = stop.value
+                break
+            yield read_events(count * KEVENT_SIZE)
+        yield from self._v3_additional_data(reader, read_ahead)
+
+    def parse_v3_header(self, reader: io.IOBase) -> Optional[int]:
+        """
+        Parse trace version 3 header and thread map.
+        :param reader: Stream to parse, positioned right after the version.
+        :return: Offset of the thread map, None for streams that can't be seeked.
+        """
+        # The header is read by its size, so streams that can't tell their position can be parsed too.
+        header = reader.read(V3_HEADER_SIZE + 8)
+        cpu_info_size = Int64ul.parse(header[V3_HEADER_SIZE:])
+        header += reader.read(cpu_info_size + -(len(header) + cpu_info_size) % 8)
+        self.v3_header = Aligned(8, kd_header_v3).parse(header)
         # Align the reader to 8 bytes from the beginning of the stream
         reader.read(8 - RAW_VERSION_SIZE)
         # The threadmap tag appears randomly in the stackshot.
         seek_until(reader, TRACEV3_STACKSHOT_END)
         seek_until(reader, TRACEV3_THREADMAP_TAG)
-        threadmap = kd_v3_threadmap.parse_stream(reader).threadmap
-        self.set_thread_map(threadmap)
+        threadmap_offset = reader.tell() if reader.seekable() else None
+        threadmap = reader.read(8)
+        threadmap += reader.read(Int64ul.parse(threadmap))
+        self.set_thread_map(kd_v3_threadmap.parse(threadmap).threadmap)
+        return threadmap_offset
 
+    @staticmethod
+    def iter_v3_chunks(reader: io.IOBase):
+        """
+        Walk over trace version 3 events chunks.
+        The reader is positioned at each chunk's kevents when it is yielded, and at the additional data when done.
+        Streams that can't be seeked must be read up to the end of each chunk before the next one is walked to, and
+        can't be positioned back at the additional data.
+        :param reader: Stream to walk, positioned after the thread map.
+        :return: Generator for (offset, count) of each chunk's kevents, offsets are None for streams that can't be
+                 seeked. Its return value is the beginning of the additional data read ahead from such streams.
+        """
+        seekable = reader.seekable()
         while True:
             seek_until(reader, TRACEV3_EVENTS_TAG)
             size = Int64ul.parse_stream(reader)
             reader.read(8)  # All zeros, unknown.
-            for _ in range(size // KEVENT_SIZE):
-                buf = reader.read(KEVENT_SIZE)
-                yield from_kd_buf(buf)
-            if reader.read(len(TRACEV3_MORE_EVENTS)) != TRACEV3_MORE_EVENTS:
+            offset = reader.tell() if seekable else None
+            count = size // KEVENT_SIZE
+            yield offset, count
+            if seekable:
+                reader.seek(offset + count * KEVENT_SIZE)
+            tag = reader.read(len(TRACEV3_MORE_EVENTS))
+            if tag != TRACEV3_MORE_EVENTS:
                 break
-        reader.seek(-8, 1)
+        if not seekable:
+            return tag
+        reader.seek(-len(tag), io.SEEK_CUR)
+        return b''
+
+    def _v3_additional_data(self, reader: io.IOBase, read_ahead: bytes, tags=None):
+        if reader.seekable():
+            return self.parse_v3_additional_data(reader, tags)
+        # The additional data blocks are the rest of the trace.
+        return self.apply_v3_additional_data(kd_v3_additional_data.parse(read_ahead + reader.read()), tags)
 
-        additional_data = kd_v3_additional_data.parse_stream(reader)
+    def parse_v3_additional_data(self, reader: io.IOBase, tags=None):
+        """
+        Parse trace version 3 additional data blocks, following the events chunks.
+        :param reader: Stream to parse, positioned at the first block.
+        :param tags: Tags of the blocks to parse. Omit for all.
+        :return: Generator for parsed os_log events.
+        """
+        return self.apply_v3_additional_data(kd_v3_additional_data.parse_stream(reader), tags)
+
+    def _apply_dyld_modules(self, data):
+        data = plistlib.loads(data)
+        if not self.dyld_modules:
+            self.dyld_modules.update(data)
+        else:
+            self.dyld_modules['Binaries'].extend(data['Binaries'])
+
+    def _apply_trace_codes(self, data):
+        self.trace_codes += data.decode()
+
+    def _apply_processes(self, data):
+        self.processes = plistlib.loads(data)
+
+    def _apply_kernel_extensions(self, data):
+        self.kernel_extensions['Binaries'].extend(plistlib.loads(data)['Binaries'])
+
+    def _apply_images(self, data):
+        self.images = plistlib.loads(data)
+
+    def apply_v3_additional_data(self, additional_data, tags=None):
+        """
+        Apply parsed trace version 3 additional data blocks.
+        :param additional_data: Blocks, each with a tag and its data.
+        :param tags: Tags of the blocks to apply. Omit for all.
+        :return: Generator for parsed os_log events.
+        """
+        if tags is not None:
+            additional_data = [block for block in additional_data if block.tag in tags]
 
         self.trace_codes = ''
         self.kernel_extensions = {'Binaries': []}
@@ -182,26 +643,21 @@ class KdBufParser:
 
         log_events = []
         log_strings = {}
+        appliers = {
+            TRACEV3_DYLD_MODULES: self._apply_dyld_modules,
+            TRACEV3_TRACE_CODES: self._apply_trace_codes,
+            TRACEV3_PROCESSES: self._apply_processes,
+            TRACEV3_KERNEL_EXTENSIONS: self._apply_kernel_extensions,
+            TRACEV3_IMAGES: self._apply_images,
+            TRACEV3_LOG_EVENTS: lambda data: log_events.extend(plistlib.loads(data)['Events']),
+            TRACEV3_LOG_STRINGS: lambda data: log_strings.update(
+                {v: k for k, v in plistlib.loads(data)['StringIndex'].items()}),
+        }
 
         for block in additional_data:
-            if block.tag == TRACEV3_DYLD_MODULES:
-                data = plistlib.loads(block.data)
-                if not self.dyld_modules:
-                    self.dyld_modules.update(data)
-                else:
-                    self.dyld_modules['Binaries'].extend(data['Binaries'])
-            elif block.tag == TRACEV3_TRACE_CODES:
-                self.trace_codes += block.data.decode()
-            elif block.tag == TRACEV3_PROCESSES:
-                self.processes = plistlib.loads(block.data)
-            elif block.tag == TRACEV3_KERNEL_EXTENSIONS:
-                self.kernel_extensions['Binaries'].extend(plistlib.loads(block.data)['Binaries'])
-            elif block.tag == TRACEV3_IMAGES:
-                self.images = plistlib.loads(block.data)
-            elif block.tag == TRACEV3_LOG_EVENTS:
-                log_events.extend(plistlib.loads(block.data)['Events'])
-            elif block.tag == TRACEV3_LOG_STRINGS:
-                log_strings = {v: k for k, v in plistlib.loads(block.data)['StringIndex'].items()}
+            applier = appliers.get(block.tag)
+            if applier is not None:
+                applier(block.data)
 
         for event in log_events:
             log_event = OsLogEvent.from_raw_log_event(event, log_strings)
@@ -209,3 +665,20 @@ class KdBufParser:
                 self.threads_pids[log_event.thread_identifier] = log_event.process_identifier
                 self.pids_names[log_event.process_identifier] = log_event.process
             yield log_event
+
+    def _events_from_chunks(self, chunks):
+        for chunk in chunks:
+            if isinstance(chunk, OsLogEvent):
+                yield chunk
+            else:
+                yield from iter_kd_bufs(chunk, self.event_filter)
+
+    def _arrays_from_chunks(self, chunks):
+        for chunk in chunks:
+            if isinstance(chunk, OsLogEvent):
+                yield chunk
+            elif self.event_filter:
+                kevents = from_kd_bufs(chunk)
+                yield kevents[self.event_filter.mask(kevents)]
+            else:
+                yield from_kd_bufs(chunk)
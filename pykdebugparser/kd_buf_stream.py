@@ -0,0 +1,212 @@
+from collections import namedtuple
+import io
+
+from construct import Aligned, Int32ul, Int64ul
+
+from pykdebugparser.kd_buf_parser import KdBufParser, kd_header_v2, kd_header_v3, kd_threadmap, kd_v3_threadmap, \
+    RAW_VERSION_SIZE, RAW_VERSION2_BYTES, RAW_VERSION3_BYTES, TRACEV3_STACKSHOT_END, TRACEV3_THREADMAP_TAG, \
+    TRACEV3_EVENTS_TAG, TRACEV3_MORE_EVENTS, V3_HEADER_SIZE
+from pykdebugparser.kevent import iter_kd_bufs, KEVENT_SIZE
+
+# Number of bytes read at once by `parse`.
+STREAM_READ_SIZE = 0x100000
+# Size of the trace version 2 header, up to its thread map.
+V2_HEADER_SIZE = 0x11c
+THREADMAP_ENTRY_SIZE = kd_threadmap.sizeof()
+TAG_SIZE = len(TRACEV3_EVENTS_TAG)
+
+AdditionalData = namedtuple('AdditionalData', ['tag', 'data'])
+
+
+def _align8(size: int) -> int:
+    return (size + 7) & ~7
+
+
+class KdBufStreamParser(KdBufParser):
+    """
+    Push parser for kdebug streams, framing kevents across partial reads without seeking.
+    Data is fed as it arrives. Only the incomplete record at its end, and the trailing additional data blocks of a
+    trace version 3, are buffered.
+    """
+
+    def __init__(self, threads_pids=None, pids_names=None, event_filter=None):
+        super().__init__(threads_pids, pids_names, event_filter)
+        self._buffer = bytearray()
+        self._frame = self._frame_version
+        self._chunk_left = 0
+        self._additional_data = []
+
+    def parse(self, reader: io.IOBase):
+        """
+        Parse kevents from a stream, reading it in pieces. The stream doesn't have to be seekable.
+        :param reader: Stream to read from.
+        :return: Generator for parsed kevents, followed by parsed os_log events.
+        """
+        while True:
+            data = reader.read(STREAM_READ_SIZE)
+            if not data:
+                break
+            yield from self.feed(data)
+        yield from self.close()
+
+    def feed(self, data: bytes) -> list:
+        """
+        Parse the kevents completed by the next piece of the stream.
+        :param data: Next piece of the stream, of any size.
+        :return: Parsed kevents.
+        """
+        self._buffer += data
+        events = []
+        while self._frame(events):
+            pass
+        return events
+
+    def close(self) -> list:
+        """
+        Mark the end of the stream. A trailing partial kevent is dropped.
+        :return: Parsed os_log events of a trace version 3, known only once its additional data is complete.
+        """
+        if self._frame in (self._frame_version, self._frame_v2_header, self._frame_v3_header,
+                           self._frame_stackshot, self._frame_threadmap_tag, self._frame_threadmap):
+            raise EOFError('Stream ended before the end of the trace header')
+        if self._frame == self._frame_additional_data:
+            # The last block might not be padded.
+            while self._frame_additional_data([], aligned=False):
+                pass
+        self._buffer.clear()
+        if self.version != RAW_VERSION3_BYTES:
+            return []
+        return list(self.apply_v3_additional_data(self._additional_data))
+
+    def _frame_version(self, events) -> bool:
+        if len(self._buffer) < RAW_VERSION_SIZE:
+            return False
+        self.version = bytes(self._buffer[:RAW_VERSION_SIZE])
+        del self._buffer[:RAW_VERSION_SIZE]
+        if self.version == RAW_VERSION2_BYTES:
+            self._frame = self._frame_v2_header
+        elif self.version == RAW_VERSION3_BYTES:
+            self._frame = self._frame_v3_header
+        else:
+            raise ValueError(f'Unknown trace version {self.version!r}')
+        return True
+
+    def _frame_v2_header(self, events) -> bool:
+        if len(self._buffer) < V2_HEADER_SIZE:
+            return False
+        size = V2_HEADER_SIZE + Int32ul.parse(self._buffer[:4]) * THREADMAP_ENTRY_SIZE
+        if len(self._buffer) < size:
+            return False
+        self.set_thread_map(kd_header_v2.parse(bytes(self._buffer[:size])).threadmap)
+        del self._buffer[:size]
+        self._frame = self._frame_v2_padding
+        return True
+
+    def _frame_v2_padding(self, events) -> bool:
+        # The header is padded with zeros up to the first kevent, whose timestamp isn't zero.
+        del self._buffer[:len(self._buffer) - len(self._buffer.lstrip(b'\x00'))]
+        if not self._buffer:
+            return False
+        self._frame = self._frame_v2_events
+        return True
+
+    def _frame_v2_events(self, events) -> bool:
+        size = len(self._buffer) - len(self._buffer) % KEVENT_SIZE
+        if size:
+            events.extend(iter_kd_bufs(bytes(self._buffer[:size]), self.event_filter))
+            del self._buffer[:size]
+        return False
+
+    def _frame_v3_header(self, events) -> bool:
+        if len(self._buffer) < V3_HEADER_SIZE + 8:
+            return False
+        header_size = _align8(V3_HEADER_SIZE + 8 + Int64ul.parse(self._buffer[V3_HEADER_SIZE:V3_HEADER_SIZE + 8]))
+        # The header is followed by padding aligning the stream to 8 bytes.
+        size = header_size + 8 - RAW_VERSION_SIZE
+        if len(self._buffer) < size:
+            return False
+        self.v3_header = Aligned(8, kd_header_v3).parse(bytes(self._buffer[:header_size]))
+        del self._buffer[:size]
+        self._frame = self._frame_stackshot
+        return True
+
+    def _skip_until(self, tag: bytes) -> bool:
+        position = self._buffer.find(tag)
+        if position == -1:
+            # Keep the tail, the tag might cross the pieces boundary.
+            del self._buffer[:max(len(self._buffer) - len(tag) + 1, 0)]
+            return False
+        del self._buffer[:position + len(tag)]
+        return True
+
+    def _frame_stackshot(self, events) -> bool:
+        # The threadmap tag appears randomly in the stackshot.
+        if not self._skip_until(TRACEV3_STACKSHOT_END):
+            return False
+        self._frame = self._frame_threadmap_tag
+        return True
+
+    def _frame_threadmap_tag(self, events) -> bool:
+        if not self._skip_until(TRACEV3_THREADMAP_TAG):
+            return False
+        self._frame = self._frame_threadmap
+        return True
+
+    def _frame_threadmap(self, events) -> bool:
+        if len(self._buffer) < 8:
+            return False
+        size = 8 + Int64ul.parse(self._buffer[:8])
+        if len(self._buffer) < size:
+            return False
+        self.set_thread_map(kd_v3_threadmap.parse(bytes(self._buffer[:size])).threadmap)
+        del self._buffer[:size]
+        self._frame = self._frame_events_tag
+        return True
+
+    def _frame_events_tag(self, events) -> bool:
+        if not self._skip_until(TRACEV3_EVENTS_TAG):
+            return False
+        self._frame = self._frame_events_chunk
+        return True
+
+    def _frame_events_chunk(self, events) -> bool:
+        # Chunk size, followed by 8 unknown bytes, all zeros.
+        if len(self._buffer) < 16:
+            return False
+        self._chunk_left = Int64ul.parse(self._buffer[:8]) // KEVENT_SIZE * KEVENT_SIZE
+        del self._buffer[:16]
+        self._frame = self._frame_v3_events
+        return True
+
+    def _frame_v3_events(self, events) -> bool:
+        size = min(len(self._buffer) - len(self._buffer) % KEVENT_SIZE, self._chunk_left)
+        if size:
+            events.extend(iter_kd_bufs(bytes(self._buffer[:size]), self.event_filter))
+            del self._buffer[:size]
+            self._chunk_left -= size
+        if self._chunk_left:
+            return False
+        self._frame = self._frame_more_events
+        return True
+
+    def _frame_more_events(self, events) -> bool:
+        if len(self._buffer) < TAG_SIZE:
+            return False
+        if self._buffer[:TAG_SIZE] == TRACEV3_MORE_EVENTS:
+            del self._buffer[:TAG_SIZE]
+            self._frame = self._frame_events_tag
+        else:
+            self._frame = self._frame_additional_data
+        return True
+
+    def _frame_additional_data(self, events, aligned=True) -> bool:
+        if len(self._buffer) < TAG_SIZE + 8:
+            return False
+        data_size = Int64ul.parse(self._buffer[TAG_SIZE:TAG_SIZE + 8])
+        size = TAG_SIZE + (_align8(8 + data_size) if aligned else 8 + data_size)
+        if len(self._buffer) < size:
+            return False
+        data = bytes(self._buffer[TAG_SIZE + 8:TAG_SIZE + 8 + data_size])
+        self._additional_data.append(AdditionalData(bytes(self._buffer[:TAG_SIZE]), data))
+        del self._buffer[:size]
+        return True
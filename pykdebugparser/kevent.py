@@ -1,12 +1,57 @@
 from collections import namedtuple
+from collections.abc import Sequence
 import enum
+from functools import lru_cache
+from operator import itemgetter
 import struct
 
 KDBG_EVENTID_MASK = 0xfffffffc
 KDBG_FUNC_MASK = 0x00000003
 KD_BUF_FORMAT = '<Q32sQIIQ'
+KEVENT_SIZE = struct.calcsize(KD_BUF_FORMAT)
 Kevent = namedtuple('Kevent', ['timestamp', 'data', 'values', 'tid', 'debugid', 'eventid', 'func_qualifier'])
 
+kd_buf_struct = struct.Struct(KD_BUF_FORMAT)
+kd_buf_args_struct = struct.Struct('<QQQQ')  # There are 4 arguments, 64 bit each.
+kd_buf_timestamp_struct = struct.Struct('<Q56x')
+kd_buf_ids_struct = struct.Struct('<40xQI12x')
+
+
+@lru_cache(maxsize=None)
+def numpy_module():
+    """
+    Import numpy on first use, it is slow to import and only the columnar decoding needs it.
+    :return: numpy module, None if it isn't installed.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _require_numpy():
+    np = numpy_module()
+    if np is None:
+        raise ImportError('numpy is required for columnar kevents decoding')
+    return np
+
+
+@lru_cache(maxsize=None)
+def kd_buf_dtype():
+    """
+    Get the numpy dtype of a kd_buf kevent's struct.
+    :return: Structured dtype.
+    """
+    return _require_numpy().dtype([
+        ('timestamp', '<u8'),
+        ('args', '<u8', (4,)),
+        ('tid', '<u8'),
+        ('debugid', '<u4'),
+        ('cpuid', '<u4'),
+        ('unused', '<u8'),
+    ])
+
 
 class DgbFuncQual(enum.Enum):
     """
@@ -18,6 +63,57 @@ class DgbFuncQual(enum.Enum):
     DBG_FUNC_ALL = 3
 
 
+class KeventFilter:
+    """
+    Picklable kevents predicate, matching by thread id and by class / subclass.
+    """
+
+    def __init__(self, tid=None, classes=(), subclasses=()):
+        """
+        :param tid: Thread ID to match. None for all.
+        :param classes: Event classes to match. Empty for all.
+        :param subclasses: Event subclasses (including their class) to match. Empty for all.
+        """
+        self.tid = tid
+        self.classes = frozenset(classes)
+        self.subclasses = frozenset(subclasses)
+
+    def __bool__(self):
+        return self.tid is not None or bool(self.classes) or bool(self.subclasses)
+
+    def __call__(self, event: Kevent) -> bool:
+        return self.matches(event.tid, event.debugid)
+
+    def matches(self, tid: int, debugid: int) -> bool:
+        """
+        Match raw kd_buf fields, before any kevent object is built.
+        :param tid: Thread ID of the kevent.
+        :param debugid: Debug ID of the kevent.
+        :return: Whether the kevent should be kept.
+        """
+        if self.tid is not None and tid != self.tid:
+            return False
+        if self.classes or self.subclasses:
+            # The function qualifier bits do not affect the class and subclass.
+            return debugid >> 24 in self.classes or debugid >> 16 in self.subclasses
+        return True
+
+    def mask(self, kevents: 'KeventArray'):
+        """
+        Match a whole KeventArray at once.
+        :param kevents: Kevents to match.
+        :return: Boolean numpy array of the kevents that should be kept.
+        """
+        np = _require_numpy()
+        mask = np.ones(len(kevents), dtype=bool)
+        if self.tid is not None:
+            mask &= kevents.tid == self.tid
+        if self.classes or self.subclasses:
+            debugid = kevents.debugid
+            mask &= (np.isin(debugid >> 24, list(self.classes)) | np.isin(debugid >> 16, list(self.subclasses)))
+        return mask
+
+
 def from_kd_buf(kd_buf: bytes) -> Kevent:
     """
     Create a Kevent object from a kd_buf kevent's struct.
@@ -29,3 +125,227 @@ def from_kd_buf(kd_buf: bytes) -> Kevent:
     qual = debugid & KDBG_FUNC_MASK
     args = struct.unpack('<QQQQ', args_buf)  # There are 4 arguments, 64 bit each.
     return Kevent(timestamp, args_buf, args, tid, debugid, eventid, qual)
+
+
+def iter_kd_bufs(kd_bufs, event_filter: KeventFilter = None):
+    """
+    Create Kevent objects from a buffer of consecutive kd_buf kevent's structs.
+    :param kd_bufs: Buffer of kd_buf kevent's structs, its size must be a multiple of KEVENT_SIZE.
+    :param event_filter: Filter tested on the raw structs, Kevent objects are built only for the matching ones.
+    :return: Generator for parsed kevents.
+    """
+    if not event_filter:
+        return _iter_kd_bufs(kd_bufs)
+    if numpy_module() is not None:
+        kevents = from_kd_bufs(kd_bufs)
+        return iter(kevents[event_filter.mask(kevents)])
+    return map(itemgetter(1), _enumerate_filtered_kd_bufs(kd_bufs, event_filter))
+
+
+def enumerate_kd_bufs(kd_bufs, event_filter: KeventFilter = None):
+    """
+    Create Kevent objects from a buffer of consecutive kd_buf kevent's structs, along with their position.
+    :param kd_bufs: Buffer of kd_buf kevent's structs, its size must be a multiple of KEVENT_SIZE.
+    :param event_filter: Filter tested on the raw structs, Kevent objects are built only for the matching ones.
+    :return: Generator for tuples of the index of the kevent's struct in the buffer and the parsed kevent.
+    """
+    if not event_filter:
+        return enumerate(_iter_kd_bufs(kd_bufs))
+    if numpy_module() is not None:
+        kevents = from_kd_bufs(kd_bufs)
+        mask = event_filter.mask(kevents)
+        return zip(_require_numpy().flatnonzero(mask).tolist(), kevents[mask])
+    return _enumerate_filtered_kd_bufs(kd_bufs, event_filter)
+
+
+def filter_kd_bufs(kd_bufs, event_filter: KeventFilter) -> bytes:
+    """
+    Keep the kd_buf kevent's structs matching a filter, without building Kevent objects.
+    :param kd_bufs: Buffer of kd_buf kevent's structs, its size must be a multiple of KEVENT_SIZE.
+    :param event_filter: Filter tested on the raw structs.
+    :return: Matching kd_buf kevent's structs.
+    """
+    if numpy_module() is not None:
+        kevents = from_kd_bufs(kd_bufs)
+        return kevents.records[event_filter.mask(kevents)].tobytes()
+    matches = event_filter.matches
+    view = memoryview(kd_bufs)
+    return b''.join([view[i * KEVENT_SIZE:(i + 1) * KEVENT_SIZE]
+                     for i, (tid, debugid) in enumerate(kd_buf_ids_struct.iter_unpack(kd_bufs)) if matches(tid, debugid)])
+
+
+def kd_bufs_fields(kd_bufs, event_filter: KeventFilter = None) -> list:
+    """
+    Decode kd_buf kevent's structs into plain tuples of the Kevent fields, much cheaper to pickle than Kevent objects.
+    Kevent._make builds the kevents back from them.
+    :param kd_bufs: Buffer of kd_buf kevent's structs, its size must be a multiple of KEVENT_SIZE.
+    :param event_filter: Filter tested on the raw structs, only the matching ones are decoded.
+    :return: Fields of the decoded kevents.
+    """
+    if event_filter:
+        kd_bufs = filter_kd_bufs(kd_bufs, event_filter)
+    unpack_args = kd_buf_args_struct.unpack
+    return [(timestamp, args_buf, unpack_args(args_buf), tid, debugid, debugid & KDBG_EVENTID_MASK,
+             debugid & KDBG_FUNC_MASK)
+            for timestamp, args_buf, tid, debugid, cpuid, unused in kd_buf_struct.iter_unpack(kd_bufs)]
+
+
+def _iter_kd_bufs(kd_bufs):
+    unpack_args = kd_buf_args_struct.unpack
+    for timestamp, args_buf, tid, debugid, cpuid, unused in kd_buf_struct.iter_unpack(kd_bufs):
+        yield Kevent(timestamp, args_buf, unpack_args(args_buf), tid, debugid, debugid & KDBG_EVENTID_MASK,
+                     debugid & KDBG_FUNC_MASK)
+
+
+def _enumerate_filtered_kd_bufs(kd_bufs, event_filter: KeventFilter):
+    matches = event_filter.matches
+    unpack_from = kd_buf_struct.unpack_from
+    unpack_args = kd_buf_args_struct.unpack
+    for i, (tid, debugid) in enumerate(kd_buf_ids_struct.iter_unpack(kd_bufs)):
+        if matches(tid, debugid):
+            timestamp, args_buf, tid, debugid, cpuid, unused = unpack_from(kd_bufs, i * KEVENT_SIZE)
+            yield i, Kevent(timestamp, args_buf, unpack_args(args_buf), tid, debugid, debugid & KDBG_EVENTID_MASK,
+                            debugid & KDBG_FUNC_MASK)
+
+
+def kd_bufs_timestamps_range(kd_bufs):
+    """
+    Get the timestamps range of consecutive kd_buf kevent's structs.
+    :param kd_bufs: Buffer of kd_buf kevent's structs, its size must be a multiple of KEVENT_SIZE.
+    :return: Tuple of minimal and maximal timestamps, Nones for an empty buffer.
+    """
+    if not len(kd_bufs):
+        return None, None
+    if numpy_module() is not None:
+        timestamps = from_kd_bufs(kd_bufs).timestamp
+        return int(timestamps.min()), int(timestamps.max())
+    timestamps = [timestamp for timestamp, in kd_buf_timestamp_struct.iter_unpack(kd_bufs)]
+    return min(timestamps), max(timestamps)
+
+
+class KeventArray:
+    """
+    Columnar view over consecutive kd_buf kevent's structs, backed by a numpy structured array.
+    """
+
+    def __init__(self, records):
+        self.records = records
+
+    @property
+    def timestamp(self):
+        return self.records['timestamp']
+
+    @property
+    def args(self):
+        return self.records['args']
+
+    @property
+    def tid(self):
+        return self.records['tid']
+
+    @property
+    def debugid(self):
+        return self.records['debugid']
+
+    @property
+    def cpuid(self):
+        return self.records['cpuid']
+
+    @property
+    def eventid(self):
+        return self.records['debugid'] & _require_numpy().uint32(KDBG_EVENTID_MASK)
+
+    @property
+    def func_qualifier(self):
+        return self.records['debugid'] & _require_numpy().uint32(KDBG_FUNC_MASK)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, _require_numpy().integer)):
+            return from_kd_buf(self.records[item].tobytes())
+        return KeventArray(self.records[item])
+
+    def __iter__(self):
+        return iter_kd_bufs(_require_numpy().ascontiguousarray(self.records))
+
+
+def from_kd_bufs(kd_bufs) -> KeventArray:
+    """
+    Create a KeventArray from a buffer of consecutive kd_buf kevent's structs, without copying it.
+    :param kd_bufs: Buffer of kd_buf kevent's structs. Trailing partial struct is ignored.
+    :return: Parsed kevents.
+    """
+    np = _require_numpy()
+    return KeventArray(np.frombuffer(kd_bufs, dtype=kd_buf_dtype(), count=len(kd_bufs) // KEVENT_SIZE))
+
+
+class KeventStore:
+    """
+    Append-only store of kevents, packed back into kd_buf structs.
+    """
+    __slots__ = ('kd_bufs',)
+
+    def __init__(self):
+        self.kd_bufs = bytearray()
+
+    def __len__(self):
+        return len(self.kd_bufs) // KEVENT_SIZE
+
+    def append(self, event: Kevent):
+        # The cpuid isn't part of a Kevent, it is the only field not restored.
+        self.kd_bufs += kd_buf_struct.pack(event.timestamp, event.data, event.tid, event.debugid, 0, 0)
+
+    def kevents(self, start: int, end: int) -> list:
+        """
+        Decode a range of the stored kevents.
+        :param start: Index of the first kevent.
+        :param end: Index after the last kevent.
+        :return: Decoded kevents.
+        """
+        return list(_iter_kd_bufs(self.kd_bufs[start * KEVENT_SIZE:end * KEVENT_SIZE]))
+
+    def array(self, start: int, end: int) -> KeventArray:
+        """
+        Decode a range of the stored kevents into columnar arrays.
+        :param start: Index of the first kevent.
+        :param end: Index after the last kevent.
+        :return: Decoded kevents.
+        """
+        return from_kd_bufs(bytes(self.kd_bufs[start * KEVENT_SIZE:end * KEVENT_SIZE]))
+
+
+class KeventsRef(Sequence):
+    """
+    Range of a KeventStore, decoded only when accessed.
+    """
+    __slots__ = ('store', 'start', 'end')
+
+    def __init__(self, store: KeventStore, start: int, end: int):
+        self.store = store
+        self.start = start
+        self.end = end
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self.store.kevents(self.start, self.end)[item]
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError('kevent index out of range')
+        return self.store.kevents(self.start + item, self.start + item + 1)[0]
+
+    def __iter__(self):
+        return iter(self.store.kevents(self.start, self.end))
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, tuple, KeventsRef)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
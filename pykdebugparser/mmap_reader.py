@@ -0,0 +1,87 @@
+import io
+import mmap
+
+
+class MmapReader:
+    """
+    Seekable reader over a memory mapped file.
+    Besides the usual copying `read`, it can hand out zero-copy views over the mapping.
+    """
+
+    def __init__(self, fd: io.IOBase):
+        """
+        Map the whole of an opened file. The file can be closed once mapped.
+        :param fd: File opened for reading. Reading starts at its current position.
+        """
+        self._map = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            self._map.madvise(mmap.MADV_SEQUENTIAL)
+        self._view = memoryview(self._map)
+        self._position = fd.tell()
+        self.name = getattr(fd, 'name', None)
+
+    @classmethod
+    def open(cls, path: str) -> 'MmapReader':
+        """
+        Map a file by its path.
+        :param path: Path of the file to map.
+        :return: Reader over the mapped file.
+        """
+        with open(path, 'rb') as fd:
+            return cls(fd)
+
+    def __len__(self):
+        return len(self._map)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._map)
+        self._position = max(offset, 0)
+        return self._position
+
+    def read_view(self, size: int = -1) -> memoryview:
+        """
+        Read from the mapping without copying.
+        :param size: Number of bytes to read. Omit to read until the end.
+        :return: View over the read bytes.
+        """
+        start = min(self._position, len(self._map))
+        end = len(self._map) if size is None or size < 0 else min(start + size, len(self._map))
+        self._position = end
+        return self._view[start:end]
+
+    def read(self, size: int = -1) -> bytes:
+        return self.read_view(size).tobytes()
+
+    def find(self, data: bytes) -> int:
+        """
+        Search data in the mapping, starting at the current position.
+        :param data: Data to search.
+        :return: Offset of the data in the mapping, or -1 if not found.
+        """
+        return self._map.find(data, self._position)
+
+    def close(self):
+        try:
+            self._view.release()
+            self._map.close()
+        except BufferError:
+            # Views over the mapping are still alive, it will be unmapped once they are released.
+            pass
@@ -0,0 +1,157 @@
+from array import array
+from collections import deque
+import heapq
+from itertools import islice
+import multiprocessing
+from operator import itemgetter
+from queue import Empty
+
+from pykdebugparser.kevent import iter_kd_bufs, kd_buf_struct
+from pykdebugparser.trace_handlers import FAMILIES_CLASSES, load_handlers
+from pykdebugparser.trace_codes import TraceCodes
+from pykdebugparser.traces_parser import TracesParser, EAGER_FAMILIES
+
+# Number of kevents routed to the workers at once.
+PARALLEL_TRACES_BATCH_SIZE = 0x4000
+# Seconds between checks that the workers are still alive, while waiting for their traces.
+WORKERS_POLL_INTERVAL = 1
+# Families parsed by the workers. The others update or read the shared maps, so they are parsed by the main process.
+SHARDED_FAMILIES = frozenset(FAMILIES_CLASSES) - EAGER_FAMILIES
+
+
+def _pack_kevents(events) -> bytes:
+    return b''.join([kd_buf_struct.pack(e.timestamp, e.data, e.tid, e.debugid, 0, 0) for e in events])
+
+
+def _parse_shard(trace_codes_map, families, batches, results):
+    try:
+        parser = TracesParser(trace_codes_map, {}, {}, families=families)
+        for seqs, kd_bufs in iter(batches.get, None):
+            traces = []
+            for seq, event in zip(array('Q', seqs), iter_kd_bufs(kd_bufs)):
+                trace = parser.feed(event)
+                if trace is not None:
+                    # Kevents are much cheaper to send back as raw kd_bufs than pickled.
+                    ktraces = _pack_kevents(trace.ktraces)
+                    trace.ktraces = None
+                    traces.append((seq, trace, ktraces))
+            results.put(traces)
+    except Exception as e:
+        # Raised again by the main process, instead of leaving it waiting for the traces.
+        results.put(e)
+
+
+class ParallelTracesParser:
+    """
+    Traces parser spreading the start / end pairing and the handlers over worker processes, sharded by tid.
+    The threads map and global strings are kept by the main process, which parses the families updating them.
+    Traces are emitted in the same order as TracesParser emits them.
+    """
+
+    def __init__(self, trace_codes_map, threads_pids, pids_names, workers: int, process_filter=None, families=None,
+                 batch_size: int = PARALLEL_TRACES_BATCH_SIZE):
+        """
+        :param trace_codes_map: Mapping between code and event name.
+        :param threads_pids: Mapping between thread ID and process ID.
+        :param pids_names: Mapping between process ID and process name.
+        :param workers: Number of worker processes.
+        :param process_filter: Process ID / name whose events are parsed. None for all.
+        :param families: Names of the handlers families to use. None for all.
+        :param batch_size: Number of kevents routed to the workers at once.
+        """
+        families = frozenset(FAMILIES_CLASSES) if families is None else frozenset(families)
+        self.trace_codes = trace_codes_map
+        self.workers = workers
+        self.batch_size = batch_size
+        self.sharded_families = SHARDED_FAMILIES & families
+        self.parser = TracesParser(trace_codes_map, threads_pids, pids_names, process_filter=process_filter,
+                                   families=EAGER_FAMILIES & families)
+        trace_codes = trace_codes_map if isinstance(trace_codes_map, TraceCodes) else TraceCodes(trace_codes_map)
+        # Events of the trace family are kept apart from the other events, the workers must not collect them.
+        self.unsharded_eventids = frozenset(
+            eventid for trace_name in load_handlers('trace') for eventid in trace_codes.by_name.get(trace_name, ())
+        ) if 'trace' in families else frozenset()
+
+    def feed_generator(self, generator):
+        context = multiprocessing.get_context()
+        batches = [context.Queue() for _ in range(self.workers)]
+        results = [context.Queue() for _ in range(self.workers)]
+        processes = [
+            context.Process(target=_parse_shard, args=(self.trace_codes, self.sharded_families, batches[i], results[i]),
+                            daemon=True)
+            for i in range(self.workers)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            # The main process parses the next batch while the workers parse the current one.
+            pending = deque()
+            events = enumerate(generator)
+            while True:
+                batch = list(islice(events, self.batch_size))
+                if not batch:
+                    break
+                pending.append(self._route_batch(batch, batches))
+                if len(pending) > 1:
+                    yield from self._merge_batch(pending.popleft(), results, processes)
+            while pending:
+                yield from self._merge_batch(pending.popleft(), results, processes)
+        finally:
+            for queue in batches:
+                queue.put(None)
+            for process in processes:
+                process.join(1)
+                if process.is_alive():
+                    process.terminate()
+
+    def _route_batch(self, batch, batches):
+        parser = self.parser
+        unsharded_eventids = self.unsharded_eventids
+        shards_seqs = [array('Q') for _ in batches]
+        shards_events = [[] for _ in batches]
+        traces = []
+        for seq, event in batch:
+            trace = parser.feed(event)
+            if trace is not None:
+                traces.append((seq, trace, None))
+            if event.eventid in unsharded_eventids:
+                continue
+            if parser.process_filter is not None and not parser.is_tid_allowed(event.tid):
+                continue
+            shard = event.tid % len(batches)
+            shards_seqs[shard].append(seq)
+            shards_events[shard].append(event)
+        for queue, seqs, events in zip(batches, shards_seqs, shards_events):
+            queue.put((seqs.tobytes(), _pack_kevents(events)))
+        return traces
+
+    def _merge_batch(self, traces, results, processes):
+        shards_traces = [self._shard_traces(queue, process) for queue, process in zip(results, processes)]
+        for _, trace, ktraces in heapq.merge(traces, *shards_traces, key=itemgetter(0)):
+            if ktraces is not None:
+                trace.ktraces = list(iter_kd_bufs(ktraces))
+            yield trace
+
+    @staticmethod
+    def _shard_traces(queue, process) -> list:
+        """
+        Wait for the traces of a batch from a worker.
+        :param queue: Results queue of the worker.
+        :param process: Worker process.
+        :return: Traces of the worker's shard, with their sequence numbers and raw kevents.
+        """
+        while True:
+            try:
+                traces = queue.get(timeout=WORKERS_POLL_INTERVAL)
+                break
+            except Empty:
+                if not process.is_alive():
+                    # The worker might have put its traces just before exiting.
+                    try:
+                        traces = queue.get(timeout=WORKERS_POLL_INTERVAL)
+                        break
+                    except Empty:
+                        raise RuntimeError(f'Traces parsing worker exited with code {process.exitcode}') from None
+        if isinstance(traces, Exception):
+            raise traces
+        return traces
@@ -1,14 +1,18 @@
+import asyncio
 from datetime import datetime
 import io
+import os
 
 from pygments import highlight, lexers, formatters
 from termcolor import colored
 
 from pykdebugparser.callstacks_parser import CallstacksParser
-from pykdebugparser.kd_buf_parser import KdBufParser
-from pykdebugparser.kevent import DgbFuncQual
-from pykdebugparser.trace_codes import default_trace_codes
-from pykdebugparser.traces_parser import TracesParser
+from pykdebugparser.kd_buf_parser import KdBufParser, RAW_VERSION_SIZE, RAW_VERSION3_BYTES, TRACEV3_TRACE_CODES
+from pykdebugparser.kd_buf_stream import KdBufStreamParser
+from pykdebugparser.kevent import DgbFuncQual, KeventFilter
+from pykdebugparser.parallel_traces_parser import ParallelTracesParser
+from pykdebugparser.trace_codes import default_trace_codes, with_embedded_trace_codes
+from pykdebugparser.traces_parser import TracesParser, LazyTrace
 from pykdebugparser.os_log_event import OsLogEvent
 
 c_lexer = lexers.CLexer()
@@ -17,6 +21,8 @@ color_formatter = formatters.TerminalTrueColorFormatter(style='stata-dark')
 DBG_TRACE = 7
 DBG_FSYSTEM = 3
 DBG_BSD = 4
+# Number of bytes read at once from a live stream.
+STREAM_READ_SIZE = 0x10000
 
 
 class PyKdebugParser:
@@ -25,6 +31,15 @@ class PyKdebugParser:
         self.filter_process = None
         self.filter_class = []
         self.filter_subclass = []
+        self.parallel = None
+        self.parallel_traces = None
+        self.max_open_age = None
+        self.max_open_per_tid = None
+        self.evict_on_terminate = False
+        self.emit_partial_traces = False
+        self.lazy_traces = False
+        self.handler_families = None
+        self.track_fds = False
         self.show_timestamp = True
         self.show_name = True
         self.show_func_qual = True
@@ -43,21 +58,121 @@ class PyKdebugParser:
         self.dyld_uuids = []
 
     def kevents(self, kdebug: io.IOBase):
-        events_generator = KdBufParser(self.threads_pids, self.pids_names).parse(kdebug)
-        events_generator = filter(lambda e: not isinstance(e, OsLogEvent), events_generator)
-        if self.filter_tid is not None:
-            events_generator = filter(lambda e: e.tid == self.filter_tid, events_generator)
-        if self.filter_class or self.filter_subclass:
-            events_generator = filter(lambda e: self._is_eventid_allowed(e.eventid), events_generator)
-        return events_generator
+        # Filters are tested on the raw kd_bufs, before any kevent is built.
+        event_filter = KeventFilter(self.filter_tid, self.filter_class, self.filter_subclass)
+        kd_buf_parser = self._kd_buf_parser_class(kdebug)(self.threads_pids, self.pids_names, event_filter)
+        if self.parallel and self._is_v3_file(kdebug):
+            events_generator = kd_buf_parser.parse_file(kdebug.name, self.parallel)
+        else:
+            events_generator = kd_buf_parser.parse(kdebug)
+        return filter(lambda e: not isinstance(e, OsLogEvent), events_generator)
 
     def formatted_kevents(self, kdebug: io.IOBase, trace_codes=None):
-        trace_codes_map = default_trace_codes() if trace_codes is None else trace_codes
+        trace_codes_map = self._trace_codes(kdebug) if trace_codes is None else trace_codes
         return map(lambda e: self._format_kevent(e, trace_codes_map), self.kevents(kdebug))
 
     def traces(self, kdebug: io.IOBase, trace_codes=None):
-        trace_codes_map = default_trace_codes() if trace_codes is None else trace_codes
+        trace_codes_map = self._trace_codes(kdebug) if trace_codes is None else trace_codes
+        traces_parser, filter_traces = self._traces_parser(trace_codes_map, self.parallel_traces)
+        return filter_traces(traces_parser.feed_generator(self.kevents(kdebug)))
+
+    def formatted_traces(self, kdebug: io.IOBase, trace_codes=None):
+        # Lazy traces are resolved as they are formatted anyway, the ones whose handler ignored the events are dropped.
+        traces = filter(lambda t: not isinstance(t, LazyTrace) or t.resolve() is not None, self.traces(kdebug, trace_codes))
+        return map(lambda t: self._format_trace(t), traces)
+
+    def callstacks(self, kdebug: io.IOBase, trace_codes=None):
+        callstacks_parser = CallstacksParser(self.dyld_addresses, self.dyld_uuids)
+        return callstacks_parser.feed_generator(self.traces(kdebug, trace_codes))
+
+    def formatted_callstacks(self, kdebug: io.IOBase, trace_codes=None):
+        return map(lambda t: self._format_callstack(t), self.callstacks(kdebug, trace_codes))
+
+    def os_log_events(self, kdebug: io.IOBase):
+        events_generator = self._kd_buf_parser_class(kdebug)(self.threads_pids, self.pids_names).parse(kdebug)
+        return filter(self._filter_log_callback, events_generator)
+
+    def formatted_logs(self, kdebug: io.IOBase):
+        return map(lambda t: self._format_log(t), self.os_log_events(kdebug))
+
+    async def akevents(self, reader: asyncio.StreamReader):
+        """
+        Parse kevents from a live stream.
+        Each read(STREAM_READ_SIZE) of the reader is driven by the consumer and nothing is queued in between, so the
+        reader's buffer limit pauses a source that produces faster. Consume it directly, draining it from a task that
+        queues the kevents without bound gives that backpressure up.
+        :param reader: Stream to read from.
+        :return: Async generator for parsed kevents.
+        """
+        async for events in self._akevents_batches(reader):
+            for event in events:
+                if not isinstance(event, OsLogEvent):
+                    yield event
+
+    async def atraces(self, reader: asyncio.StreamReader, trace_codes=None):
+        """
+        Parse traces from a live stream.
+        Like akevents, reading is driven by the consumer, without any queue between the reader and the parsing.
+        :param reader: Stream to read from.
+        :param trace_codes: Mapping between code and event name. Omit for the default trace codes.
+        :return: Async generator for parsed traces.
+        """
+        traces_parser, filter_traces = self._traces_parser(
+            default_trace_codes() if trace_codes is None else trace_codes, None)
+        async for events in self._akevents_batches(reader):
+            events = [event for event in events if not isinstance(event, OsLogEvent)]
+            for trace in filter_traces(traces_parser.feed_generator(events)):
+                yield trace
 
+    async def acallstacks(self, reader: asyncio.StreamReader, trace_codes=None):
+        """
+        Parse callstacks from a live stream.
+        Like akevents, reading is driven by the consumer, without any queue between the reader and the parsing.
+        :param reader: Stream to read from.
+        :param trace_codes: Mapping between code and event name. Omit for the default trace codes.
+        :return: Async generator for parsed callstacks.
+        """
+        callstacks_parser = CallstacksParser(self.dyld_addresses, self.dyld_uuids)
+        async for trace in self.atraces(reader, trace_codes):
+            for callstack in callstacks_parser.feed_generator((trace,)):
+                yield callstack
+
+    async def aos_log_events(self, reader: asyncio.StreamReader):
+        """
+        Parse os_log events from a live stream.
+        Like akevents, reading is driven by the consumer, without any queue between the reader and the parsing.
+        :param reader: Stream to read from.
+        :return: Async generator for parsed os_log events.
+        """
+        kd_buf_parser = KdBufStreamParser(self.threads_pids, self.pids_names)
+        async for events in self._akevents_batches(reader, kd_buf_parser):
+            for event in filter(self._filter_log_callback, events):
+                yield event
+
+    async def _akevents_batches(self, reader: asyncio.StreamReader, kd_buf_parser=None):
+        # No queue between the reads and the consumer: each read waits for the previous batch to be consumed.
+        if kd_buf_parser is None:
+            event_filter = KeventFilter(self.filter_tid, self.filter_class, self.filter_subclass)
+            kd_buf_parser = KdBufStreamParser(self.threads_pids, self.pids_names, event_filter)
+        while True:
+            data = await reader.read(STREAM_READ_SIZE)
+            if not data:
+                break
+            events = kd_buf_parser.feed(data)
+            if events:
+                yield events
+        events = kd_buf_parser.close()
+        if events:
+            yield events
+
+    def _traces_parser(self, trace_codes_map, parallel_traces):
+        """
+        Create the traces parser and the filters of its traces, according to the parser's settings.
+        Class filters are extended with the classes that traces depend on, so it must run before the kevents are read.
+        :param trace_codes_map: Mapping between code and event name.
+        :param parallel_traces: Number of processes parsing the traces. None to parse serially.
+        :return: Traces parser and a function filtering the traces it generates.
+        """
         has_filters = self.filter_class or self.filter_subclass
         add_trace_class = has_filters and DBG_TRACE not in self.filter_class
         if add_trace_class:
@@ -67,39 +182,70 @@ class PyKdebugParser:
         if add_fs_class:
             self.filter_class.append(DBG_FSYSTEM)
 
-        traces_parser = TracesParser(trace_codes_map, self.threads_pids, self.pids_names)
-        trace_generator = traces_parser.feed_generator(self.kevents(kdebug))
+        if parallel_traces:
+            if (self.lazy_traces or self.max_open_age is not None or self.max_open_per_tid is not None
+                    or self.evict_on_terminate or self.emit_partial_traces):
+                # Open events are spread over the workers, and traces are sent back from them already parsed.
+                raise ValueError('Parallel traces parsing supports neither lazy traces nor evicting open events')
+            if self.track_fds:
+                # Descriptors are shared by the threads of a process, so their table can't be sharded by thread.
+                raise ValueError('Parallel traces parsing does not support tracking file descriptors')
+            traces_parser = ParallelTracesParser(trace_codes_map, self.threads_pids, self.pids_names,
+                                                 parallel_traces, self.filter_process, self.handler_families)
+        else:
+            traces_parser = TracesParser(trace_codes_map, self.threads_pids, self.pids_names, self.max_open_age,
+                                         self.max_open_per_tid, self.evict_on_terminate, self.emit_partial_traces,
+                                         self.lazy_traces, self.filter_process, self.handler_families,
+                                         self.track_fds)
 
-        if self.filter_process is not None:
-            trace_generator = filter(self._filter_process_callback, trace_generator)
-        if add_trace_class:
-            trace_generator = filter(lambda t: t.ktraces[0].eventid >> 24 != DBG_TRACE, trace_generator)
-        if add_fs_class:
-            trace_generator = filter(lambda t: t.ktraces[0].eventid >> 24 != DBG_FSYSTEM, trace_generator)
-        return trace_generator
+        def filter_traces(trace_generator):
+            if self.filter_process is not None:
+                # Only the threads map events of other processes are still parsed.
+                trace_generator = filter(self._filter_process_callback, trace_generator)
+            if add_trace_class:
+                trace_generator = filter(lambda t: t.ktraces[0].eventid >> 24 != DBG_TRACE, trace_generator)
+            if add_fs_class:
+                trace_generator = filter(lambda t: t.ktraces[0].eventid >> 24 != DBG_FSYSTEM, trace_generator)
+            return trace_generator
 
-    def formatted_traces(self, kdebug: io.IOBase, trace_codes=None):
-        return map(lambda t: self._format_trace(t), self.traces(kdebug, trace_codes))
+        return traces_parser, filter_traces
 
-    def callstacks(self, kdebug: io.IOBase, trace_codes=None):
-        callstacks_parser = CallstacksParser(self.dyld_addresses, self.dyld_uuids)
-        return callstacks_parser.feed_generator(self.traces(kdebug, trace_codes))
+    @staticmethod
+    def _is_v3_file(kdebug: io.IOBase) -> bool:
+        # Only trace version 3 files can be mapped again by their path, and split between processes.
+        name = getattr(kdebug, 'name', None)
+        if not isinstance(name, str) or not kdebug.seekable() or not os.path.isfile(name) or kdebug.tell() != 0:
+            return False
+        try:
+            return kdebug.read(RAW_VERSION_SIZE) == RAW_VERSION3_BYTES
+        finally:
+            kdebug.seek(0)
 
-    def formatted_callstacks(self, kdebug: io.IOBase, trace_codes=None):
-        return map(lambda t: self._format_callstack(t), self.callstacks(kdebug, trace_codes))
+    @staticmethod
+    def _kd_buf_parser_class(kdebug: io.IOBase):
+        # Pipes can't be seeked, their kevents are framed as they are read.
+        return KdBufParser if kdebug.seekable() else KdBufStreamParser
 
-    def os_log_events(self, kdebug: io.IOBase):
-        events_generator = KdBufParser(self.threads_pids, self.pids_names).parse(kdebug)
-        events_generator = filter(lambda e: isinstance(e, OsLogEvent), events_generator)
-        if self.filter_tid is not None:
-            events_generator = filter(lambda e: e.thread_identifier == self.filter_tid, events_generator)
-        if self.filter_process is not None:
-            events_generator = filter(lambda e: self.filter_process in (e.process, str(e.process_identifier)),
-                                      events_generator)
-        return events_generator
+    def _trace_codes(self, kdebug: io.IOBase):
+        # Only the metadata is read, so the trace codes embedded in the trace are known before the events.
+        if not kdebug.seekable():
+            return default_trace_codes()
+        position = kdebug.tell()
+        kd_buf_parser = KdBufParser()
+        try:
+            kd_buf_parser.read_metadata(kdebug, {TRACEV3_TRACE_CODES})
+        finally:
+            kdebug.seek(position)
+        if not kd_buf_parser.trace_codes:
+            return default_trace_codes()
+        return with_embedded_trace_codes(kd_buf_parser.trace_codes)
 
-    def formatted_logs(self, kdebug: io.IOBase):
-        return map(lambda t: self._format_log(t), self.os_log_events(kdebug))
+    def _filter_log_callback(self, event):
+        if not isinstance(event, OsLogEvent):
+            return False
+        if self.filter_tid is not None and event.thread_identifier != self.filter_tid:
+            return False
+        return self.filter_process is None or self.filter_process in (event.process, str(event.process_identifier))
 
     def _filter_process_callback(self, trace):
         tid = trace.ktraces[0].tid
@@ -182,6 +328,3 @@ class PyKdebugParser:
             event_rep += f' {process:<27} '
         event_rep += colored(os_log.composed_message, 'white') if self.color else os_log.composed_message
         return event_rep
-
-    def _is_eventid_allowed(self, event_id):
-        return (event_id >> 24 in self.filter_class) or (event_id >> 16 in self.filter_subclass)
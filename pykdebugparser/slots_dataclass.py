@@ -0,0 +1,17 @@
+from dataclasses import dataclass, fields
+
+
+def slots_dataclass(cls):
+    """
+    Create a dataclass whose fields are stored in __slots__ instead of a dict of each instance.
+    Same as `dataclass(slots=True)`, which requires Python 3.10.
+    Instances can't get attributes other than their fields.
+    :param cls: Class to convert.
+    :return: New dataclass.
+    """
+    cls = dataclass(cls)
+    names = tuple(f.name for f in fields(cls))
+    # Fields defaults are class attributes that would conflict with the slots, __init__ already holds them.
+    namespace = {k: v for k, v in cls.__dict__.items() if k not in names and k not in ('__dict__', '__weakref__')}
+    namespace['__slots__'] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
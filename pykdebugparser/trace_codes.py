@@ -1,6 +1,86 @@
-from typing import Mapping
+from collections.abc import Mapping as MappingABC
+from functools import lru_cache
+import hashlib
+import marshal
+import os
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
 from pathlib import Path
 
+DEFAULT_TRACE_CODES_PATH = Path(__file__).resolve().parent.joinpath('trace.codes')
+CACHE_DIR_ENV = 'PYKDEBUGPARSER_CACHE_DIR'
+# Number of merged trace codes mappings kept in memory, one for each OS build seen.
+MERGED_TRACE_CODES_CACHE_SIZE = 16
+
+_merged_trace_codes = {}
+
+
+class TraceCodes(MappingABC):
+    """
+    Read-only mapping between code and event name, with reverse and class / subclass indexes.
+    Indexes are built once, on first use, and shared by everyone using the mapping.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._codes = MappingProxyType(dict(*args, **kwargs))
+        # Looked up for every formatted kevent, so the proxy's own method is used.
+        self.get = self._codes.get
+        self._by_name = None
+        self._by_class = None
+        self._by_subclass = None
+
+    def __getitem__(self, code: int) -> str:
+        return self._codes[code]
+
+    def __contains__(self, code) -> bool:
+        return code in self._codes
+
+    def __iter__(self):
+        return iter(self._codes)
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __reduce__(self):
+        # Mapping proxies can't be pickled, the indexes are built again once needed.
+        return TraceCodes, (dict(self._codes),)
+
+    def __repr__(self):
+        return f'TraceCodes({dict(self._codes)!r})'
+
+    @property
+    def by_name(self) -> Mapping[str, Tuple[int, ...]]:
+        """
+        Mapping between event name and its codes, some names have more than one code.
+        """
+        if self._by_name is None:
+            self._by_name = self._index(lambda code, name: name)
+        return self._by_name
+
+    @property
+    def by_class(self) -> Mapping[int, Tuple[int, ...]]:
+        """
+        Mapping between event class and its codes.
+        """
+        if self._by_class is None:
+            self._by_class = self._index(lambda code, name: code >> 24)
+        return self._by_class
+
+    @property
+    def by_subclass(self) -> Mapping[int, Tuple[int, ...]]:
+        """
+        Mapping between event subclass (including its class) and its codes.
+        """
+        if self._by_subclass is None:
+            self._by_subclass = self._index(lambda code, name: code >> 16)
+        return self._by_subclass
+
+    def _index(self, key):
+        index = {}
+        for code, name in self.items():
+            index.setdefault(key(code, name), []).append(code)
+        return {k: tuple(codes) for k, codes in index.items()}
+
 
 def from_trace_codes_text(codes_text: str) -> Mapping[int, str]:
     """
@@ -8,7 +88,8 @@ def from_trace_codes_text(codes_text: str) -> Mapping[int, str]:
     :param codes_text: Trace codes file data.
     :return: Mapping between code and event name.
     """
-    return {int(s[0], 16): s[1] for s in map(lambda l: l.split(), codes_text.splitlines())}
+    # Codes embedded in traces might be NUL terminated and contain empty lines.
+    return {int(s[0], 16): s[1] for s in map(lambda l: l.split(), codes_text.strip('\x00').splitlines()) if s}
 
 
 def from_trace_codes_file(path: str) -> Mapping[int, str]:
@@ -21,10 +102,75 @@ def from_trace_codes_file(path: str) -> Mapping[int, str]:
         return from_trace_codes_text(fd.read())
 
 
-def default_trace_codes() -> Mapping[int, str]:
+def default_cache_dir() -> Optional[str]:
+    """
+    Get the directory of the compiled trace codes cache, set by the PYKDEBUGPARSER_CACHE_DIR environment variable.
+    :return: Cache directory path, None when trace codes aren't cached.
+    """
+    return os.environ.get(CACHE_DIR_ENV) or None
+
+
+def from_compiled_trace_codes_file(path: str, cache_dir: str = None) -> TraceCodes:
+    """
+    Read trace codes from a file, using a compiled form cached on disk by the file's hash.
+    :param path: Trace codes file path.
+    :param cache_dir: Directory of the compiled trace codes. Omit for the default, if any.
+    :return: Mapping between code and event name.
+    """
+    with open(path, 'rb') as fd:
+        data = fd.read()
+    return TraceCodes(_compiled_trace_codes(data, hashlib.sha256(data).hexdigest(), cache_dir))
+
+
+def _compiled_trace_codes(data: bytes, digest: str, cache_dir: str = None) -> Mapping[int, str]:
+    cache_dir = cache_dir or default_cache_dir()
+    if cache_dir is None:
+        return from_trace_codes_text(data.decode())
+    cache_path = os.path.join(cache_dir, f'trace_codes_{digest}.marshal')
+    try:
+        with open(cache_path, 'rb') as fd:
+            # Loading from bytes is much faster than letting marshal read the file piecemeal.
+            return marshal.loads(fd.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    codes = from_trace_codes_text(data.decode())
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = f'{cache_path}.{os.getpid()}'
+        with open(temp_path, 'wb') as fd:
+            fd.write(marshal.dumps(codes))
+        os.replace(temp_path, cache_path)
+    except OSError:
+        # Caching is best effort.
+        pass
+    return codes
+
+
+@lru_cache(maxsize=None)
+def default_trace_codes() -> TraceCodes:
     """
     Get the default trace codes mapping.
+    The file is read once, all callers share the same read-only mapping and its indexes.
     :return: Mapping between code and event name.
     """
-    with open(Path(__file__).resolve().parent.joinpath('trace.codes'), 'r') as fd:
-        return from_trace_codes_text(fd.read())
+    return from_compiled_trace_codes_file(str(DEFAULT_TRACE_CODES_PATH))
+
+
+def with_embedded_trace_codes(codes_text: str, cache_dir: str = None) -> TraceCodes:
+    """
+    Merge trace codes embedded in a trace over the default ones.
+    Merged mappings are read-only and cached by the embedded codes hash, so traces of the same OS build share them.
+    :param codes_text: Trace codes embedded in the trace.
+    :param cache_dir: Directory of the compiled trace codes. Omit for the default, if any.
+    :return: Mapping between code and event name.
+    """
+    data = codes_text.encode()
+    digest = hashlib.sha256(data).hexdigest()
+    codes = _merged_trace_codes.get(digest)
+    if codes is None:
+        codes = TraceCodes({**default_trace_codes(), **_compiled_trace_codes(data, digest, cache_dir)})
+        if len(_merged_trace_codes) >= MERGED_TRACE_CODES_CACHE_SIZE:
+            _merged_trace_codes.pop(next(iter(_merged_trace_codes)))
+        _merged_trace_codes[digest] = codes
+    return codes
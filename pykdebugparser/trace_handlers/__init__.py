@@ -0,0 +1,23 @@
+import importlib
+
+# Debug class of each handlers family. Family modules are imported only once their handlers are needed.
+FAMILIES_CLASSES = {
+    'mach': 0x01,
+    'fsystem': 0x03,
+    'bsd': 0x04,
+    'trace': 0x07,
+    'dyld': 0x1f,
+    'perf': 0x25,
+    'turnstile': 0x35,
+}
+
+
+def load_handlers(family: str) -> dict:
+    """
+    Import a handlers family.
+    :param family: Family name, one of FAMILIES_CLASSES.
+    :return: Mapping between event name and its handler.
+    """
+    if family not in FAMILIES_CLASSES:
+        raise ValueError(f'Unknown handlers family {family!r}')
+    return importlib.import_module(f'{__name__}.{family}').handlers
@@ -1,11 +1,13 @@
 import ctypes
 import enum
 import errno
-from dataclasses import dataclass
 from functools import partial
 from signal import Signals
 import socket
-from typing import List
+from typing import List, Optional
+
+from pykdebugparser.decoders import enum_decoder, flags_decoder
+from pykdebugparser.slots_dataclass import slots_dataclass
 
 IOC_REQUEST_PARAMS = {
     0x20000000: 'IOC_VOID',
@@ -107,6 +109,9 @@ class SigprocmaskFlags(enum.Enum):
     SIG_SETMASK = 3
 
 
+to_sigprocmask_flags = enum_decoder(SigprocmaskFlags)
+
+
 class FcntlCmd(enum.Enum):
     F_DUPFD = 0
     F_GETFD = 1
@@ -181,6 +186,9 @@ class FcntlCmd(enum.Enum):
     F_GETSIGSINFO = 105
 
 
+to_fcntl_cmd = enum_decoder(FcntlCmd)
+
+
 class PriorityWhich(enum.Enum):
     PRIO_PROCESS = 0
     PRIO_PGRP = 1
@@ -193,6 +201,9 @@ class PriorityWhich(enum.Enum):
     PRIO_DARWIN_CARPLAY_MODE = 8
 
 
+to_priority_which = enum_decoder(PriorityWhich)
+
+
 class SocketOptionName(enum.Enum):
     SO_DEBUG = 0x1
     SO_ACCEPTCONN = 0x2
@@ -280,6 +291,9 @@ class RusageWho(enum.Enum):
     RUSAGE_SELF = 0
 
 
+to_rusage_who = enum_decoder(RusageWho)
+
+
 class FlockOperation(enum.Enum):
     LOCK_SH = 1
     LOCK_EX = 2
@@ -307,6 +321,9 @@ class CsopsOps(enum.Enum):
     CS_OPS_16 = 16
 
 
+to_csops_ops = enum_decoder(CsopsOps)
+
+
 class ProcInfoCall(enum.Enum):
     PROC_INFO_CALL_LISTPIDS = 0x1
     PROC_INFO_CALL_PIDINFO = 0x2
@@ -330,6 +347,9 @@ class ProcInfoCall(enum.Enum):
     PROC_INFO_CALL_DELEGATE_TERMINATE = 0x14
 
 
+to_proc_info_call = enum_decoder(ProcInfoCall)
+
+
 class FsSnapshotOp(enum.Enum):
     SNAPSHOT_OP_CREATE = 0x01
     SNAPSHOT_OP_DELETE = 0x02
@@ -339,6 +359,10 @@ class FsSnapshotOp(enum.Enum):
     SNAPSHOT_OP_ROOT = 0x06
 
 
+to_fs_snapshot_op = enum_decoder(FsSnapshotOp)
+
+
+@flags_decoder
 def serialize_open_flags(flags: int) -> List[BscOpenFlags]:
     call_flags = []
     for flag in (BscOpenFlags.O_RDWR, BscOpenFlags.O_WRONLY):
@@ -357,6 +381,7 @@ def serialize_open_flags(flags: int) -> List[BscOpenFlags]:
     return call_flags
 
 
+@flags_decoder
 def serialize_stat_flags(flags: int) -> List[StatFlags]:
     stat_flags = []
     for flag in list(StatFlags):
@@ -379,6 +404,7 @@ def serialize_result(end_event, success_name='', fmt=lambda x: x) -> str:
     return success if not error_code else err
 
 
+@flags_decoder
 def serialize_access_flags(flags: int) -> List[BscAccessFlags]:
     amode = [flag for flag in BscAccessFlags if flag.value & flags]
     if not amode:
@@ -386,7 +412,22 @@ def serialize_access_flags(flags: int) -> List[BscAccessFlags]:
     return amode
 
 
-@dataclass
+@flags_decoder
+def serialize_msg_flags(flags: int) -> List[SocketMsgFlags]:
+    return [flag for flag in SocketMsgFlags if flag.value & flags]
+
+
+@flags_decoder
+def serialize_changeable_flags(flags: int) -> List[BscChangeableFlags]:
+    return [flag for flag in BscChangeableFlags if flag.value & flags]
+
+
+def _with_path(rep: str, path: Optional[str]) -> str:
+    # Only set on I/O traces when the file descriptors are tracked.
+    return rep if path is None else f'{rep}, path: "{path}"'
+
+
+@slots_dataclass
 class BscOpen:
     ktraces: List
     path: str
@@ -399,7 +440,7 @@ class BscOpen:
         return f'''open{no_cancel}("{self.path}", {' | '.join(map(lambda f: f.name, self.flags))}), {self.result}'''
 
 
-@dataclass
+@slots_dataclass
 class BscOpenat:
     ktraces: List
     dirfd: int
@@ -414,7 +455,7 @@ class BscOpenat:
                 f'''{' | '.join(map(lambda f: f.name, self.flags))}), {self.result}''')
 
 
-@dataclass
+@slots_dataclass
 class BscRead:
     ktraces: List
     fd: int
@@ -422,13 +463,15 @@ class BscRead:
     size: int
     result: str
     no_cancel: bool = False
+    path: Optional[str] = None
 
     def __str__(self):
         no_cancel = '_nocancel' if self.no_cancel else ''
-        return f'read{no_cancel}({self.fd}, {hex(self.address)}, {self.size}), {self.result}'
+        rep = f'read{no_cancel}({self.fd}, {hex(self.address)}, {self.size}), {self.result}'
+        return _with_path(rep, self.path)
 
 
-@dataclass
+@slots_dataclass
 class BscWrite:
     ktraces: List
     fd: int
@@ -436,13 +479,15 @@ class BscWrite:
     size: int
     result: str
     no_cancel: bool = False
+    path: Optional[str] = None
 
     def __str__(self):
         no_cancel = '_nocancel' if self.no_cancel else ''
-        return f'write{no_cancel}({self.fd}, {hex(self.address)}, {self.size}), {self.result}'
+        rep = f'write{no_cancel}({self.fd}, {hex(self.address)}, {self.size}), {self.result}'
+        return _with_path(rep, self.path)
 
 
-@dataclass
+@slots_dataclass
 class BscPread:
     ktraces: List
     fd: int
@@ -451,13 +496,15 @@ class BscPread:
     offset: int
     result: str
     no_cancel: bool = False
+    path: Optional[str] = None
 
     def __str__(self):
         no_cancel = '_nocancel' if self.no_cancel else ''
-        return f'pread{no_cancel}({self.fd}, {hex(self.address)}, {self.size}, {hex(self.offset)}), {self.result}'
+        rep = f'pread{no_cancel}({self.fd}, {hex(self.address)}, {self.size}, {hex(self.offset)}), {self.result}'
+        return _with_path(rep, self.path)
 
 
-@dataclass
+@slots_dataclass
 class BscPwrite:
     ktraces: List
     fd: int
@@ -466,13 +513,15 @@ class BscPwrite:
     offset: int
     result: str
     no_cancel: bool = False
+    path: Optional[str] = None
 
     def __str__(self):
         no_cancel = '_nocancel' if self.no_cancel else ''
-        return f'pwrite{no_cancel}({self.fd}, {hex(self.address)}, {self.size}, {hex(self.offset)}), {self.result}'
+        rep = f'pwrite{no_cancel}({self.fd}, {hex(self.address)}, {self.size}, {hex(self.offset)}), {self.result}'
+        return _with_path(rep, self.path)
 
 
-@dataclass
+@slots_dataclass
 class BscSysFstat64:
     ktraces: List
     fd: int
@@ -485,7 +534,7 @@ class BscSysFstat64:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscLstat64:
     ktraces: List
     path: str
@@ -498,7 +547,7 @@ class BscLstat64:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetdirentries64:
     ktraces: List
     fd: int
@@ -511,7 +560,7 @@ class BscGetdirentries64:
         return f'getdirentries64({self.fd}, {hex(self.buf)}, {self.bufsize}, {hex(self.position)}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscStatfs64:
     ktraces: List
     path: str
@@ -525,7 +574,7 @@ class BscStatfs64:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFstatfs64:
     ktraces: List
     fd: int
@@ -539,7 +588,7 @@ class BscFstatfs64:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetfsstat64:
     ktraces: List
     buf: int
@@ -551,7 +600,7 @@ class BscGetfsstat64:
         return f'getfsstat64({hex(self.buf)}, {self.bufsize}, {self.flags}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscPthreadFchdir:
     ktraces: List
     fd: int
@@ -564,7 +613,7 @@ class BscPthreadFchdir:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscAudit:
     ktraces: List
     record: int
@@ -578,7 +627,7 @@ class BscAudit:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscAuditon:
     ktraces: List
     cmd: int
@@ -593,7 +642,7 @@ class BscAuditon:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetauid:
     ktraces: List
     auid: int
@@ -606,7 +655,7 @@ class BscGetauid:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSetauid:
     ktraces: List
     auid: int
@@ -619,7 +668,7 @@ class BscSetauid:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscBsdthreadCreate:
     ktraces: List
     pid: int
@@ -628,7 +677,7 @@ class BscBsdthreadCreate:
         return 'thread_create()'
 
 
-@dataclass
+@slots_dataclass
 class BscKqueue:
     ktraces: List
     result: str
@@ -637,7 +686,7 @@ class BscKqueue:
         return f'kqueue(), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscKevent:
     ktraces: List
     kq: int
@@ -650,7 +699,7 @@ class BscKevent:
         return f'kevent({self.kq}, {hex(self.changelist)}, {self.nchanges}, {hex(self.eventlist)}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscLchown:
     ktraces: List
     path: str
@@ -665,7 +714,7 @@ class BscLchown:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscBsdthreadRegister:
     ktraces: List
     threadstart: int
@@ -681,7 +730,7 @@ class BscBsdthreadRegister:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscWorkqOpen:
     ktraces: List
     result: str
@@ -693,7 +742,7 @@ class BscWorkqOpen:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscWorkqKernreturn:
     ktraces: List
     options: int
@@ -706,7 +755,7 @@ class BscWorkqKernreturn:
         return f'workq_kernreturn({self.options}, {hex(self.item)}, {self.affinity}, {self.prio}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscKevent64:
     ktraces: List
     kq: int
@@ -719,7 +768,7 @@ class BscKevent64:
         return f'kevent64({self.kq}, {hex(self.changelist)}, {self.nchanges}, {hex(self.eventlist)}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscThreadSelfid:
     ktraces: List
     result: str
@@ -728,7 +777,7 @@ class BscThreadSelfid:
         return f'thread_selfid(), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscKeventQos:
     ktraces: List
     kq: int
@@ -741,7 +790,7 @@ class BscKeventQos:
         return f'kevent_qos({self.kq}, {hex(self.changelist)}, {self.nchanges}, {hex(self.eventlist)}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscKeventId:
     ktraces: List
     kq: int
@@ -754,7 +803,7 @@ class BscKeventId:
         return f'kevent_id({self.kq}, {hex(self.changelist)}, {self.nchanges}, {hex(self.eventlist)}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscMacSyscall:
     ktraces: List
     policy: int
@@ -769,7 +818,7 @@ class BscMacSyscall:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscPselect:
     ktraces: List
     nfds: int
@@ -785,7 +834,7 @@ class BscPselect:
                 f' {self.result}')
 
 
-@dataclass
+@slots_dataclass
 class BscFsgetpath:
     ktraces: List
     buf: int
@@ -802,7 +851,7 @@ class BscFsgetpath:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSysFileportMakeport:
     ktraces: List
     fd: int
@@ -816,7 +865,7 @@ class BscSysFileportMakeport:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSysFileportMakefd:
     ktraces: List
     port: int
@@ -826,7 +875,7 @@ class BscSysFileportMakefd:
         return f'fileport_makefd({self.port}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscAuditSessionPort:
     ktraces: List
     asid: int
@@ -840,7 +889,7 @@ class BscAuditSessionPort:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscPidSuspend:
     ktraces: List
     pid: int
@@ -853,7 +902,7 @@ class BscPidSuspend:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscPidResume:
     ktraces: List
     pid: int
@@ -866,7 +915,7 @@ class BscPidResume:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscPidHibernate:
     ktraces: List
     pid: int
@@ -879,7 +928,7 @@ class BscPidHibernate:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscPidShutdownSockets:
     ktraces: List
     pid: int
@@ -893,7 +942,7 @@ class BscPidShutdownSockets:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSharedRegionMapAndSlideNp:
     ktraces: List
     fd: int
@@ -909,7 +958,7 @@ class BscSharedRegionMapAndSlideNp:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscKasInfo:
     ktraces: List
     selector: int
@@ -924,7 +973,7 @@ class BscKasInfo:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMemorystatusControl:
     ktraces: List
     command: int
@@ -940,7 +989,7 @@ class BscMemorystatusControl:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGuardedOpenNp:
     ktraces: List
     path: str
@@ -954,7 +1003,7 @@ class BscGuardedOpenNp:
         return f'guarded_open_np("{self.path}", {hex(self.guard)}, {self.guardflags}, {flags}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscGuardedCloseNp:
     ktraces: List
     fd: int
@@ -968,7 +1017,7 @@ class BscGuardedCloseNp:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGuardedKqueueNp:
     ktraces: List
     guard: int
@@ -982,7 +1031,7 @@ class BscGuardedKqueueNp:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscChangeFdguardNp:
     ktraces: List
     fd: int
@@ -998,7 +1047,7 @@ class BscChangeFdguardNp:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscUsrctl:
     ktraces: List
     flags: int
@@ -1011,7 +1060,7 @@ class BscUsrctl:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscProcRlimitControl:
     ktraces: List
     pid: int
@@ -1026,7 +1075,7 @@ class BscProcRlimitControl:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscConnectx:
     ktraces: List
     socket: int
@@ -1042,7 +1091,7 @@ class BscConnectx:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscDisconnectx:
     ktraces: List
     s: int
@@ -1057,7 +1106,7 @@ class BscDisconnectx:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscPeeloff:
     ktraces: List
     s: int
@@ -1071,7 +1120,7 @@ class BscPeeloff:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSocketDelegate:
     ktraces: List
     domain: socket.AddressFamily
@@ -1084,7 +1133,7 @@ class BscSocketDelegate:
         return f'socket_delegate({self.domain.name}, {self.type.name}, {self.protocol}, {self.epid}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscTelemetry:
     ktraces: List
     cmd: int
@@ -1100,7 +1149,7 @@ class BscTelemetry:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscProcUuidPolicy:
     ktraces: List
     operation: int
@@ -1116,7 +1165,7 @@ class BscProcUuidPolicy:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMemorystatusGetLevel:
     ktraces: List
     level: int
@@ -1129,7 +1178,7 @@ class BscMemorystatusGetLevel:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSystemOverride:
     ktraces: List
     timeout: int
@@ -1143,7 +1192,7 @@ class BscSystemOverride:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscVfsPurge:
     ktraces: List
     result: str
@@ -1155,7 +1204,7 @@ class BscVfsPurge:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSfiCtl:
     ktraces: List
     operation: int
@@ -1171,7 +1220,7 @@ class BscSfiCtl:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSfiPidctl:
     ktraces: List
     operation: int
@@ -1187,7 +1236,7 @@ class BscSfiPidctl:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscCoalition:
     ktraces: List
     operation: int
@@ -1202,7 +1251,7 @@ class BscCoalition:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscCoalitionInfo:
     ktraces: List
     flavor: int
@@ -1218,7 +1267,7 @@ class BscCoalitionInfo:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscNecpMatchPolicy:
     ktraces: List
     parameters: int
@@ -1233,7 +1282,7 @@ class BscNecpMatchPolicy:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetattrlistbulk:
     ktraces: List
     dirfd: int
@@ -1247,7 +1296,7 @@ class BscGetattrlistbulk:
                 f' {self.result}')
 
 
-@dataclass
+@slots_dataclass
 class BscClonefileat:
     ktraces: List
     src_dirfd: int
@@ -1263,7 +1312,7 @@ class BscClonefileat:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscRenameat:
     ktraces: List
     fromfd: int
@@ -1279,7 +1328,7 @@ class BscRenameat:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFaccessat:
     ktraces: List
     fd: int
@@ -1296,7 +1345,7 @@ class BscFaccessat:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFchmodat:
     ktraces: List
     fd: int
@@ -1313,7 +1362,7 @@ class BscFchmodat:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFchownat:
     ktraces: List
     fd: int
@@ -1329,7 +1378,7 @@ class BscFchownat:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFstatat:
     ktraces: List
     fd: int
@@ -1345,7 +1394,7 @@ class BscFstatat:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFstatat64:
     ktraces: List
     fd: int
@@ -1361,7 +1410,7 @@ class BscFstatat64:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscLinkat:
     ktraces: List
     fd1: int
@@ -1377,7 +1426,7 @@ class BscLinkat:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscUnlinkat:
     ktraces: List
     fd: int
@@ -1392,7 +1441,7 @@ class BscUnlinkat:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscReadlinkat:
     ktraces: List
     fd: int
@@ -1405,7 +1454,7 @@ class BscReadlinkat:
         return f'readlinkat({self.fd}, "{self.path}", {hex(self.buf)}, {self.bufsize}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscSymlinkat:
     ktraces: List
     path1: str
@@ -1420,7 +1469,7 @@ class BscSymlinkat:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMkdirat:
     ktraces: List
     fd: int
@@ -1436,7 +1485,7 @@ class BscMkdirat:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetattrlistat:
     ktraces: List
     fd: int
@@ -1452,7 +1501,7 @@ class BscGetattrlistat:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscProcTraceLog:
     ktraces: List
     pid: int
@@ -1466,7 +1515,7 @@ class BscProcTraceLog:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscBsdthreadCtl:
     ktraces: List
     cmd: int
@@ -1482,7 +1531,7 @@ class BscBsdthreadCtl:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscOpenbyidNp:
     ktraces: List
     fsid: int
@@ -1495,7 +1544,7 @@ class BscOpenbyidNp:
         return f'openbyid_np({self.fsid}, {self.objid}, {oflags}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscRecvmsgX:
     ktraces: List
     s: int
@@ -1508,7 +1557,7 @@ class BscRecvmsgX:
         return f'recvmsg_x({self.s}, {hex(self.msgp)}, {self.cnt}, {self.flags}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscSendmsgX:
     ktraces: List
     s: int
@@ -1521,7 +1570,7 @@ class BscSendmsgX:
         return f'sendmsg_x({self.s}, {hex(self.msgp)}, {self.cnt}, {self.flags}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscThreadSelfusage:
     ktraces: List
     result: str
@@ -1530,7 +1579,7 @@ class BscThreadSelfusage:
         return f'thread_selfusage(), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscCsrctl:
     ktraces: List
     op: int
@@ -1545,7 +1594,7 @@ class BscCsrctl:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGuardedOpenDprotectedNp:
     ktraces: List
     path: str
@@ -1560,7 +1609,7 @@ class BscGuardedOpenDprotectedNp:
                 f', {self.result}')
 
 
-@dataclass
+@slots_dataclass
 class BscGuardedWriteNp:
     ktraces: List
     fd: int
@@ -1573,7 +1622,7 @@ class BscGuardedWriteNp:
         return f'guarded_write_np({self.fd}, {hex(self.guard)}, {hex(self.cbuf)}, {self.nbyte}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscGuardedPwriteNp:
     ktraces: List
     fd: int
@@ -1586,7 +1635,7 @@ class BscGuardedPwriteNp:
         return f'guarded_pwrite_np({self.fd}, {hex(self.guard)}, {hex(self.buf)}, {self.nbyte}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscGuardedWritevNp:
     ktraces: List
     fd: int
@@ -1599,7 +1648,7 @@ class BscGuardedWritevNp:
         return f'guarded_writev_np({self.fd}, {hex(self.guard)}, {hex(self.iovp)}, {self.iovcnt}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscRenameatxNp:
     ktraces: List
     fromfd: int
@@ -1615,7 +1664,7 @@ class BscRenameatxNp:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMremapEncrypted:
     ktraces: List
     addr: int
@@ -1631,7 +1680,7 @@ class BscMremapEncrypted:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscNetagentTrigger:
     ktraces: List
     agent_uuid: int
@@ -1645,7 +1694,7 @@ class BscNetagentTrigger:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscStackSnapshotWithConfig:
     ktraces: List
     stackshot_config_version: int
@@ -1661,7 +1710,7 @@ class BscStackSnapshotWithConfig:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMicrostackshot:
     ktraces: List
     tracebuf: int
@@ -1673,7 +1722,7 @@ class BscMicrostackshot:
         return f'microstackshot({hex(self.tracebuf)}, {self.tracebuf_size}, {self.flags}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscGrabPgoData:
     ktraces: List
     uuid: int
@@ -1686,7 +1735,7 @@ class BscGrabPgoData:
         return f'grab_pgo_data({hex(self.uuid)}, {self.flags}, {hex(self.buffer)}, {self.size}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscPersona:
     ktraces: List
     operation: int
@@ -1702,7 +1751,7 @@ class BscPersona:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMachEventlinkSignal:
     ktraces: List
     eventlink_port: int
@@ -1716,7 +1765,7 @@ class BscMachEventlinkSignal:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMachEventlinkWaitUntil:
     ktraces: List
     eventlink_port: int
@@ -1733,7 +1782,7 @@ class BscMachEventlinkWaitUntil:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMachEventlinkSignalWaitUntil:
     ktraces: List
     eventlink_port: int
@@ -1750,7 +1799,7 @@ class BscMachEventlinkSignalWaitUntil:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscWorkIntervalCtl:
     ktraces: List
     operation: int
@@ -1766,7 +1815,7 @@ class BscWorkIntervalCtl:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetentropy:
     ktraces: List
     buffer: int
@@ -1780,7 +1829,7 @@ class BscGetentropy:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscNecpOpen:
     ktraces: List
     flags: int
@@ -1790,7 +1839,7 @@ class BscNecpOpen:
         return f'necp_open({self.flags}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscNecpClientAction:
     ktraces: List
     necp_fd: int
@@ -1804,7 +1853,7 @@ class BscNecpClientAction:
                 f', {self.result}')
 
 
-@dataclass
+@slots_dataclass
 class BscNexusOpen:
     ktraces: List
     result: str
@@ -1813,7 +1862,7 @@ class BscNexusOpen:
         return f'nexus_open(), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscNexusRegister:
     ktraces: List
     result: str
@@ -1825,7 +1874,7 @@ class BscNexusRegister:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscNexusDeregister:
     ktraces: List
     result: str
@@ -1837,7 +1886,7 @@ class BscNexusDeregister:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscNexusCreate:
     ktraces: List
     result: str
@@ -1849,7 +1898,7 @@ class BscNexusCreate:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscNexusDestroy:
     ktraces: List
     result: str
@@ -1861,7 +1910,7 @@ class BscNexusDestroy:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscNexusGetOpt:
     ktraces: List
     result: str
@@ -1873,7 +1922,7 @@ class BscNexusGetOpt:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscNexusSetOpt:
     ktraces: List
     result: str
@@ -1885,7 +1934,7 @@ class BscNexusSetOpt:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscChannelOpen:
     ktraces: List
     result: str
@@ -1897,7 +1946,7 @@ class BscChannelOpen:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscChannelGetInfo:
     ktraces: List
     result: str
@@ -1909,7 +1958,7 @@ class BscChannelGetInfo:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscChannelSync:
     ktraces: List
     result: str
@@ -1921,7 +1970,7 @@ class BscChannelSync:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscChannelGetOpt:
     ktraces: List
     result: str
@@ -1933,7 +1982,7 @@ class BscChannelGetOpt:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscChannelSetOpt:
     ktraces: List
     result: str
@@ -1945,7 +1994,7 @@ class BscChannelSetOpt:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscUlockWait:
     ktraces: List
     operation: int
@@ -1958,7 +2007,7 @@ class BscUlockWait:
         return f'ulock_wait({self.operation}, {hex(self.addr)}, {self.value}, {self.timeout}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscUlockWake:
     ktraces: List
     operation: int
@@ -1970,7 +2019,7 @@ class BscUlockWake:
         return f'ulock_wake({self.operation}, {hex(self.addr)}, {self.wake_value}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscFclonefileat:
     ktraces: List
     src_fd: int
@@ -1986,7 +2035,7 @@ class BscFclonefileat:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFsSnapshot:
     ktraces: List
     op: FsSnapshotOp
@@ -2002,7 +2051,7 @@ class BscFsSnapshot:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscTerminateWithPayload:
     ktraces: List
     pid: int
@@ -2019,7 +2068,7 @@ class BscTerminateWithPayload:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscAbortWithPayload:
     ktraces: List
     reason_namespace: int
@@ -2032,7 +2081,7 @@ class BscAbortWithPayload:
                 f', {self.payload_size})')
 
 
-@dataclass
+@slots_dataclass
 class BscNecpSessionOpen:
     ktraces: List
     flags: int
@@ -2042,7 +2091,7 @@ class BscNecpSessionOpen:
         return f'necp_session_open({self.flags}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscNecpSessionAction:
     ktraces: List
     necp_fd: int
@@ -2058,7 +2107,7 @@ class BscNecpSessionAction:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSetattrlistat:
     ktraces: List
     fd: int
@@ -2074,7 +2123,7 @@ class BscSetattrlistat:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscNetQosGuideline:
     ktraces: List
     param: int
@@ -2085,7 +2134,7 @@ class BscNetQosGuideline:
         return f'net_qos_guideline({hex(self.param)}, {self.param_len}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscFmount:
     ktraces: List
     type: int
@@ -2101,7 +2150,7 @@ class BscFmount:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscNtpAdjtime:
     ktraces: List
     tp: int
@@ -2111,7 +2160,7 @@ class BscNtpAdjtime:
         return f'ntp_adjtime({hex(self.tp)}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscNtpGettime:
     ktraces: List
     ntvp: int
@@ -2124,7 +2173,7 @@ class BscNtpGettime:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscOsFaultWithPayload:
     ktraces: List
     reason_namespace: int
@@ -2141,7 +2190,7 @@ class BscOsFaultWithPayload:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscKqueueWorkloopCtl:
     ktraces: List
     cmd: int
@@ -2157,7 +2206,7 @@ class BscKqueueWorkloopCtl:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMachBridgeRemoteTime:
     ktraces: List
     local_timestamp: int
@@ -2170,7 +2219,7 @@ class BscMachBridgeRemoteTime:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscCoalitionLedger:
     ktraces: List
     operation: int
@@ -2186,7 +2235,7 @@ class BscCoalitionLedger:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscLogData:
     ktraces: List
     tag: int
@@ -2202,7 +2251,7 @@ class BscLogData:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMemorystatusAvailableMemory:
     ktraces: List
     result: str
@@ -2211,7 +2260,7 @@ class BscMemorystatusAvailableMemory:
         return f'memorystatus_available_memory(), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscSharedRegionMapAndSlide2Np:
     ktraces: List
     files_count: int
@@ -2228,7 +2277,7 @@ class BscSharedRegionMapAndSlide2Np:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscPivotRoot:
     ktraces: List
     new_rootfs_path_before: str
@@ -2242,7 +2291,7 @@ class BscPivotRoot:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscTaskInspectForPid:
     ktraces: List
     target_tport: int
@@ -2257,7 +2306,7 @@ class BscTaskInspectForPid:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscTaskReadForPid:
     ktraces: List
     target_tport: int
@@ -2272,7 +2321,7 @@ class BscTaskReadForPid:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSysPreadv:
     ktraces: List
     fd: int
@@ -2287,7 +2336,7 @@ class BscSysPreadv:
         return f'preadv{no_cancel}({self.fd}, {hex(self.iovp)}, {self.iovcnt}, {self.offset}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscSysPwritev:
     ktraces: List
     fd: int
@@ -2302,7 +2351,7 @@ class BscSysPwritev:
         return f'pwritev{no_cancel}({self.fd}, {hex(self.iovp)}, {self.iovcnt}, {self.offset}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscUlockWait2:
     ktraces: List
     operation: int
@@ -2315,7 +2364,7 @@ class BscUlockWait2:
         return f'ulock_wait2({self.operation}, {hex(self.addr)}, {self.value}, {self.timeout}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscProcInfoExtendedId:
     ktraces: List
     callnum: int
@@ -2331,7 +2380,7 @@ class BscProcInfoExtendedId:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSysClose:
     ktraces: List
     fd: str
@@ -2346,7 +2395,7 @@ class BscSysClose:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscLink:
     ktraces: List
     oldpath: str
@@ -2360,7 +2409,7 @@ class BscLink:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscUnlink:
     ktraces: List
     pathname: str
@@ -2373,7 +2422,7 @@ class BscUnlink:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscChdir:
     ktraces: List
     path: str
@@ -2386,7 +2435,7 @@ class BscChdir:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFchdir:
     ktraces: List
     fd: int
@@ -2399,7 +2448,7 @@ class BscFchdir:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMknod:
     ktraces: List
     pathname: str
@@ -2414,7 +2463,7 @@ class BscMknod:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscChmod:
     ktraces: List
     pathname: str
@@ -2428,7 +2477,7 @@ class BscChmod:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscChown:
     ktraces: List
     pathname: str
@@ -2443,7 +2492,7 @@ class BscChown:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetpid:
     ktraces: List
     pid: int
@@ -2452,7 +2501,7 @@ class BscGetpid:
         return f'getpid(), pid: {self.pid}'
 
 
-@dataclass
+@slots_dataclass
 class BscSetuid:
     ktraces: List
     uid: int
@@ -2465,7 +2514,7 @@ class BscSetuid:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetuid:
     ktraces: List
     uid: int
@@ -2474,7 +2523,7 @@ class BscGetuid:
         return f'getuid(), uid: {self.uid}'
 
 
-@dataclass
+@slots_dataclass
 class BscGeteuid:
     ktraces: List
     uid: int
@@ -2483,7 +2532,7 @@ class BscGeteuid:
         return f'geteuid(), uid: {self.uid}'
 
 
-@dataclass
+@slots_dataclass
 class BscWait4:
     ktraces: List
     pid: int
@@ -2498,7 +2547,7 @@ class BscWait4:
         return f'wait4{no_cancel}({self.pid}, {hex(self.status)}, {self.options}, {hex(self.rusage)}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscRecvmsg:
     ktraces: List
     socket: int
@@ -2510,7 +2559,7 @@ class BscRecvmsg:
         return f'recvmsg{no_cancel}({self.socket}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscSendmsg:
     ktraces: List
     socket: int
@@ -2522,7 +2571,7 @@ class BscSendmsg:
         return f'sendmsg{no_cancel}({self.socket}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscRecvfrom:
     ktraces: List
     socket: int
@@ -2538,7 +2587,7 @@ class BscRecvfrom:
                 f'''{' | '.join(map(lambda f: f.name, self.flags)) if self.flags else '0'}), {self.result}''')
 
 
-@dataclass
+@slots_dataclass
 class BscAccept:
     ktraces: List
     socket: int
@@ -2550,7 +2599,7 @@ class BscAccept:
         return f'accept{no_cancel}({self.socket}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscGetpeername:
     ktraces: List
     socket: int
@@ -2565,7 +2614,7 @@ class BscGetpeername:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetsockname:
     ktraces: List
     socket: int
@@ -2580,7 +2629,7 @@ class BscGetsockname:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscAccess:
     ktraces: List
     path: str
@@ -2594,7 +2643,7 @@ class BscAccess:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscChflags:
     ktraces: List
     path: str
@@ -2608,7 +2657,7 @@ class BscChflags:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFchflags:
     ktraces: List
     fd: int
@@ -2622,7 +2671,7 @@ class BscFchflags:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSync:
     ktraces: List
 
@@ -2630,7 +2679,7 @@ class BscSync:
         return 'sync()'
 
 
-@dataclass
+@slots_dataclass
 class BscKill:
     ktraces: List
     pid: int
@@ -2644,7 +2693,7 @@ class BscKill:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetppid:
     ktraces: List
     pid: int
@@ -2653,7 +2702,7 @@ class BscGetppid:
         return f'getppid(), pid: {self.pid}'
 
 
-@dataclass
+@slots_dataclass
 class BscSysDup:
     ktraces: List
     fildes: int
@@ -2663,7 +2712,7 @@ class BscSysDup:
         return f'dup({self.fildes}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscPipe:
     ktraces: List
     result: str
@@ -2672,7 +2721,7 @@ class BscPipe:
         return f'pipe(), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscGetegid:
     ktraces: List
     gid: int
@@ -2681,7 +2730,7 @@ class BscGetegid:
         return f'getegid(), gid: {self.gid}'
 
 
-@dataclass
+@slots_dataclass
 class BscSigaction:
     ktraces: List
     sig: Signals
@@ -2696,7 +2745,7 @@ class BscSigaction:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetgid:
     ktraces: List
     gid: int
@@ -2705,7 +2754,7 @@ class BscGetgid:
         return f'getgid(), gid: {self.gid}'
 
 
-@dataclass
+@slots_dataclass
 class BscSigprocmap:
     ktraces: List
     how: SigprocmaskFlags
@@ -2720,7 +2769,7 @@ class BscSigprocmap:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetlogin:
     ktraces: List
     address: int
@@ -2729,7 +2778,7 @@ class BscGetlogin:
         return f'getlogin(), address: {hex(self.address)}'
 
 
-@dataclass
+@slots_dataclass
 class BscSetlogin:
     ktraces: List
     address: int
@@ -2742,7 +2791,7 @@ class BscSetlogin:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscAcct:
     ktraces: List
     file: str
@@ -2755,7 +2804,7 @@ class BscAcct:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSigpending:
     ktraces: List
     set: int
@@ -2768,7 +2817,7 @@ class BscSigpending:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSigaltstack:
     ktraces: List
     ss_address: int
@@ -2782,7 +2831,7 @@ class BscSigaltstack:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscIoctl:
     ktraces: List
     fildes: int
@@ -2802,7 +2851,7 @@ class BscIoctl:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscReboot:
     ktraces: List
     howto: int
@@ -2815,7 +2864,7 @@ class BscReboot:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscRevoke:
     ktraces: List
     path: str
@@ -2828,7 +2877,7 @@ class BscRevoke:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSymlink:
     ktraces: List
     vnode1: int
@@ -2842,7 +2891,7 @@ class BscSymlink:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscReadlink:
     ktraces: List
     path: str
@@ -2854,7 +2903,7 @@ class BscReadlink:
         return f'readlink("{self.path}", {hex(self.buf)}, {self.bufsize}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscExecve:
     ktraces: List
 
@@ -2862,7 +2911,7 @@ class BscExecve:
         return 'execve()'
 
 
-@dataclass
+@slots_dataclass
 class BscUmask:
     ktraces: List
     cmask: int
@@ -2872,7 +2921,7 @@ class BscUmask:
         return f'umask({self.cmask}), previous mask: {self.prev_mask}'
 
 
-@dataclass
+@slots_dataclass
 class BscChroot:
     ktraces: List
     dirname: str
@@ -2885,7 +2934,7 @@ class BscChroot:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMsync:
     ktraces: List
     addr: int
@@ -2902,7 +2951,7 @@ class BscMsync:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscVfork:
     ktraces: List
 
@@ -2910,7 +2959,7 @@ class BscVfork:
         return 'vfork()'
 
 
-@dataclass
+@slots_dataclass
 class BscMunmap:
     ktraces: List
     addr: int
@@ -2924,7 +2973,7 @@ class BscMunmap:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMprotect:
     ktraces: List
     addr: int
@@ -2939,7 +2988,7 @@ class BscMprotect:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMadvise:
     ktraces: List
     addr: int
@@ -2954,7 +3003,7 @@ class BscMadvise:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMincore:
     ktraces: List
     addr: int
@@ -2969,7 +3018,7 @@ class BscMincore:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetgroups:
     ktraces: List
     gidsetsize: int
@@ -2980,7 +3029,7 @@ class BscGetgroups:
         return f'getgroups({self.gidsetsize}, {hex(self.grouplist)}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscSetgroups:
     ktraces: List
     ngroups: int
@@ -2994,7 +3043,7 @@ class BscSetgroups:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetpgrp:
     ktraces: List
     pgid: int
@@ -3003,7 +3052,7 @@ class BscGetpgrp:
         return f'getpgrp(), pgid: {self.pgid}'
 
 
-@dataclass
+@slots_dataclass
 class BscSetpgid:
     ktraces: List
     pid: int
@@ -3017,7 +3066,7 @@ class BscSetpgid:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSetitimer:
     ktraces: List
     which: int
@@ -3032,7 +3081,7 @@ class BscSetitimer:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSwapon:
     ktraces: List
     path: int
@@ -3046,7 +3095,7 @@ class BscSwapon:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetitimer:
     ktraces: List
     which: int
@@ -3060,7 +3109,7 @@ class BscGetitimer:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSysGetdtablesize:
     ktraces: List
     table_size: int
@@ -3069,7 +3118,7 @@ class BscSysGetdtablesize:
         return f'getdtablesize(), size: {self.table_size}'
 
 
-@dataclass
+@slots_dataclass
 class BscSysDup2:
     ktraces: List
     fildes: int
@@ -3083,7 +3132,7 @@ class BscSysDup2:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSysFcntl:
     ktraces: List
     fildes: int
@@ -3097,7 +3146,7 @@ class BscSysFcntl:
         return f'fcntl{no_cancel}({self.fildes}, {self.cmd.name}, {hex(self.buf)}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscSelect:
     ktraces: List
     nfds: int
@@ -3113,7 +3162,7 @@ class BscSelect:
                 f' {self.result}')
 
 
-@dataclass
+@slots_dataclass
 class BscFsync:
     ktraces: List
     fildes: int
@@ -3128,7 +3177,7 @@ class BscFsync:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSetpriority:
     ktraces: List
     which: PriorityWhich
@@ -3143,7 +3192,7 @@ class BscSetpriority:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSocket:
     ktraces: List
     domain: socket.AddressFamily
@@ -3155,7 +3204,7 @@ class BscSocket:
         return f'socket({self.domain.name}, {self.type.name}, {self.protocol}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscConnect:
     ktraces: List
     socket: int
@@ -3172,7 +3221,7 @@ class BscConnect:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetpriority:
     ktraces: List
     which: PriorityWhich
@@ -3183,7 +3232,7 @@ class BscGetpriority:
         return f'getpriority({self.which.name}, {self.who}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscBind:
     ktraces: List
     socket: int
@@ -3198,7 +3247,7 @@ class BscBind:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSetsockopt:
     ktraces: List
     socket: int
@@ -3215,7 +3264,7 @@ class BscSetsockopt:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscListen:
     ktraces: List
     socket: int
@@ -3229,7 +3278,7 @@ class BscListen:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSigsuspend:
     ktraces: List
     sigmask: int
@@ -3244,7 +3293,7 @@ class BscSigsuspend:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGettimeofday:
     ktraces: List
     tv: int
@@ -3258,7 +3307,7 @@ class BscGettimeofday:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetrusage:
     ktraces: List
     who: RusageWho
@@ -3272,7 +3321,7 @@ class BscGetrusage:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetsockopt:
     ktraces: List
     socket: int
@@ -3289,7 +3338,7 @@ class BscGetsockopt:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscReadv:
     ktraces: List
     d: int
@@ -3297,13 +3346,15 @@ class BscReadv:
     iovcnt: int
     result: str
     no_cancel: bool = False
+    path: Optional[str] = None
 
     def __str__(self):
         no_cancel = '_nocancel' if self.no_cancel else ''
-        return f'readv{no_cancel}({self.d}, {hex(self.iov)}, {self.iovcnt}), {self.result}'
+        rep = f'readv{no_cancel}({self.d}, {hex(self.iov)}, {self.iovcnt}), {self.result}'
+        return _with_path(rep, self.path)
 
 
-@dataclass
+@slots_dataclass
 class BscWritev:
     ktraces: List
     fildes: int
@@ -3311,13 +3362,15 @@ class BscWritev:
     iovcnt: int
     result: str
     no_cancel: bool = False
+    path: Optional[str] = None
 
     def __str__(self):
         no_cancel = '_nocancel' if self.no_cancel else ''
-        return f'writev{no_cancel}({self.fildes}, {hex(self.iov)}, {self.iovcnt}), {self.result}'
+        rep = f'writev{no_cancel}({self.fildes}, {hex(self.iov)}, {self.iovcnt}), {self.result}'
+        return _with_path(rep, self.path)
 
 
-@dataclass
+@slots_dataclass
 class BscSettimeofday:
     ktraces: List
     tp: int
@@ -3331,7 +3384,7 @@ class BscSettimeofday:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFchown:
     ktraces: List
     fildes: int
@@ -3346,7 +3399,7 @@ class BscFchown:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFchmod:
     ktraces: List
     fildes: str
@@ -3360,7 +3413,7 @@ class BscFchmod:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSetreuid:
     ktraces: List
     ruid: int
@@ -3374,7 +3427,7 @@ class BscSetreuid:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSetregid:
     ktraces: List
     rgid: int
@@ -3388,7 +3441,7 @@ class BscSetregid:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscRename:
     ktraces: List
     old: str
@@ -3402,7 +3455,7 @@ class BscRename:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSysFlock:
     ktraces: List
     fd: int
@@ -3416,7 +3469,7 @@ class BscSysFlock:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMkfifo:
     ktraces: List
     path: str
@@ -3430,7 +3483,7 @@ class BscMkfifo:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSendto:
     ktraces: List
     socket: int
@@ -3445,7 +3498,7 @@ class BscSendto:
         return f'sendto{no_cancel}({self.socket}, {hex(self.buffer)}, {self.length}, {self.flags}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscShutdown:
     ktraces: List
     socket: int
@@ -3459,7 +3512,7 @@ class BscShutdown:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSocketpair:
     ktraces: List
     domain: socket.AddressFamily
@@ -3475,7 +3528,7 @@ class BscSocketpair:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMkdir:
     ktraces: List
     path: str
@@ -3489,7 +3542,7 @@ class BscMkdir:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscRmdir:
     ktraces: List
     path: str
@@ -3502,7 +3555,7 @@ class BscRmdir:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscUtimes:
     ktraces: List
     path: str
@@ -3516,7 +3569,7 @@ class BscUtimes:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFutimes:
     ktraces: List
     fildes: int
@@ -3530,7 +3583,7 @@ class BscFutimes:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscAdjtime:
     ktraces: List
     delta: int
@@ -3544,7 +3597,7 @@ class BscAdjtime:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGethostuuid:
     ktraces: List
     uuid: int
@@ -3558,7 +3611,7 @@ class BscGethostuuid:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscObsKillpg:
     ktraces: List
     pgrp: int
@@ -3572,7 +3625,7 @@ class BscObsKillpg:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSetsid:
     ktraces: List
     result: str
@@ -3581,7 +3634,7 @@ class BscSetsid:
         return f'setsid(), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscGetpgid:
     ktraces: List
     pid: int
@@ -3591,7 +3644,7 @@ class BscGetpgid:
         return f'getpgid({self.pid}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscSetprivexec:
     ktraces: List
     flag: int
@@ -3601,7 +3654,7 @@ class BscSetprivexec:
         return f'setprivexec({self.flag}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscNfssvc:
     ktraces: List
     flags: int
@@ -3615,7 +3668,7 @@ class BscNfssvc:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscStatfs:
     ktraces: List
     path: str
@@ -3629,7 +3682,7 @@ class BscStatfs:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFstatfs:
     ktraces: List
     fd: int
@@ -3643,7 +3696,7 @@ class BscFstatfs:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscUnmount:
     ktraces: List
     dir: str
@@ -3657,7 +3710,7 @@ class BscUnmount:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetfh:
     ktraces: List
     path: str
@@ -3671,7 +3724,7 @@ class BscGetfh:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscQuotactl:
     ktraces: List
     path: str
@@ -3687,7 +3740,7 @@ class BscQuotactl:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMount:
     ktraces: List
     source: str
@@ -3703,7 +3756,7 @@ class BscMount:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscCsops:
     ktraces: List
     pid: int
@@ -3719,7 +3772,7 @@ class BscCsops:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscCsopsAudittoken:
     ktraces: List
     pid: int
@@ -3735,7 +3788,7 @@ class BscCsopsAudittoken:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscWaitid:
     ktraces: List
     idtype: int
@@ -3753,7 +3806,7 @@ class BscWaitid:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscKdebugTypefilter:
     ktraces: List
     addr: int
@@ -3767,7 +3820,7 @@ class BscKdebugTypefilter:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSetgid:
     ktraces: List
     gid: int
@@ -3780,7 +3833,7 @@ class BscSetgid:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSetegid:
     ktraces: List
     egid: int
@@ -3793,7 +3846,7 @@ class BscSetegid:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSeteuid:
     ktraces: List
     euid: int
@@ -3806,7 +3859,7 @@ class BscSeteuid:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscThreadSelfcounts:
     ktraces: List
     type: int
@@ -3821,7 +3874,7 @@ class BscThreadSelfcounts:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFdatasync:
     ktraces: List
     fd: int
@@ -3834,7 +3887,7 @@ class BscFdatasync:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscPathconf:
     ktraces: List
     path: str
@@ -3845,7 +3898,7 @@ class BscPathconf:
         return f'pathconf("{self.path}", {self.name}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscSysFpathconf:
     ktraces: List
     fildes: int
@@ -3856,7 +3909,7 @@ class BscSysFpathconf:
         return f'fpathconf({self.fildes}, {self.name}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscGetrlimit:
     ktraces: List
     resource: int
@@ -3870,7 +3923,7 @@ class BscGetrlimit:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSetrlimit:
     ktraces: List
     resource: int
@@ -3884,7 +3937,7 @@ class BscSetrlimit:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetdirentries:
     ktraces: List
     fd: int
@@ -3897,7 +3950,7 @@ class BscGetdirentries:
         return f'getdirentries({self.fd}, {hex(self.buf)}, {self.nbytes}, {hex(self.basep)}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscMmap:
     ktraces: List
     addr: int
@@ -3910,7 +3963,7 @@ class BscMmap:
         return f'mmap({hex(self.addr)}, {self.len}, {self.prot}, {self.flags}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscLseek:
     ktraces: List
     fildes: int
@@ -3922,7 +3975,7 @@ class BscLseek:
         return f'lseek({self.fildes}, {self.offset}, {self.whence}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscTruncate:
     ktraces: List
     path: str
@@ -3936,7 +3989,7 @@ class BscTruncate:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFtruncate:
     ktraces: List
     fildes: int
@@ -3950,7 +4003,7 @@ class BscFtruncate:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSysctl:
     ktraces: List
     name: int
@@ -3966,7 +4019,7 @@ class BscSysctl:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMlock:
     ktraces: List
     addr: int
@@ -3980,7 +4033,7 @@ class BscMlock:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMunlock:
     ktraces: List
     addr: int
@@ -3994,7 +4047,7 @@ class BscMunlock:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscUndelete:
     ktraces: List
     path: str
@@ -4007,7 +4060,7 @@ class BscUndelete:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscOpenDprotectedNp:
     ktraces: List
     path: str
@@ -4021,7 +4074,7 @@ class BscOpenDprotectedNp:
         return f'open_dprotected_np("{self.path}", {flags}, {self.class_}, {self.dpflags}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscGetattrlist:
     ktraces: List
     path: str
@@ -4037,7 +4090,7 @@ class BscGetattrlist:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSetattrlist:
     ktraces: List
     path: str
@@ -4053,7 +4106,7 @@ class BscSetattrlist:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetdirentriesattr:
     ktraces: List
     fd: str
@@ -4067,7 +4120,7 @@ class BscGetdirentriesattr:
                 f', {self.result}')
 
 
-@dataclass
+@slots_dataclass
 class BscExchangedata:
     ktraces: List
     path1: str
@@ -4082,7 +4135,7 @@ class BscExchangedata:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSearchfs:
     ktraces: List
     path: str
@@ -4098,7 +4151,7 @@ class BscSearchfs:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFgetattrlist:
     ktraces: List
     fd: int
@@ -4114,7 +4167,7 @@ class BscFgetattrlist:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFsetattrlist:
     ktraces: List
     fd: int
@@ -4130,7 +4183,7 @@ class BscFsetattrlist:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscPoll:
     ktraces: List
     fds: int
@@ -4144,7 +4197,7 @@ class BscPoll:
         return f'poll{no_cancel}({hex(self.fds)}, {self.nfds}, {self.timeout}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscGetxattr:
     ktraces: List
     path: str
@@ -4157,7 +4210,7 @@ class BscGetxattr:
         return f'getxattr("{self.path}", {hex(self.name)}, {hex(self.value)}, {self.size}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscFgetxattr:
     ktraces: List
     fd: int
@@ -4170,7 +4223,7 @@ class BscFgetxattr:
         return f'fgetxattr({self.fd}, {hex(self.name)}, {hex(self.value)}, {self.size}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscSetxattr:
     ktraces: List
     path: str
@@ -4186,7 +4239,7 @@ class BscSetxattr:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFsetxattr:
     ktraces: List
     fd: int
@@ -4202,7 +4255,7 @@ class BscFsetxattr:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscRemovexattr:
     ktraces: List
     path: str
@@ -4217,7 +4270,7 @@ class BscRemovexattr:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFremovexattr:
     ktraces: List
     fd: int
@@ -4232,7 +4285,7 @@ class BscFremovexattr:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscListxattr:
     ktraces: List
     path: str
@@ -4245,7 +4298,7 @@ class BscListxattr:
         return f'listxattr("{self.path}", {hex(self.namebuf)}, {self.size}, {self.options}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscFlistxattr:
     ktraces: List
     fd: int
@@ -4258,7 +4311,7 @@ class BscFlistxattr:
         return f'flistxattr({self.fd}, {hex(self.namebuf)}, {self.size}, {self.options}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscFsctl:
     ktraces: List
     path: str
@@ -4274,7 +4327,7 @@ class BscFsctl:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscInitgroups:
     ktraces: List
     name: int
@@ -4288,7 +4341,7 @@ class BscInitgroups:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscPosixSpawn:
     ktraces: List
     pid: int
@@ -4307,7 +4360,7 @@ class BscPosixSpawn:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFfsctl:
     ktraces: List
     fd: int
@@ -4323,7 +4376,7 @@ class BscFfsctl:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscNfsclnt:
     ktraces: List
     flags: int
@@ -4337,7 +4390,7 @@ class BscNfsclnt:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscFhopen:
     ktraces: List
     fhp: int
@@ -4351,7 +4404,7 @@ class BscFhopen:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMinherit:
     ktraces: List
     addr: int
@@ -4366,7 +4419,7 @@ class BscMinherit:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSemsys:
     ktraces: List
     which: int
@@ -4382,7 +4435,7 @@ class BscSemsys:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMsgsys:
     ktraces: List
     which: int
@@ -4398,7 +4451,7 @@ class BscMsgsys:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscShmsys:
     ktraces: List
     which: int
@@ -4414,7 +4467,7 @@ class BscShmsys:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSemctl:
     ktraces: List
     semid: int
@@ -4427,7 +4480,7 @@ class BscSemctl:
         return f'semctl({self.semid}, {self.semnum}, {self.cmd}, {hex(self.semun)}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscSemget:
     ktraces: List
     key: int
@@ -4439,7 +4492,7 @@ class BscSemget:
         return f'semget({self.key}, {self.nsems}, {self.semflg}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscSemop:
     ktraces: List
     semid: int
@@ -4454,7 +4507,7 @@ class BscSemop:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMsgctl:
     ktraces: List
     msqid: int
@@ -4466,7 +4519,7 @@ class BscMsgctl:
         return f'msgctl({self.msqid}, {self.cmd}, {self.ds}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscMsgget:
     ktraces: List
     key: int
@@ -4477,7 +4530,7 @@ class BscMsgget:
         return f'msgget({self.key}, {self.msgflg}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscMsgsnd:
     ktraces: List
     msqid: int
@@ -4492,7 +4545,7 @@ class BscMsgsnd:
         return f'msgsnd{no_cancel}({self.msqid}, {hex(self.msgp)}, {self.msgsz}, {self.msgflg}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscMsgrcv:
     ktraces: List
     msqid: int
@@ -4507,7 +4560,7 @@ class BscMsgrcv:
         return f'msgrcv{no_cancel}({self.msqid}, {hex(self.msgp)}, {self.msgsz}, {self.msgtyp}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscShmat:
     ktraces: List
     shmid: int
@@ -4519,7 +4572,7 @@ class BscShmat:
         return f'shmat({self.shmid}, {hex(self.shmaddr)}, {self.shmflg}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscShmctl:
     ktraces: List
     shmid: int
@@ -4534,7 +4587,7 @@ class BscShmctl:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscShmdt:
     ktraces: List
     shmaddr: int
@@ -4547,7 +4600,7 @@ class BscShmdt:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscShmget:
     ktraces: List
     key: int
@@ -4559,7 +4612,7 @@ class BscShmget:
         return f'shmget({self.key}, {self.size}, {self.shmflg}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscShmOpen:
     ktraces: List
     name: int
@@ -4573,7 +4626,7 @@ class BscShmOpen:
         return f'shm_open({hex(self.name)}, {oflags}{mode}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscShmUnlink:
     ktraces: List
     name: int
@@ -4586,7 +4639,7 @@ class BscShmUnlink:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSemOpen:
     ktraces: List
     name: int
@@ -4600,7 +4653,7 @@ class BscSemOpen:
         return f'sem_open({hex(self.name)}, {oflags}{mode}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscSemClose:
     ktraces: List
     sem: int
@@ -4613,7 +4666,7 @@ class BscSemClose:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSemUnlink:
     ktraces: List
     name: int
@@ -4626,7 +4679,7 @@ class BscSemUnlink:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSemWait:
     ktraces: List
     sem: int
@@ -4641,7 +4694,7 @@ class BscSemWait:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSemTrywait:
     ktraces: List
     sem: int
@@ -4654,7 +4707,7 @@ class BscSemTrywait:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSemPost:
     ktraces: List
     sem: int
@@ -4667,7 +4720,7 @@ class BscSemPost:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSysctlbyname:
     ktraces: List
     name: int
@@ -4683,7 +4736,7 @@ class BscSysctlbyname:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscAccessExtended:
     ktraces: List
     entries: int
@@ -4699,7 +4752,7 @@ class BscAccessExtended:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGettid:
     ktraces: List
     uidp: int
@@ -4713,7 +4766,7 @@ class BscGettid:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSharedRegionCheckNp:
     ktraces: List
     startaddress: int
@@ -4726,7 +4779,7 @@ class BscSharedRegionCheckNp:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscPsynchMutexwait:
     ktraces: List
     mutex: int
@@ -4742,7 +4795,7 @@ class BscPsynchMutexwait:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscPsynchMutexdrop:
     ktraces: List
     mutex: int
@@ -4758,7 +4811,7 @@ class BscPsynchMutexdrop:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscPsynchCvbroad:
     ktraces: List
     cv: int
@@ -4774,7 +4827,7 @@ class BscPsynchCvbroad:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscPsynchCvsignal:
     ktraces: List
     cv: int
@@ -4790,7 +4843,7 @@ class BscPsynchCvsignal:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscPsynchCvwait:
     ktraces: List
     cv: int
@@ -4806,7 +4859,7 @@ class BscPsynchCvwait:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscGetsid:
     ktraces: List
     pid: int
@@ -4816,7 +4869,7 @@ class BscGetsid:
         return f'getsid({self.pid}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscPsynchCvclrprepost:
     ktraces: List
     cv: int
@@ -4832,7 +4885,7 @@ class BscPsynchCvclrprepost:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscIopolicysys:
     ktraces: List
     cmd: int
@@ -4843,7 +4896,7 @@ class BscIopolicysys:
         return f'iopolicysys({self.cmd}, {hex(self.arg)}), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscProcessPolicy:
     ktraces: List
     scope: int
@@ -4859,7 +4912,7 @@ class BscProcessPolicy:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMlockall:
     ktraces: List
     flags: int
@@ -4872,7 +4925,7 @@ class BscMlockall:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscMunlockall:
     ktraces: List
     result: str
@@ -4884,7 +4937,7 @@ class BscMunlockall:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscIssetugid:
     ktraces: List
     result: str
@@ -4893,7 +4946,7 @@ class BscIssetugid:
         return f'issetugid(), {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class BscPthreadSigmask:
     ktraces: List
     how: int
@@ -4908,7 +4961,7 @@ class BscPthreadSigmask:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscDisableThreadsignal:
     ktraces: List
     value: int
@@ -4921,7 +4974,7 @@ class BscDisableThreadsignal:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSemwaitSignal:
     ktraces: List
     cond_sem: int
@@ -4939,7 +4992,7 @@ class BscSemwaitSignal:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscProcInfo:
     ktraces: List
     callnum: ProcInfoCall
@@ -4955,7 +5008,7 @@ class BscProcInfo:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscSendfile:
     ktraces: List
     fd: int
@@ -4971,7 +5024,7 @@ class BscSendfile:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class BscStat64:
     ktraces: List
     path: str
@@ -5073,7 +5126,7 @@ def handle_sendmsg(parser, events, no_cancel=False):
 
 def handle_recvfrom(parser, events, no_cancel=False):
     args = events[0].values
-    flags = [flag for flag in SocketMsgFlags if flag.value & args[3]]
+    flags = serialize_msg_flags(args[3])
     return BscRecvfrom(events, args[0], args[1], args[2], flags, serialize_result(events[-1], 'count'), no_cancel)
 
 
@@ -5099,12 +5152,12 @@ def handle_access(parser, events):
 
 def handle_chflags(parser, events):
     vnode = parser.parse_vnode(events)
-    flags = [flag for flag in BscChangeableFlags if flag.value & events[0].values[1]]
+    flags = serialize_changeable_flags(events[0].values[1])
     return BscChflags(events, vnode.path, flags, serialize_result(events[-1]))
 
 
 def handle_fchflags(parser, events):
-    flags = [flag for flag in BscChangeableFlags if flag.value & events[0].values[1]]
+    flags = serialize_changeable_flags(events[0].values[1])
     return BscFchflags(events, events[0].values[0], flags, serialize_result(events[-1]))
 
 
@@ -5151,7 +5204,7 @@ def handle_getgid(parser, events):
 
 def handle_sigprocmask(parser, events):
     args = events[0].values
-    return BscSigprocmap(events, SigprocmaskFlags(args[0]), args[1], args[2], serialize_result(events[-1]))
+    return BscSigprocmap(events, to_sigprocmask_flags(args[0]), args[1], args[2], serialize_result(events[-1]))
 
 
 def handle_getlogin(parser, events):
@@ -5282,7 +5335,7 @@ def handle_sys_dup2(parser, events):
 
 def handle_sys_fcntl(parser, events, no_cancel=False):
     args = events[0].values
-    return BscSysFcntl(events, args[0], FcntlCmd(args[1]), args[2], serialize_result(events[-1], 'return'),
+    return BscSysFcntl(events, args[0], to_fcntl_cmd(args[1]), args[2], serialize_result(events[-1], 'return'),
                        no_cancel)
 
 
@@ -5297,7 +5350,7 @@ def handle_fsync(parser, events, no_cancel=False):
 
 def handle_setpriority(parser, events):
     args = events[0].values
-    return BscSetpriority(events, PriorityWhich(args[0]), args[1], args[2], serialize_result(events[-1]))
+    return BscSetpriority(events, to_priority_which(args[0]), args[1], args[2], serialize_result(events[-1]))
 
 
 def handle_socket(parser, events):
@@ -5313,7 +5366,7 @@ def handle_connect(parser, events, no_cancel=False):
 
 def handle_getpriority(parser, events):
     args = events[0].values
-    return BscGetpriority(events, PriorityWhich(args[0]), args[1], serialize_result(events[-1], 'priority'))
+    return BscGetpriority(events, to_priority_which(args[0]), args[1], serialize_result(events[-1], 'priority'))
 
 
 def handle_bind(parser, events):
@@ -5342,7 +5395,7 @@ def handle_gettimeofday(parser, events):
 
 def handle_getrusage(parser, events):
     args = events[0].values
-    return BscGetrusage(events, RusageWho(ctypes.c_int32(args[0]).value), args[1], serialize_result(events[-1]))
+    return BscGetrusage(events, to_rusage_who(ctypes.c_int32(args[0]).value), args[1], serialize_result(events[-1]))
 
 
 def handle_getsockopt(parser, events):
@@ -5517,12 +5570,12 @@ def handle_mount(parser, events):
 
 def handle_csops(parser, events):
     args = events[0].values
-    return BscCsops(events, args[0], CsopsOps(args[1]), args[2], args[3], serialize_result(events[-1]))
+    return BscCsops(events, args[0], to_csops_ops(args[1]), args[2], args[3], serialize_result(events[-1]))
 
 
 def handle_csops_audittoken(parser, events):
     args = events[0].values
-    return BscCsopsAudittoken(events, args[0], CsopsOps(args[1]), args[2], args[3], serialize_result(events[-1]))
+    return BscCsopsAudittoken(events, args[0], to_csops_ops(args[1]), args[2], args[3], serialize_result(events[-1]))
 
 
 def handle_waitid(parser, events, no_cancel=False):
@@ -5969,7 +6022,7 @@ def handle_semwait_signal(parser, events, no_cancel=False):
 
 def handle_proc_info(parser, events):
     args = events[0].values
-    return BscProcInfo(events, ProcInfoCall(args[0]), args[1], args[2], args[3], serialize_result(events[-1]))
+    return BscProcInfo(events, to_proc_info_call(args[0]), args[1], args[2], args[3], serialize_result(events[-1]))
 
 
 def handle_sendfile(parser, events):
@@ -6543,7 +6596,7 @@ def handle_fs_snapshot(parser, events):
     nodes = parser.parse_vnodes(events)
     name2 = nodes[1].path if len(nodes) > 1 else ''
     args = events[0].values
-    return BscFsSnapshot(events, FsSnapshotOp(args[0]), args[1], nodes[0].path, name2, serialize_result(events[-1]))
+    return BscFsSnapshot(events, to_fs_snapshot_op(args[0]), args[1], nodes[0].path, name2, serialize_result(events[-1]))
 
 
 def handle_terminate_with_payload(parser, events):
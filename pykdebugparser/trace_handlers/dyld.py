@@ -1,8 +1,10 @@
-from dataclasses import dataclass
 from enum import Enum
 from typing import List
 from uuid import UUID
 
+from pykdebugparser.decoders import flags_decoder
+from pykdebugparser.slots_dataclass import slots_dataclass
+
 
 class RtldFlag(Enum):
     RTLD_LAZY = 0x1
@@ -14,11 +16,12 @@ class RtldFlag(Enum):
     RTLD_FIRST = 0x100
 
 
+@flags_decoder
 def to_rtld_flags(flags: int):
     return [r for r in RtldFlag if r.value & flags]
 
 
-@dataclass
+@slots_dataclass
 class DyldUuidMapA:
     ktraces: List
     uuid: UUID
@@ -29,7 +32,7 @@ class DyldUuidMapA:
         return f'DYLD_uuid_map_a, uuid: "{self.uuid}", load_addr: {hex(self.load_addr)}, fsid: {hex(self.fsid)}'
 
 
-@dataclass
+@slots_dataclass
 class DyldUuidMapB:
     ktraces: List
     fid_objno: int
@@ -39,7 +42,7 @@ class DyldUuidMapB:
         return f'DYLD_uuid_map_b, fid_objno: {self.fid_objno}, fid_generation: {hex(self.fid_generation)}'
 
 
-@dataclass
+@slots_dataclass
 class DyldUuidUnmapA:
     ktraces: List
     uuid: UUID
@@ -50,7 +53,7 @@ class DyldUuidUnmapA:
         return f'DYLD_uuid_unmap_a, uuid: "{self.uuid}", load_addr: {hex(self.load_addr)}, fsid: {hex(self.fsid)}'
 
 
-@dataclass
+@slots_dataclass
 class DyldUuidUnmapB:
     ktraces: List
     fid_objno: int
@@ -60,7 +63,7 @@ class DyldUuidUnmapB:
         return f'DYLD_uuid_unmap_b, fid_objno: {self.fid_objno}, fid_generation: {hex(self.fid_generation)}'
 
 
-@dataclass
+@slots_dataclass
 class DyldUuidSharedCacheA:
     ktraces: List
     uuid: UUID
@@ -72,7 +75,7 @@ class DyldUuidSharedCacheA:
                 f'fsid: {hex(self.fsid)}')
 
 
-@dataclass
+@slots_dataclass
 class DyldUuidSharedCacheB:
     ktraces: List
     fid_objno: int
@@ -82,7 +85,11 @@ class DyldUuidSharedCacheB:
         return f'DYLD_uuid_shared_cache_b, fid_objno: {self.fid_objno}, fid_generation: {hex(self.fid_generation)}'
 
 
-@dataclass
+# Images mappings reported during an executable launch.
+LAUNCH_EXECUTABLE_SUB_EVENTS = ('DYLD_uuid_map_a', 'DYLD_uuid_shared_cache_a')
+
+
+@slots_dataclass
 class DyldLaunchExecutable:
     ktraces: List
     main_executable_mh: int
@@ -92,7 +99,7 @@ class DyldLaunchExecutable:
         return f'DBG_DYLD_TIMING_LAUNCH_EXECUTABLE, main_executable_mh: {hex(self.main_executable_mh)}'
 
 
-@dataclass
+@slots_dataclass
 class DyldMapImage:
     ktraces: List
     path: str
@@ -101,7 +108,7 @@ class DyldMapImage:
         return f'DBG_DYLD_TIMING_MAP_IMAGE, path: {self.path}'
 
 
-@dataclass
+@slots_dataclass
 class DyldFuncForAddImage:
     ktraces: List
     addr: int
@@ -111,7 +118,7 @@ class DyldFuncForAddImage:
         return f'DBG_DYLD_TIMING_FUNC_FOR_ADD_IMAGE, addr: {hex(self.addr)}, func: {hex(self.func)}'
 
 
-@dataclass
+@slots_dataclass
 class DyldBootstrapStart:
     ktraces: List
 
@@ -119,7 +126,7 @@ class DyldBootstrapStart:
         return 'DBG_DYLD_TIMING_BOOTSTRAP_START'
 
 
-@dataclass
+@slots_dataclass
 class Dlopen:
     ktraces: List
     path: str
@@ -131,7 +138,7 @@ class Dlopen:
         return f'dlopen("{self.path}", {flags}), handle: {hex(self.handle)}'
 
 
-@dataclass
+@slots_dataclass
 class DlopenPreflight:
     ktraces: List
     path: str
@@ -141,7 +148,7 @@ class DlopenPreflight:
         return f'dlopen_preflight("{self.path}"), compatible: {self.compatible}'
 
 
-@dataclass
+@slots_dataclass
 class Dlclose:
     ktraces: List
     handle: int
@@ -150,7 +157,7 @@ class Dlclose:
         return f'dlclose({hex(self.handle)})'
 
 
-@dataclass
+@slots_dataclass
 class Dlsym:
     ktraces: List
     handle: int
@@ -161,7 +168,7 @@ class Dlsym:
         return f'dlsym({hex(self.handle)}, "{self.symbol}"), address: {hex(self.address)}'
 
 
-@dataclass
+@slots_dataclass
 class Dladdr:
     ktraces: List
     addr: int
@@ -202,9 +209,9 @@ def handle_uuid_shared_cache_b(parser, events):
 
 
 def handle_timing_launch_executable(parser, events):
-    map_a = [handle_uuid_map_a(parser, [e]) for e in events if parser.trace_codes.get(e.eventid) == 'DYLD_uuid_map_a']
-    map_a += [handle_uuid_shared_cache_a(parser, [e]) for e in events if
-              parser.trace_codes.get(e.eventid) == 'DYLD_uuid_shared_cache_a']
+    sub_events = parser.group_events(events, LAUNCH_EXECUTABLE_SUB_EVENTS)
+    map_a = [handle_uuid_map_a(parser, [e]) for e in sub_events['DYLD_uuid_map_a']]
+    map_a += [handle_uuid_shared_cache_a(parser, [e]) for e in sub_events['DYLD_uuid_shared_cache_a']]
     map_a = sorted(map_a, key=lambda x: x.load_addr)
     return DyldLaunchExecutable(events, events[0].values[1], map_a)
 
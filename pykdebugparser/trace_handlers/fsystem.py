@@ -1,8 +1,9 @@
-from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
+from pykdebugparser.slots_dataclass import slots_dataclass
 
-@dataclass
+
+@slots_dataclass
 class VfsLookup:
     ktraces: List
     path: str
@@ -12,11 +13,27 @@ class VfsLookup:
         return f'lookup("{self.path}"), vnode id: {self.vnode_id}'
 
 
+@slots_dataclass
+class HfsUpdate:
+    ktraces: List
+    vnode_id: int
+    path: Optional[str]
+
+    def __str__(self):
+        return f'hfs_update("{self.path}"), vnode id: {self.vnode_id}'
+
+
 def handle_vfs_lookup(parser, events):
     node = parser.parse_vnode(events)
     return VfsLookup(events, node.path, node.vnode_id)
 
 
+def handle_hfs_update(parser, events):
+    vnode_id = events[0].values[0]
+    return HfsUpdate(events, vnode_id, parser.vnode_path(vnode_id))
+
+
 handlers = {
     'VFS_LOOKUP': handle_vfs_lookup,
+    'HFS_update': handle_hfs_update,
 }
@@ -1,9 +1,11 @@
 import ctypes
-from dataclasses import dataclass
 from enum import Enum
 from functools import partial
 from typing import List
 
+from pykdebugparser.decoders import enum_decoder, flags_decoder
+from pykdebugparser.slots_dataclass import slots_dataclass
+
 
 class AsynchronousSystemTrapsReason(Enum):
     AST_NONE = 0x00
@@ -31,6 +33,7 @@ class AsynchronousSystemTrapsReason(Enum):
     AST_UNQUIESCE = 0x200000
 
 
+@flags_decoder
 def to_ast_reasons(flags: int):
     if not flags:
         return [AsynchronousSystemTrapsReason.AST_NONE]
@@ -86,6 +89,7 @@ class ThreadState(Enum):
     TH_IDLE = 0x80
 
 
+@flags_decoder
 def to_thread_state(flags: int):
     return [s for s in ThreadState if s.value & flags]
 
@@ -108,6 +112,9 @@ class ProcessState(Enum):
     PROCESSOR_RUNNING = 6
 
 
+to_process_state = enum_decoder(ProcessState)
+
+
 class DbgVmFaultType(Enum):
     DBG_ZERO_FILL_FAULT = 1
     DBG_PAGEIN_FAULT = 2
@@ -122,6 +129,9 @@ class DbgVmFaultType(Enum):
     DBG_COR_FAULT = 11
 
 
+to_dbg_vm_fault_type = enum_decoder(DbgVmFaultType)
+
+
 class VmProtection(Enum):
     VM_PROT_NONE = 0x00
     VM_PROT_READ = 0x01
@@ -134,6 +144,7 @@ class VmProtection(Enum):
     VM_PROT_STRIP_READ = 0x80
 
 
+@flags_decoder
 def to_vm_prot(flags: int):
     if not flags:
         return [VmProtection.VM_PROT_NONE]
@@ -152,6 +163,9 @@ class MachPortRight(Enum):
     MACH_PORT_RIGHT_NUMBER = 5
 
 
+to_mach_port_right = enum_decoder(MachPortRight)
+
+
 # osfmk/mach/message.h
 
 class MachMsgTypeName(Enum):
@@ -164,6 +178,9 @@ class MachMsgTypeName(Enum):
     MACH_MSG_TYPE_COPY_RECEIVE = 22
 
 
+to_mach_msg_type_name = enum_decoder(MachMsgTypeName)
+
+
 # osfmk/mach/kern_return.h
 
 class KernReturn(Enum):
@@ -223,6 +240,9 @@ class KernReturn(Enum):
     KERN_DENIED = 53
 
 
+to_kern_return = enum_decoder(KernReturn)
+
+
 # osfmk/mach/port.h
 
 class MachPortFlavor(Enum):
@@ -235,6 +255,9 @@ class MachPortFlavor(Enum):
     MACH_PORT_INFO_EXT = 7
 
 
+to_mach_port_flavor = enum_decoder(MachPortFlavor)
+
+
 # osfmk/mach/thread_switch.h
 
 class SwitchOption(Enum):
@@ -246,6 +269,9 @@ class SwitchOption(Enum):
     SWITCH_OPTION_OSLOCK_WAIT = 5
 
 
+to_switch_option = enum_decoder(SwitchOption)
+
+
 # osfmk/mach/mk_timer.h
 
 class MkTimerFlags(Enum):
@@ -253,7 +279,10 @@ class MkTimerFlags(Enum):
     MK_TIMER_CRITICAL = 1
 
 
-@dataclass
+to_mk_timer_flags = enum_decoder(MkTimerFlags)
+
+
+@slots_dataclass
 class KernelUncategorizedExcArm:
     ktraces: List
     esr: int
@@ -269,7 +298,7 @@ class KernelUncategorizedExcArm:
         return f'KernelUncategorizedExcArm, class: {esr_class}, far: {hex(self.far)}, pc: {hex(self.pc)}'
 
 
-@dataclass
+@slots_dataclass
 class KernelDataAbortSameElExcArm:
     ktraces: List
     esr: int
@@ -285,7 +314,7 @@ class KernelDataAbortSameElExcArm:
         return f'Kernel_Data_Abort_Same_EL_Exc_ARM, class: {esr_class}, far: {hex(self.far)}, pc: {hex(self.pc)}'
 
 
-@dataclass
+@slots_dataclass
 class UserSvc64ExcArm:
     ktraces: List
     esr: int
@@ -301,7 +330,7 @@ class UserSvc64ExcArm:
         return f'User_SVC64_Exc_ARM, class: {esr_class}, far: {hex(self.far)}, pc: {hex(self.pc)}'
 
 
-@dataclass
+@slots_dataclass
 class Interrupt:
     ktraces: List
     pc: int
@@ -312,7 +341,7 @@ class Interrupt:
         return f'INTERRUPT, pc: {hex(self.pc)}, is_user: {self.is_user}, type: {InterruptType(self.type).name}'
 
 
-@dataclass
+@slots_dataclass
 class UserInstrAbortLowerElExcArm:
     ktraces: List
     esr: int
@@ -328,7 +357,7 @@ class UserInstrAbortLowerElExcArm:
         return f'User_Instr_Abort_Lower_EL_Exc_ARM, class: {esr_class}, far: {hex(self.far)}, pc: {hex(self.pc)}'
 
 
-@dataclass
+@slots_dataclass
 class UserDataAbortLowerElExcArm:
     ktraces: List
     esr: int
@@ -344,7 +373,7 @@ class UserDataAbortLowerElExcArm:
         return f'User_Data_Abort_Lower_EL_Exc_ARM, class: {esr_class}, far: {hex(self.far)}, pc: {hex(self.pc)}'
 
 
-@dataclass
+@slots_dataclass
 class DecrTrap:
     ktraces: List
     latency: int
@@ -355,7 +384,7 @@ class DecrTrap:
         return f'DecrTrap, latency: {self.latency}, pc: {hex(self.pc)}, user_mode: {self.user_mode}'
 
 
-@dataclass
+@slots_dataclass
 class DecrSet:
     ktraces: List
     decr: int
@@ -366,7 +395,7 @@ class DecrSet:
         return f'DecrSet, decr: {self.decr}'
 
 
-@dataclass
+@slots_dataclass
 class MachVmAllocate:
     ktraces: List
     target: int
@@ -378,7 +407,7 @@ class MachVmAllocate:
         return f'mach_vm_allocate({self.target}, {hex(self.address)}, {hex(self.size)}, {hex(self.flags)})'
 
 
-@dataclass
+@slots_dataclass
 class MachVmPurgableControl:
     ktraces: List
     target: int
@@ -390,7 +419,7 @@ class MachVmPurgableControl:
         return f'mach_vm_purgable_control({self.target}, {hex(self.address)}, {self.control}, {hex(self.state)})'
 
 
-@dataclass
+@slots_dataclass
 class MachVmDeallocate:
     ktraces: List
     target: int
@@ -401,7 +430,7 @@ class MachVmDeallocate:
         return f'mach_vm_deallocate({self.target}, {hex(self.address)}, {hex(self.size)})'
 
 
-@dataclass
+@slots_dataclass
 class MachVmProtect:
     ktraces: List
     target: int
@@ -413,7 +442,7 @@ class MachVmProtect:
         return f'mach_vm_protect({self.target}, {hex(self.address)}, {hex(self.size)}, {str(self.set_maximum).lower()})'
 
 
-@dataclass
+@slots_dataclass
 class MachVmMap:
     ktraces: List
     target: int
@@ -425,7 +454,7 @@ class MachVmMap:
         return f'mach_vm_map({self.target}, {hex(self.address)}, {hex(self.size)}, {hex(self.mask)})'
 
 
-@dataclass
+@slots_dataclass
 class MachPortAllocate:
     ktraces: List
     target: int
@@ -436,7 +465,7 @@ class MachPortAllocate:
         return f'mach_port_allocate({self.target}, {self.right.name}, {hex(self.name)})'
 
 
-@dataclass
+@slots_dataclass
 class MachPortDeallocate:
     ktraces: List
     target: int
@@ -446,7 +475,7 @@ class MachPortDeallocate:
         return f'mach_port_deallocate({self.target}, {hex(self.name)})'
 
 
-@dataclass
+@slots_dataclass
 class MachPortModRefs:
     ktraces: List
     target: int
@@ -458,7 +487,7 @@ class MachPortModRefs:
         return f'mach_port_mod_refs({self.target}, {hex(self.name)}, {self.right.name}, {hex(self.delta)})'
 
 
-@dataclass
+@slots_dataclass
 class MachPortInsertRight:
     ktraces: List
     target: int
@@ -470,7 +499,7 @@ class MachPortInsertRight:
         return f'mach_port_insert_right({self.target}, {hex(self.name)}, {hex(self.poly)}, {self.poly_poly.name})'
 
 
-@dataclass
+@slots_dataclass
 class MachPortInsertMember:
     ktraces: List
     target: int
@@ -481,7 +510,7 @@ class MachPortInsertMember:
         return f'mach_port_insert_member({self.target}, {hex(self.name)}, {hex(self.pset)})'
 
 
-@dataclass
+@slots_dataclass
 class MachPortExtractMember:
     ktraces: List
     target: int
@@ -492,7 +521,7 @@ class MachPortExtractMember:
         return f'mach_port_extract_member({self.target}, {hex(self.name)}, {hex(self.pset)})'
 
 
-@dataclass
+@slots_dataclass
 class MachPortConstruct:
     ktraces: List
     target: int
@@ -504,7 +533,7 @@ class MachPortConstruct:
         return f'mach_port_construct({self.target}, {hex(self.options)}, {hex(self.context)}, {hex(self.name)})'
 
 
-@dataclass
+@slots_dataclass
 class MachPortDestruct:
     ktraces: List
     target: int
@@ -516,7 +545,7 @@ class MachPortDestruct:
         return f'mach_port_destruct({self.target}, {hex(self.name)}, {hex(self.srdelta)}, {hex(self.guard)})'
 
 
-@dataclass
+@slots_dataclass
 class MachReplyPort:
     ktraces: List
     result: int
@@ -525,7 +554,7 @@ class MachReplyPort:
         return f'mach_reply_port(), result: {hex(self.result)}'
 
 
-@dataclass
+@slots_dataclass
 class MachThreadSelf:
     ktraces: List
     result: int
@@ -534,7 +563,7 @@ class MachThreadSelf:
         return f'mach_thread_self(), result: {hex(self.result)}'
 
 
-@dataclass
+@slots_dataclass
 class TaskSelf:
     ktraces: List
     result: int
@@ -543,7 +572,7 @@ class TaskSelf:
         return f'task_self(), result: {self.result}'
 
 
-@dataclass
+@slots_dataclass
 class HostSelf:
     ktraces: List
     result: int
@@ -552,7 +581,7 @@ class HostSelf:
         return f'host_self(), result: {hex(self.result)}'
 
 
-@dataclass
+@slots_dataclass
 class SemaphoreSignal:
     ktraces: List
     signal_name: int
@@ -561,7 +590,7 @@ class SemaphoreSignal:
         return f'semaphore_signal({hex(self.signal_name)})'
 
 
-@dataclass
+@slots_dataclass
 class SemaphoreWait:
     ktraces: List
     wait_name: int
@@ -570,7 +599,7 @@ class SemaphoreWait:
         return f'semaphore_wait({hex(self.wait_name)})'
 
 
-@dataclass
+@slots_dataclass
 class SemaphoreTimedwait:
     ktraces: List
     wait_name: int
@@ -582,7 +611,7 @@ class SemaphoreTimedwait:
         return f'semaphore_timedwait({hex(self.wait_name)}, {self.sec}, {self.nsec}), result: {self.result.name}'
 
 
-@dataclass
+@slots_dataclass
 class MachPortGetAttributes:
     ktraces: List
     target: int
@@ -595,7 +624,7 @@ class MachPortGetAttributes:
                 f'{hex(self.port_info_out)})')
 
 
-@dataclass
+@slots_dataclass
 class MachPortGuard:
     ktraces: List
     target: int
@@ -607,7 +636,7 @@ class MachPortGuard:
         return f'mach_port_guard({self.target}, {hex(self.name)}, {hex(self.guard)}, {str(self.strict).lower()})'
 
 
-@dataclass
+@slots_dataclass
 class MachPortUnguard:
     ktraces: List
     target: int
@@ -618,7 +647,7 @@ class MachPortUnguard:
         return f'mach_port_unguard({self.target}, {hex(self.name)}, {hex(self.guard)})'
 
 
-@dataclass
+@slots_dataclass
 class MachGenerateActivityId:
     ktraces: List
     target: int
@@ -629,7 +658,7 @@ class MachGenerateActivityId:
         return f'mach_generate_activity_id({self.target}, {self.count}, {hex(self.activity_id)})'
 
 
-@dataclass
+@slots_dataclass
 class MachMsg2:
     ktraces: List
     data: int
@@ -641,7 +670,7 @@ class MachMsg2:
         return f'mach_msg2({hex(self.data)}, {hex(self.option64)}, {hex(self.header)}, {hex(self.send_size)})'
 
 
-@dataclass
+@slots_dataclass
 class ThreadGetSpecialReplyPort:
     ktraces: List
     result: int
@@ -650,7 +679,7 @@ class ThreadGetSpecialReplyPort:
         return f'thread_get_special_reply_port(), result {hex(self.result)}'
 
 
-@dataclass
+@slots_dataclass
 class ThreadSwitch:
     ktraces: List
     thread_name: int
@@ -661,7 +690,7 @@ class ThreadSwitch:
         return f'thread_switch({hex(self.thread_name)}, {self.option.name}, {self.option_time})'
 
 
-@dataclass
+@slots_dataclass
 class HostCreateMachVoucher:
     ktraces: List
     host: int
@@ -674,7 +703,7 @@ class HostCreateMachVoucher:
                 f', {hex(self.voucher)})')
 
 
-@dataclass
+@slots_dataclass
 class MachPortType:
     ktraces: List
     task: int
@@ -685,7 +714,7 @@ class MachPortType:
         return f'mach_port_type({self.task}, {hex(self.name)}, {hex(self.ptype)})'
 
 
-@dataclass
+@slots_dataclass
 class MachPortRequestNotification:
     ktraces: List
     task: int
@@ -697,7 +726,7 @@ class MachPortRequestNotification:
         return f'mach_port_request_notification({self.task}, {hex(self.name)}, {hex(self.msgid)}, {self.sync})'
 
 
-@dataclass
+@slots_dataclass
 class MachTimebaseInfo:
     ktraces: List
     info: int
@@ -706,7 +735,7 @@ class MachTimebaseInfo:
         return f'mach_timebase_info({hex(self.info)})'
 
 
-@dataclass
+@slots_dataclass
 class MachWaitUntil:
     ktraces: List
     deadline: int
@@ -715,7 +744,7 @@ class MachWaitUntil:
         return f'mach_wait_until({self.deadline})'
 
 
-@dataclass
+@slots_dataclass
 class MkTimerCreate:
     ktraces: List
     timer_port: int
@@ -724,7 +753,7 @@ class MkTimerCreate:
         return f'mk_timer_create(), timer: {hex(self.timer_port)}'
 
 
-@dataclass
+@slots_dataclass
 class MkTimerDestroy:
     ktraces: List
     name: int
@@ -733,7 +762,7 @@ class MkTimerDestroy:
         return f'mk_timer_destroy({hex(self.name)})'
 
 
-@dataclass
+@slots_dataclass
 class MkTimerArm:
     ktraces: List
     name: int
@@ -743,7 +772,7 @@ class MkTimerArm:
         return f'mk_timer_arm({hex(self.name)}, {self.expire_time})'
 
 
-@dataclass
+@slots_dataclass
 class MkTimerCancel:
     ktraces: List
     name: int
@@ -753,7 +782,7 @@ class MkTimerCancel:
         return f'mk_timer_cancel({hex(self.name)}, {self.result_time})'
 
 
-@dataclass
+@slots_dataclass
 class MkTimerArmLeeway:
     ktraces: List
     name: int
@@ -766,7 +795,7 @@ class MkTimerArmLeeway:
                 f', {self.mk_timer_leeway})')
 
 
-@dataclass
+@slots_dataclass
 class IokitUserClient:
     ktraces: List
     user_client_ref: int
@@ -778,7 +807,7 @@ class IokitUserClient:
         return f'iokit_user_client({hex(self.user_client_ref)}, {self.index}, {hex(self.p1)}, {hex(self.p2)})'
 
 
-@dataclass
+@slots_dataclass
 class ThreadSetVoucher:
     ktraces: List
     tid: int
@@ -791,7 +820,7 @@ class ThreadSetVoucher:
                 f'persona_id: {self.persona_id}')
 
 
-@dataclass
+@slots_dataclass
 class MachPageout:
     ktraces: List
     size: int
@@ -800,7 +829,7 @@ class MachPageout:
         return f'MACH_Pageout, size: {hex(self.size)}'
 
 
-@dataclass
+@slots_dataclass
 class MachVmfault:
     ktraces: List
     addr: int
@@ -820,7 +849,7 @@ class MachVmfault:
         return ret
 
 
-@dataclass
+@slots_dataclass
 class RealFaultAddressInternal:
     ktraces: List
     vaddr: int
@@ -836,7 +865,7 @@ class RealFaultAddressInternal:
                 f' vm_prot: {prot}, type: {self.fault_type.name}, pid: {self.pid}')
 
 
-@dataclass
+@slots_dataclass
 class RealFaultAddressExternal:
     ktraces: List
     vaddr: int
@@ -852,7 +881,7 @@ class RealFaultAddressExternal:
                 f' vm_prot: {prot}, type: {self.fault_type.name}, pid: {self.pid}')
 
 
-@dataclass
+@slots_dataclass
 class RealFaultAddressSharedCache:
     ktraces: List
     vaddr: int
@@ -868,7 +897,7 @@ class RealFaultAddressSharedCache:
                 f' vm_prot: {prot}, type: {self.fault_type.name}, pid: {self.pid}')
 
 
-@dataclass
+@slots_dataclass
 class MachSched:
     ktraces: List
     reason: List[AsynchronousSystemTrapsReason]
@@ -881,7 +910,7 @@ class MachSched:
         return f'MACH_SCHED, to: {self.to}, reason: {reason}'
 
 
-@dataclass
+@slots_dataclass
 class MachStkhandoff:
     ktraces: List
     from_: int
@@ -894,7 +923,7 @@ class MachStkhandoff:
         return f'stack_handoff({self.from_}, {self.to})'
 
 
-@dataclass
+@slots_dataclass
 class MachMkrunnable:
     ktraces: List
     tid: int
@@ -906,7 +935,7 @@ class MachMkrunnable:
         return f'MACH_MKRUNNABLE, tid: {self.tid}, wait_result: {self.wait_result}'
 
 
-@dataclass
+@slots_dataclass
 class MachIdle:
     ktraces: List
     from_: int
@@ -919,7 +948,7 @@ class MachIdle:
         return f'MACH_IDLE, from: {self.from_}, to: {self.to}, reason: {reason}, state: {self.process_state.name}'
 
 
-@dataclass
+@slots_dataclass
 class MachBlock:
     ktraces: List
     reason: List[AsynchronousSystemTrapsReason]
@@ -930,7 +959,7 @@ class MachBlock:
         return f'MACH_BLOCK, reason: {reason}, continuation: {hex(self.continuation)}'
 
 
-@dataclass
+@slots_dataclass
 class MachWait:
     ktraces: List
     event: int
@@ -939,7 +968,7 @@ class MachWait:
         return f'MACH_WAIT, event: {hex(self.event)}'
 
 
-@dataclass
+@slots_dataclass
 class MachDispatch:
     ktraces: List
     tid: int
@@ -953,7 +982,7 @@ class MachDispatch:
         return f'MACH_DISPATCH, tid: {self.tid}, reason: {reason}, state: {state}'
 
 
-@dataclass
+@slots_dataclass
 class ThreadGroupSet:
     ktraces: List
     current_tgid: int
@@ -966,7 +995,7 @@ class ThreadGroupSet:
                 f'tid: {self.tid}, home: {self.home_tgid}')
 
 
-@dataclass
+@slots_dataclass
 class SchedClutchCpuThreadSelect:
     ktraces: List
     tid: int
@@ -977,7 +1006,7 @@ class SchedClutchCpuThreadSelect:
         return f'SCHED_CLUTCH_CPU_THREAD_SELECT, tid: {self.tid}'
 
 
-@dataclass
+@slots_dataclass
 class SchedClutchTgBucketPri:
     ktraces: List
     tgid: int
@@ -1047,7 +1076,7 @@ def handle_msc_mach_vm_map_trap(parser, events):
 
 def handle_msc_mach_port_allocate_trap(parser, events):
     args = events[0].values
-    return MachPortAllocate(events, args[0], MachPortRight(args[1]), args[2])
+    return MachPortAllocate(events, args[0], to_mach_port_right(args[1]), args[2])
 
 
 def handle_msc_mach_port_deallocate_trap(parser, events):
@@ -1056,11 +1085,11 @@ def handle_msc_mach_port_deallocate_trap(parser, events):
 
 def handle_msc_mach_port_mod_refs_trap(parser, events):
     args = events[0].values
-    return MachPortModRefs(events, args[0], args[1], MachPortRight(args[2]), args[3])
+    return MachPortModRefs(events, args[0], args[1], to_mach_port_right(args[2]), args[3])
 
 
 def handle_msc_mach_port_insert_right_trap(parser, events):
-    return MachPortInsertRight(events, *events[0].values[:3], MachMsgTypeName(events[0].values[3]))
+    return MachPortInsertRight(events, *events[0].values[:3], to_mach_msg_type_name(events[0].values[3]))
 
 
 def handle_msc_mach_port_insert_member_trap(parser, events):
@@ -1105,12 +1134,12 @@ def handle_msc_semaphore_wait_trap(parser, events):
 
 def handle_msc_semaphore_timedwait_trap(parser, events):
     args = events[0].values
-    return SemaphoreTimedwait(events, args[0], args[1] & 0xffffffff, args[2], KernReturn(events[-1].values[0]))
+    return SemaphoreTimedwait(events, args[0], args[1] & 0xffffffff, args[2], to_kern_return(events[-1].values[0]))
 
 
 def handle_msc_mach_port_get_attributes_trap(parser, events):
     args = events[0].values
-    return MachPortGetAttributes(events, *args[:2], MachPortFlavor(args[2]), args[3])
+    return MachPortGetAttributes(events, *args[:2], to_mach_port_flavor(args[2]), args[3])
 
 
 def handle_msc_mach_port_guard_trap(parser, events):
@@ -1135,7 +1164,7 @@ def handle_msc_thread_get_special_reply_port(parser, events):
 
 def handle_msc_thread_switch(parser, events):
     args = events[0].values
-    return ThreadSwitch(events, args[0], SwitchOption(args[1]), args[2])
+    return ThreadSwitch(events, args[0], to_switch_option(args[1]), args[2])
 
 
 def handle_msc_host_create_mach_voucher_trap(parser, events):
@@ -1176,7 +1205,7 @@ def handle_msc_mk_timer_cancel(parser, events):
 
 def handle_msc_mk_timer_arm_leeway(parser, events):
     args = events[0].values
-    return MkTimerArmLeeway(events, args[0], MkTimerFlags(args[1]), args[2], args[3])
+    return MkTimerArmLeeway(events, args[0], to_mk_timer_flags(args[1]), args[2], args[3])
 
 
 def handle_msc_iokit_user_client(parser, events):
@@ -1200,7 +1229,7 @@ def handle_mach_vmfault(parser, events):
     pid = None
     caller_prot = None
     if result == 0:
-        fault_type = DbgVmFaultType(rets[3])
+        fault_type = to_dbg_vm_fault_type(rets[3])
         real_events = [e for e in events[1:-1] if 0x1320008 <= e.eventid <= 0x1320014]
         if real_events:
             vm_fault_real = parser.parse_event_list(real_events)
@@ -1212,7 +1241,7 @@ def handle_mach_vmfault(parser, events):
 def handle_real_fault_address(addr_type, parser, events):
     args = events[0].values
     caller_prot = to_vm_prot((args[1] >> 8) & 0xff)
-    fault_type = DbgVmFaultType(args[1] & 0xff)
+    fault_type = to_dbg_vm_fault_type(args[1] & 0xff)
     return addr_type(events, args[0], args[1] >> 16, caller_prot, fault_type, args[2], args[3])
 
 
@@ -1233,7 +1262,7 @@ def handle_mach_mkrunnable(parser, events):
 
 def handle_mach_idle(parser, events):
     args = events[-1].values
-    return MachIdle(events, args[0], ProcessState(args[1]), args[2], to_ast_reasons(args[3]))
+    return MachIdle(events, args[0], to_process_state(args[1]), args[2], to_ast_reasons(args[3]))
 
 
 def handle_mach_block(parser, events):
@@ -1,8 +1,10 @@
-from dataclasses import dataclass
 from enum import Enum
-from itertools import chain
+from itertools import chain, islice
 from typing import List, Any
 
+from pykdebugparser.decoders import flags_decoder
+from pykdebugparser.slots_dataclass import slots_dataclass
+
 
 class SamplerAction(Enum):
     SAMPLER_TH_INFO = 0x01
@@ -21,6 +23,7 @@ class SamplerAction(Enum):
     SAMPLER_TK_INFO = 0x2000
 
 
+@flags_decoder
 def to_sampler_action(flags: int):
     return [s for s in SamplerAction if s.value & flags]
 
@@ -35,6 +38,7 @@ class KperfTiState(Enum):
     KPERF_TI_IDLE = 0x40
 
 
+@flags_decoder
 def to_kperf_ti_state(flags: int):
     return [s for s in KperfTiState if s.value & flags]
 
@@ -51,11 +55,16 @@ class CallstackFlag(Enum):
     CALLSTACK_FIXUP_PC = 0x100
 
 
+@flags_decoder
 def to_callstack_flags(flags: int):
     return [c for c in CallstackFlag if c.value & flags]
 
 
-@dataclass
+# Samples of a PERF_Event, collected between its start and end.
+EVENT_SUB_EVENTS = ('PERF_THD_Data', 'PERF_STK_UHdr', 'PERF_STK_UData')
+
+
+@slots_dataclass
 class PerfEvent:
     ktraces: List
     sample_what: List
@@ -72,7 +81,7 @@ class PerfEvent:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class PerfThdData:
     """
     According to kperf_thread_info_sample, osfmk/kperf/thread_samplers.c
@@ -88,7 +97,7 @@ class PerfThdData:
         return f'PERF_THD_Data, pid: {self.pid}, tid: {self.tid}, dq_addr: {hex(self.dq_addr)}, runmode: {runmode}'
 
 
-@dataclass
+@slots_dataclass
 class PerfThdCswitch:
     """
     According to kperf_on_cpu_internal, osfmk/kperf/kperf.c
@@ -101,7 +110,7 @@ class PerfThdCswitch:
         return f'PERF_THD_CSwitch, tid: {self.tid}, pid: {self.pid}'
 
 
-@dataclass
+@slots_dataclass
 class PerfStkUdata:
     """
     According to callstack_log, osfmk/kperf/callstack.c
@@ -114,7 +123,7 @@ class PerfStkUdata:
         return f'PERF_STK_UData, frames: [{frames}]'
 
 
-@dataclass
+@slots_dataclass
 class PerfStkUhdr:
     """
     According to callstack_log, osfmk/kperf/callstack.c
@@ -131,18 +140,15 @@ class PerfStkUhdr:
 def handle_event(parser, events):
     args = events[0].values
     e = PerfEvent(events, to_sampler_action(args[0]), args[1])
-    if SamplerAction.SAMPLER_TH_INFO in e.sample_what:
-        sub_events = [ev for ev in events if parser.trace_codes.get(ev.eventid, '') == 'PERF_THD_Data']
-        if sub_events:
-            e.th_info = handle_thd_data(parser, sub_events)
-    if SamplerAction.SAMPLER_USTACK in e.sample_what:
-        sub_events = [ev for ev in events if parser.trace_codes.get(ev.eventid, '') == 'PERF_STK_UHdr']
-        if sub_events:
-            header = handle_stk_uhdr(parser, sub_events)
-            stk_data = [handle_stk_udata(parser, [ev]).frames for ev in events if
-                        parser.trace_codes.get(ev.eventid, '') == 'PERF_STK_UData']
-            e.cs_frames = list(chain.from_iterable(stk_data))[:header.nframes]
-            e.cs_flags = header.flags
+    sub_events = parser.group_events(events, EVENT_SUB_EVENTS)
+    if SamplerAction.SAMPLER_TH_INFO in e.sample_what and sub_events['PERF_THD_Data']:
+        e.th_info = handle_thd_data(parser, sub_events['PERF_THD_Data'])
+    if SamplerAction.SAMPLER_USTACK in e.sample_what and sub_events['PERF_STK_UHdr']:
+        header = handle_stk_uhdr(parser, sub_events['PERF_STK_UHdr'])
+        # Each PERF_STK_UData event carries up to 4 frames in its arguments.
+        stk_data = (ev.values for ev in sub_events['PERF_STK_UData'])
+        e.cs_frames = list(islice(chain.from_iterable(stk_data), header.nframes))
+        e.cs_flags = header.flags
 
     return e
 
@@ -1,10 +1,10 @@
-from dataclasses import dataclass
 from typing import List
 
 from pykdebugparser.kevent import DgbFuncQual
+from pykdebugparser.slots_dataclass import slots_dataclass
 
 
-@dataclass
+@slots_dataclass
 class TraceDataNewthread:
     ktraces: List
     tid: int
@@ -16,7 +16,7 @@ class TraceDataNewthread:
         return f'New thread {self.tid} of parent: {self.pid}'
 
 
-@dataclass
+@slots_dataclass
 class TraceDataExec:
     ktraces: List
     pid: int
@@ -27,7 +27,7 @@ class TraceDataExec:
         return f'New process pid: {self.pid}'
 
 
-@dataclass
+@slots_dataclass
 class TraceDataThreadTerminate:
     ktraces: List
     tid: int
@@ -43,7 +43,7 @@ class TraceDataThreadTerminate:
         return rep
 
 
-@dataclass
+@slots_dataclass
 class TraceDataThreadTerminatePid:
     ktraces: List
     pid: int
@@ -53,7 +53,7 @@ class TraceDataThreadTerminatePid:
         return f'Thread terminated thread pid: {self.pid}, unique id {self.uniqueid}'
 
 
-@dataclass
+@slots_dataclass
 class TraceStringGlobal:
     ktraces: List
     debugid: int
@@ -64,7 +64,7 @@ class TraceStringGlobal:
         return f'New global string: "{self.vstr}", id: {self.str_id}'
 
 
-@dataclass
+@slots_dataclass
 class TraceStringNewthread:
     ktraces: List
     name: str
@@ -73,7 +73,7 @@ class TraceStringNewthread:
         return f'New thread of parent: {self.name}'
 
 
-@dataclass
+@slots_dataclass
 class TraceStringExec:
     ktraces: List
     name: str
@@ -82,7 +82,7 @@ class TraceStringExec:
         return f'New process name: {self.name}'
 
 
-@dataclass
+@slots_dataclass
 class TraceStringProcExit:
     ktraces: List
     name: str
@@ -91,7 +91,7 @@ class TraceStringProcExit:
         return f'Process exit name: {self.name}'
 
 
-@dataclass
+@slots_dataclass
 class TraceStringThreadname:
     ktraces: List
     name: str
@@ -100,7 +100,7 @@ class TraceStringThreadname:
         return f'New thread name: {self.name}'
 
 
-@dataclass
+@slots_dataclass
 class TraceStringThreadnamePrev:
     ktraces: List
     name: str
@@ -1,7 +1,9 @@
-from dataclasses import dataclass
 from enum import Enum
 from typing import List
 
+from pykdebugparser.decoders import enum_decoder
+from pykdebugparser.slots_dataclass import slots_dataclass
+
 
 class TurnstileType(Enum):
     TURNSTILE_NONE = 0
@@ -18,7 +20,10 @@ class TurnstileType(Enum):
     TURNSTILE_TOTAL_TYPES = 11
 
 
-@dataclass
+to_turnstile_type = enum_decoder(TurnstileType)
+
+
+@slots_dataclass
 class TurnstileWaitqAddThreadPriorityQueue:
     ktraces: List
     turnstile: int
@@ -30,7 +35,7 @@ class TurnstileWaitqAddThreadPriorityQueue:
                 f' priority: {self.priority}')
 
 
-@dataclass
+@slots_dataclass
 class ThreadRemovedFromTurnstileWaitq:
     ktraces: List
     turnstile: int
@@ -40,7 +45,7 @@ class ThreadRemovedFromTurnstileWaitq:
         return f'thread_removed_from_turnstile_waitq, turnstile: {hex(self.turnstile)}, tid: {self.tid}'
 
 
-@dataclass
+@slots_dataclass
 class ThreadMovedInTurnstileWaitq:
     ktraces: List
     dst_turnstile: int
@@ -53,7 +58,7 @@ class ThreadMovedInTurnstileWaitq:
                 f' priority: {self.priority}, link priority: {self.thread_link_priority}')
 
 
-@dataclass
+@slots_dataclass
 class TurnstileAddTurnstilePromotion:
     ktraces: List
     dst_turnstile: int
@@ -65,7 +70,7 @@ class TurnstileAddTurnstilePromotion:
                 f' src_turnstile->ts_priority: {self.src_ts_priority}')
 
 
-@dataclass
+@slots_dataclass
 class TurnstileRemoveTurnstilePromotion:
     ktraces: List
     dst_turnstile: int
@@ -75,7 +80,7 @@ class TurnstileRemoveTurnstilePromotion:
         return f'turnstile_remove_turnstile_promotion({hex(self.dst_turnstile)}, {hex(self.src_turnstile)})'
 
 
-@dataclass
+@slots_dataclass
 class TurnstileUpdateTurnstilePromotionLocked:
     ktraces: List
     dst_turnstile: int
@@ -89,7 +94,7 @@ class TurnstileUpdateTurnstilePromotionLocked:
                 f'src_turnstile_link_priority: {self.src_turnstile_link_priority}')
 
 
-@dataclass
+@slots_dataclass
 class AddedFromThreadHeap:
     ktraces: List
     tid: int
@@ -100,7 +105,7 @@ class AddedFromThreadHeap:
         return f'thread_add_turnstile_promotion({self.tid}, {hex(self.turnstile)}), priority: {self.priority}'
 
 
-@dataclass
+@slots_dataclass
 class RemovedFromThreadHeap:
     ktraces: List
     tid: int
@@ -110,7 +115,7 @@ class RemovedFromThreadHeap:
         return f'thread_remove_turnstile_promotion({self.tid}, {hex(self.turnstile)})'
 
 
-@dataclass
+@slots_dataclass
 class ThreadUpdateTurnstilePromotionLocked:
     ktraces: List
     tid: int
@@ -123,7 +128,7 @@ class ThreadUpdateTurnstilePromotionLocked:
                 f' old_priority: {self.turnstile_ts_priority}, new_priority: {self.turnstile_link_priority}')
 
 
-@dataclass
+@slots_dataclass
 class ThreadNotWaitingOnTurnstile:
     ktraces: List
     tid: int
@@ -135,7 +140,7 @@ class ThreadNotWaitingOnTurnstile:
                 f' thread_hop: {self.thread_hop}')
 
 
-@dataclass
+@slots_dataclass
 class TurnstileRecomputePriorityLocked:
     ktraces: List
     turnstile: int
@@ -147,7 +152,7 @@ class TurnstileRecomputePriorityLocked:
                 f' old_priority: {self.old_priority}')
 
 
-@dataclass
+@slots_dataclass
 class ThreadRecomputeUserPromotionLocked:
     ktraces: List
     tid: int
@@ -159,7 +164,7 @@ class ThreadRecomputeUserPromotionLocked:
                 f' old_priority: {self.thread_user_promotion_basepri}')
 
 
-@dataclass
+@slots_dataclass
 class TurnstilePrepare:
     ktraces: List
     turnstile: int
@@ -171,7 +176,7 @@ class TurnstilePrepare:
                 f'type: {self.type_.name}')
 
 
-@dataclass
+@slots_dataclass
 class TurnstileComplete:
     ktraces: List
     turnstile: int
@@ -232,11 +237,11 @@ def handle_thread_user_promotion_change(parser, events):
 
 
 def handle_turnstile_turnstile_prepare(parser, events):
-    return TurnstilePrepare(events, *events[0].values[:2], TurnstileType(events[0].values[2]))
+    return TurnstilePrepare(events, *events[0].values[:2], to_turnstile_type(events[0].values[2]))
 
 
 def handle_turnstile_turnstile_complete(parser, events):
-    return TurnstileComplete(events, *events[0].values[:2], TurnstileType(events[0].values[2]))
+    return TurnstileComplete(events, *events[0].values[:2], to_turnstile_type(events[0].values[2]))
 
 
 handlers = {
@@ -0,0 +1,101 @@
+from bisect import bisect
+from collections import namedtuple
+from itertools import accumulate
+import json
+from typing import List, Optional
+
+ChunkInfo = namedtuple('ChunkInfo', ['offset', 'count', 'min_timestamp', 'max_timestamp'])
+
+INDEX_FORMAT_VERSION = 2
+
+
+class TraceIndex:
+    """
+    Location of every events chunk in a trace version 3, allowing random access to its kevents.
+    """
+
+    def __init__(self, size: int, threadmap_offset: int, additional_data_offset: int, chunks: List[ChunkInfo],
+                 mtime_ns: Optional[int] = None, header_digest: Optional[str] = None):
+        """
+        :param size: Size of the indexed trace.
+        :param threadmap_offset: Offset of the trace thread map.
+        :param additional_data_offset: Offset of the additional data blocks following the events chunks.
+        :param chunks: Location and timestamps range of each events chunk.
+        :param mtime_ns: Modification time of the indexed trace file, None if it isn't a file.
+        :param header_digest: Hash of the beginning of the indexed trace, its version and header included.
+        """
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.header_digest = header_digest
+        self.threadmap_offset = threadmap_offset
+        self.additional_data_offset = additional_data_offset
+        self.chunks = chunks
+        self._chunks_ends = list(accumulate(chunk.count for chunk in chunks))
+
+    @property
+    def events_count(self) -> int:
+        return self._chunks_ends[-1] if self._chunks_ends else 0
+
+    def locate(self, n: int):
+        """
+        Locate a kevent by its index in the trace.
+        :param n: Index of the kevent.
+        :return: Tuple of chunk index and kevent index inside the chunk.
+        """
+        if n < 0:
+            n += self.events_count
+        if not 0 <= n < self.events_count:
+            raise IndexError('kevent index out of range')
+        chunk_index = bisect(self._chunks_ends, n)
+        return chunk_index, n - (self._chunks_ends[chunk_index] - self.chunks[chunk_index].count)
+
+    def matches(self, size: int, mtime_ns: Optional[int], header_digest: str) -> bool:
+        """
+        Check whether the index is still up to date with its trace.
+        Traces rewritten to the same size, e.g. fixed size captures, are told apart by their time and header.
+        :param size: Current size of the trace.
+        :param mtime_ns: Current modification time of the trace file, None if it isn't a file.
+        :param header_digest: Hash of the current beginning of the trace.
+        :return: Whether the index describes the trace.
+        """
+        return self.size == size and self.mtime_ns == mtime_ns and self.header_digest == header_digest
+
+    def chunks_in_range(self, start: int, end: int) -> List[int]:
+        """
+        Get the chunks that might contain kevents in a timestamps range.
+        :param start: First timestamp of the range.
+        :param end: Last timestamp of the range.
+        :return: Indices of the matching chunks.
+        """
+        return [i for i, chunk in enumerate(self.chunks)
+                if chunk.count and chunk.min_timestamp <= end and chunk.max_timestamp >= start]
+
+    def save(self, path: str):
+        """
+        Save the index into a sidecar file.
+        :param path: Path of the sidecar file.
+        """
+        with open(path, 'w') as fd:
+            json.dump({
+                'version': INDEX_FORMAT_VERSION,
+                'size': self.size,
+                'mtime_ns': self.mtime_ns,
+                'header_digest': self.header_digest,
+                'threadmap_offset': self.threadmap_offset,
+                'additional_data_offset': self.additional_data_offset,
+                'chunks': [list(chunk) for chunk in self.chunks],
+            }, fd)
+
+    @classmethod
+    def load(cls, path: str) -> 'TraceIndex':
+        """
+        Load an index from a sidecar file.
+        :param path: Path of the sidecar file.
+        :return: Loaded index.
+        """
+        with open(path, 'r') as fd:
+            data = json.load(fd)
+        if data['version'] != INDEX_FORMAT_VERSION:
+            raise ValueError(f'Unsupported index version {data["version"]}')
+        return cls(data['size'], data['threadmap_offset'], data['additional_data_offset'],
+                   [ChunkInfo(*chunk) for chunk in data['chunks']], data['mtime_ns'], data['header_digest'])
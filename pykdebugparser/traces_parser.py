@@ -1,81 +1,503 @@
-from collections import namedtuple
+from collections import namedtuple, deque, OrderedDict
+import enum
+from functools import partial
+from typing import List, Optional
 
-from pykdebugparser.kevent import DgbFuncQual
-from pykdebugparser.trace_handlers.bsd import handlers as bsd_handlers
-from pykdebugparser.trace_handlers.dyld import handlers as dyld_handlers
-from pykdebugparser.trace_handlers.fsystem import handlers as fsystem_handlers
-from pykdebugparser.trace_handlers.mach import handlers as mach_handlers
-from pykdebugparser.trace_handlers.perf import handlers as perf_handlers
-from pykdebugparser.trace_handlers.trace import handlers as trace_handlers
-from pykdebugparser.trace_handlers.turnstile import handlers as turnstile_handlers
+from pykdebugparser import fd_table
+from pykdebugparser.kevent import DgbFuncQual, KeventStore, KeventsRef
+from pykdebugparser.slots_dataclass import slots_dataclass
+from pykdebugparser.trace_codes import TraceCodes
+from pykdebugparser.trace_handlers import FAMILIES_CLASSES, load_handlers
+
+DBG_FUNC_START = DgbFuncQual.DBG_FUNC_START.value
+DBG_FUNC_END = DgbFuncQual.DBG_FUNC_END.value
+# Minimal log length before its events preceding all open starts are dropped.
+THREAD_EVENTS_COMPACT_SIZE = 0x400
+# Number of kevents packed into a store before the next one is started, once no open event refers to it.
+# Stores are freed along with the last trace referring to them.
+KEVENT_STORE_SIZE = 0x400
+# Number of vnode paths remembered from the VFS lookups.
+VNODE_PATHS_CACHE_SIZE = 0x10000
+# Handlers with side effects on the parser, or reading its state, always run as their events arrive.
+EAGER_FAMILIES = frozenset(('dyld', 'perf', 'trace'))
+# Events keeping the threads map up to date, by handlers family.
+BOOKKEEPING_EVENTS = {
+    'perf': frozenset(('PERF_THD_Data',)),
+    'trace': frozenset(('TRACE_DATA_NEWTHREAD', 'TRACE_DATA_EXEC', 'TRACE_DATA_THREAD_TERMINATE_PID',
+                        'TRACE_STRING_NEWTHREAD', 'TRACE_STRING_EXEC')),
+}
 
 Vnode = namedtuple('Vnode', ['ktraces', 'vnode_id', 'path'])
 
 
+class EvictionReason(enum.Enum):
+    """
+    Reason of dropping an open event before its end.
+    """
+    AGE = 'age'
+    COUNT = 'count'
+    THREAD_TERMINATE = 'thread terminate'
+
+
+class KtracesRetention(enum.Enum):
+    """
+    Kevents kept in the `ktraces` of the parsed traces.
+    """
+    FULL = 'full'
+    # Only the start and end kevents, or the single kevent.
+    BOUNDARIES = 'boundaries-only'
+    NONE = 'none'
+    # A range of a KeventStore, decoded again when accessed.
+    INDICES = 'indices'
+
+
+@slots_dataclass
+class PartialTrace:
+    ktraces: List
+    name: str
+    reason: EvictionReason
+
+    def __str__(self):
+        return f'{self.name} (partial, evicted by {self.reason.value})'
+
+
+class LazyTrace:
+    """
+    Matched events whose handler runs only once the parsed trace is needed.
+    Attributes of the parsed trace are available on the lazy trace itself.
+    The handler might ignore the events, the lazy trace then resolves to None.
+    """
+    __slots__ = ('ktraces', '_handler', '_parser', '_trace', '_resolved')
+
+    def __init__(self, handler, parser, events):
+        self.ktraces = events
+        self._handler = handler
+        self._parser = parser
+        self._trace = None
+        self._resolved = False
+
+    @property
+    def eventid(self) -> int:
+        return self.ktraces[0].eventid
+
+    @property
+    def tid(self) -> int:
+        return self.ktraces[0].tid
+
+    @property
+    def start_timestamp(self) -> int:
+        return self.ktraces[0].timestamp
+
+    @property
+    def end_timestamp(self) -> int:
+        return self.ktraces[-1].timestamp
+
+    @property
+    def duration(self) -> int:
+        return self.end_timestamp - self.start_timestamp
+
+    def resolve(self):
+        """
+        Run the handler, once.
+        :return: Parsed trace, None if the handler ignored the events.
+        """
+        if not self._resolved:
+            self._trace = self._handler(self._parser, self.ktraces)
+            self._resolved = True
+            self._parser = None
+        return self._trace
+
+    def __getattr__(self, item):
+        if item.startswith('_'):
+            raise AttributeError(item)
+        return getattr(self.resolve(), item)
+
+    def __str__(self):
+        return str(self.resolve())
+
+
+class ThreadEvents:
+    """
+    Append-only log of a thread's events, shared by all of its open events.
+    Open events keep only the offset of their start, and get their events as a slice of the log once they end.
+    """
+    __slots__ = ('events', 'starts', '_compact_size')
+
+    def __init__(self):
+        self.events = []
+        self.starts = {}
+        self._compact_size = THREAD_EVENTS_COMPACT_SIZE
+
+    def start(self, event):
+        self.starts[event.eventid] = len(self.events)
+        self.append(event)
+
+    def append(self, event):
+        self.events.append(event)
+        if len(self.events) >= self._compact_size:
+            self._compact()
+
+    def end(self, event) -> list:
+        """
+        Close an open event.
+        :param event: End event.
+        :return: Events from the start to the end.
+        """
+        self.events.append(event)
+        return self.close(event.eventid)
+
+    def close(self, eventid: int) -> list:
+        """
+        Close an open event, with or without its end.
+        :param eventid: Event ID of the open event.
+        :return: Events from the start so far.
+        """
+        events = self.events[self.starts.pop(eventid):]
+        if not self.starts:
+            self.events = []
+            self._compact_size = THREAD_EVENTS_COMPACT_SIZE
+        return events
+
+    def _compact(self):
+        first = min(self.starts.values())
+        if first:
+            del self.events[:first]
+            for eventid, offset in self.starts.items():
+                self.starts[eventid] = offset - first
+        # Amortize the compactions over the log growth.
+        self._compact_size = max(len(self.events) * 2, THREAD_EVENTS_COMPACT_SIZE)
+
+
+class IndexedThreadEvents(ThreadEvents):
+    """
+    Thread's events log that also packs every event into a store.
+    Closed events are referred to by their range in the store, which outlives the log's compactions.
+    """
+    __slots__ = ('store', 'store_starts', 'ended')
+
+    def __init__(self):
+        super().__init__()
+        self.store = KeventStore()
+        self.store_starts = {}
+        # Store range of the last closed event.
+        self.ended = None
+
+    def start(self, event):
+        self.store_starts[event.eventid] = len(self.store)
+        super().start(event)
+
+    def append(self, event):
+        self.store.append(event)
+        super().append(event)
+
+    def end(self, event) -> list:
+        self.store.append(event)
+        return super().end(event)
+
+    def close(self, eventid: int) -> list:
+        self.ended = KeventsRef(self.store, self.store_starts.pop(eventid), len(self.store))
+        if not self.store_starts and len(self.store) >= KEVENT_STORE_SIZE:
+            self.store = KeventStore()
+        return super().close(eventid)
+
+
 class TracesParser:
-    def __init__(self, trace_codes_map, threads_pids, pids_names):
+    def __init__(self, trace_codes_map, threads_pids, pids_names, max_open_age=None, max_open_per_tid=None,
+                 evict_on_terminate=False, emit_partial=False, lazy=False, process_filter=None, families=None,
+                 track_fds=False, retention=KtracesRetention.FULL):
+        """
+        :param trace_codes_map: Mapping between code and event name.
+        :param threads_pids: Mapping between thread ID and process ID.
+        :param pids_names: Mapping between process ID and process name.
+        :param max_open_age: Trace time after which an event without an end is evicted. None to keep it.
+        :param max_open_per_tid: Number of open events kept for each thread, the oldest are evicted. None for all.
+        :param evict_on_terminate: Whether to evict the open events of terminated threads.
+        :param emit_partial: Whether to emit evicted events as PartialTrace objects.
+        :param lazy: Whether to emit LazyTrace objects, running the handlers only when the traces are used.
+                     Unlike parsed traces, lazy traces are emitted before knowing whether their handler ignores the
+                     events, in which case they resolve to None.
+        :param process_filter: Process ID / name whose events are parsed. None for all. Events of other processes
+                               that keep the threads map up to date are still parsed.
+        :param families: Names of the handlers families to use. None for all, each loaded once its events show up.
+                         The bookkeeping events of the families left out still update the threads map, without
+                         emitting their traces.
+        :param track_fds: Whether to keep a file descriptors table of each process, setting the descriptor's path on
+                          the I/O traces.
+        :param retention: Kevents kept in the `ktraces` of the parsed and partial traces, a KtracesRetention or its
+                          value. Handlers always get all the kevents. Lazy traces need them to run their handlers later, so
+                          they can only keep them all.
+        """
         self.trace_codes = trace_codes_map
+        self.trace_codes_index = (trace_codes_map if isinstance(trace_codes_map, TraceCodes)
+                                  else TraceCodes(trace_codes_map))
+        self.vfs_lookup_eventids = frozenset(self.trace_codes_index.by_name.get('VFS_LOOKUP', ()))
+        self.vnode_paths = OrderedDict()
+        self._events_groups = {}
         self.on_going_events = {}
         self.on_going_traces = {}
         self.global_strings = {}
         self.threads_pids = threads_pids
         self.pids_names = pids_names
         self.tids_names = {}
-        self.qualifiers_actions = {
-            DgbFuncQual.DBG_FUNC_START.value: self._feed_start_event,
-            DgbFuncQual.DBG_FUNC_END.value: self._feed_end_event,
-            DgbFuncQual.DBG_FUNC_ALL.value: self._feed_single_event,
-            DgbFuncQual.DBG_FUNC_NONE.value: self._feed_single_event,
-        }
         self.last_data_newthread = None
         self.last_data_exec = None
         self.handlers = {}
-        self.handlers.update(bsd_handlers)
-        self.handlers.update(dyld_handlers)
-        self.handlers.update(fsystem_handlers)
-        self.handlers.update(mach_handlers)
-        self.handlers.update(perf_handlers)
-        self.handlers.update(trace_handlers)
-        self.handlers.update(turnstile_handlers)
+        # Events without a handler are only collected into the open events, their own starts are kept aside.
+        self.on_going_unhandled = {}
+        self.max_open_age = max_open_age
+        self.max_open_per_tid = max_open_per_tid
+        self.evict_on_terminate = evict_on_terminate
+        self.emit_partial = emit_partial
+        self.lazy = lazy
+        self.fd_table = fd_table.FdTable() if track_fds else None
+        self.retention = KtracesRetention(retention)
+        if lazy and self.retention != KtracesRetention.FULL:
+            raise ValueError('Lazy traces keep all their kevents')
+        self._thread_events = IndexedThreadEvents if self.retention == KtracesRetention.INDICES else ThreadEvents
+        # Store of the single events outside of any open event, in indices retention.
+        self._single_events_store = KeventStore()
+        # Traces keep all their kevents unless asked otherwise, without any cost on the default path.
+        feed_end_event = self._feed_end_event
+        feed_single_event = self._feed_single_event
+        if self.retention != KtracesRetention.FULL:
+            feed_end_event = self._feed_end_event_retained
+            feed_single_event = self._feed_single_event_retained
+        self.qualifiers_actions = {
+            DgbFuncQual.DBG_FUNC_START.value: self._feed_start_event,
+            DgbFuncQual.DBG_FUNC_END.value: feed_end_event,
+            DgbFuncQual.DBG_FUNC_ALL.value: feed_single_event,
+            DgbFuncQual.DBG_FUNC_NONE.value: feed_single_event,
+        }
+        self.evicted = deque()
+        self.evictions = {reason: 0 for reason in EvictionReason}
+        self.open_events = 0
+        self.peak_open_events = 0
+        self._next_age_check = 0 if max_open_age is not None else float('inf')
+        self.process_filter = process_filter
+        self._allowed_tids = {}
+        self.handlers_table = {}
+        self.dispatch_table = {}
+        self.bookkeeping_eventids = set()
+        self.families = set()
+        # Debug classes of the enabled families that are not loaded yet.
+        self.pending_classes = {
+            FAMILIES_CLASSES[family]: family for family in (FAMILIES_CLASSES if families is None else families)
+        }
+        enabled_families = set(self.pending_classes.values())
+        if process_filter is not None:
+            # Bookkeeping events must be recognized before their family shows up.
+            for family in BOOKKEEPING_EVENTS.keys() & enabled_families:
+                self.enable_family(family)
+        for family in BOOKKEEPING_EVENTS.keys() - enabled_families:
+            self._enable_bookkeeping(family)
+
+    def enable_family(self, family: str):
+        """
+        Load a handlers family and dispatch its events.
+        Each handled eventid is mapped straight to its handler and the state it is collected in.
+        :param family: Family name, one of FAMILIES_CLASSES.
+        """
+        if family in self.families:
+            return
+        handlers = load_handlers(family)
+        self.families.add(family)
+        self.pending_classes.pop(FAMILIES_CLASSES[family], None)
+        self.handlers.update(handlers)
+        state = self.on_going_traces if family == 'trace' else self.on_going_events
+        bookkeeping_events = BOOKKEEPING_EVENTS.get(family, ())
+        for trace_name, handler in handlers.items():
+            feed_handler = handler
+            if self.evict_on_terminate and trace_name == 'TRACE_DATA_THREAD_TERMINATE':
+                feed_handler = self._terminate_handler(handler)
+            elif self.lazy and family not in EAGER_FAMILIES:
+                feed_handler = partial(LazyTrace, handler)
+            if self.fd_table is not None:
+                if trace_name in fd_table.updates:
+                    feed_handler = self._fd_update_handler(fd_table.updates[trace_name], feed_handler)
+                elif trace_name in fd_table.io_events:
+                    feed_handler = self._fd_path_handler(handler)
+            for eventid in self.trace_codes_index.by_name.get(trace_name, ()):
+                self.handlers_table[eventid] = handler
+                self.dispatch_table[eventid] = (feed_handler, state)
+                if trace_name in bookkeeping_events:
+                    self.bookkeeping_eventids.add(eventid)
+
+    def _enable_bookkeeping(self, family: str):
+        """
+        Dispatch the bookkeeping events of a family left out, dropping their traces.
+        Unhandled, they would be collected into the open events of the other families.
+        :param family: Family name, one of BOOKKEEPING_EVENTS.
+        """
+        handlers = load_handlers(family)
+        state = self.on_going_traces if family == 'trace' else self.on_going_events
+        for trace_name in BOOKKEEPING_EVENTS[family]:
+            feed_handler = self._bookkeeping_handler(handlers[trace_name])
+            for eventid in self.trace_codes_index.by_name.get(trace_name, ()):
+                self.dispatch_table[eventid] = (feed_handler, state)
+                self.bookkeeping_eventids.add(eventid)
+
+    def _enable_pending_family(self, eventid: int) -> bool:
+        family = self.pending_classes.get(eventid >> 24)
+        if family is None:
+            return False
+        self.enable_family(family)
+        return True
+
+    def _terminate_handler(self, handler):
+        def handle_thread_terminate(parser, events):
+            trace = handler(parser, events)
+            self.evict_thread(events[0].values[0], EvictionReason.THREAD_TERMINATE)
+            return trace
+        return handle_thread_terminate
+
+    def _bookkeeping_handler(self, handler):
+        def handle_bookkeeping(parser, events):
+            handler(parser, events)
+        return handle_bookkeeping
+
+    def _fd_update_handler(self, update, handler):
+        def handle_fd_update(parser, events):
+            pid = self.threads_pids.get(events[0].tid)
+            if pid is not None:
+                update(self.fd_table, pid, self, events)
+            return handler(parser, events)
+        return handle_fd_update
+
+    def _fd_path_handler(self, handler):
+        def handle_fd_io(parser, events):
+            # The path is resolved as the syscall ends, the descriptor might be reused by the time a lazy trace is.
+            path = self.fd_table.path(self.threads_pids.get(events[0].tid), events[0].values[0])
+            if self.lazy:
+                return LazyTrace(partial(fd_table.with_path, handler, path), parser, events)
+            return fd_table.with_path(handler, path, parser, events)
+        return handle_fd_io
 
     def feed(self, event):
-        if event.eventid in self.trace_codes:
-            trace_name = self.trace_codes[event.eventid]
-            if trace_name in trace_handlers:
-                return self.qualifiers_actions[event.func_qualifier](event, self.on_going_traces)
+        if event.timestamp >= self._next_age_check:
+            self.evict_old(event.timestamp)
+        if self.process_filter is not None:
+            if event.eventid in self.bookkeeping_eventids:
+                # The threads map might change, the allowed tids are resolved again.
+                self._allowed_tids.clear()
+            elif not self.is_tid_allowed(event.tid):
+                return None
+        dispatch = self.dispatch_table.get(event.eventid)
+        if dispatch is None:
+            family = self.pending_classes.get(event.eventid >> 24)
+            if family is None:
+                return self._feed_unhandled_event(event)
+            self.enable_family(family)
+            dispatch = self.dispatch_table.get(event.eventid)
+            if dispatch is None:
+                return self._feed_unhandled_event(event)
+        handler, state = dispatch
+        return self.qualifiers_actions[event.func_qualifier](event, handler, state)
 
-        return self.qualifiers_actions[event.func_qualifier](event, self.on_going_events)
+    def is_tid_allowed(self, tid: int) -> bool:
+        """
+        Check whether a thread belongs to the filtered process, according to the current threads map.
+        :param tid: Thread ID.
+        :return: Whether the thread's events are parsed.
+        """
+        allowed = self._allowed_tids.get(tid)
+        if allowed is None:
+            pid = self.threads_pids.get(tid, -1)
+            allowed = self.process_filter in (str(pid), self.pids_names.get(pid, ''))
+            self._allowed_tids[tid] = allowed
+        return allowed
 
     def feed_generator(self, generator):
         for event in generator:
             ret = self.feed(event)
             if ret is not None:
                 yield ret
+            while self.evicted:
+                yield self.evicted.popleft()
+
+    def evict_old(self, timestamp: int):
+        """
+        Evict the open events that started more than max_open_age before a given trace time.
+        :param timestamp: Current trace time.
+        """
+        deadline = timestamp - self.max_open_age
+        for state in (self.on_going_events, self.on_going_traces):
+            for tid, thread in list(state.items()):
+                for eventid, offset in list(thread.starts.items()):
+                    if thread.events[offset].timestamp < deadline:
+                        self._evict(thread, eventid, EvictionReason.AGE)
+                if not thread.starts:
+                    del state[tid]
+        # Scanning all the open events on every event would be too slow.
+        self._next_age_check = timestamp + max(self.max_open_age // 4, 1)
+
+    def evict_thread(self, tid: int, reason: EvictionReason):
+        """
+        Evict all the open events of a thread.
+        :param tid: Thread ID.
+        :param reason: Eviction reason.
+        """
+        for state in (self.on_going_events, self.on_going_traces):
+            thread = state.pop(tid, None)
+            if thread is not None:
+                for eventid in sorted(thread.starts, key=thread.starts.get):
+                    self._evict(thread, eventid, reason)
+        self.on_going_unhandled.pop(tid, None)
+
+    def _evict(self, thread, eventid, reason):
+        events = thread.close(eventid)
+        self.open_events -= 1
+        self.evictions[reason] += 1
+        if self.emit_partial:
+            if self.retention != KtracesRetention.FULL:
+                events = self._retained_ktraces(thread, events)
+            self.evicted.append(PartialTrace(events, self.trace_codes.get(eventid, hex(eventid)), reason))
 
     def parse_event_list(self, events):
-        if events[0].eventid not in self.trace_codes:
-            return None
-        trace_name = self.trace_codes[events[0].eventid]
-        if trace_name not in self.handlers:
-            return None
-        return self.handlers[trace_name](self, events)
+        handler = self.handlers_table.get(events[0].eventid)
+        if handler is None:
+            if not self._enable_pending_family(events[0].eventid):
+                return None
+            handler = self.handlers_table.get(events[0].eventid)
+            if handler is None:
+                return None
+        return handler(self, events)
+
+    def group_events(self, events, names) -> dict:
+        """
+        Collect the sub events of a trace by name, in a single pass.
+        :param events: Events of the trace.
+        :param names: Tuple of event names to collect.
+        :return: Mapping between each name and its events, in order.
+        """
+        names_by_eventid = self._events_groups.get(names)
+        if names_by_eventid is None:
+            names_by_eventid = self._events_groups[names] = {
+                eventid: name for name in names for eventid in self.trace_codes_index.by_name.get(name, ())
+            }
+        groups = {name: [] for name in names}
+        for event in events:
+            name = names_by_eventid.get(event.eventid)
+            if name is not None:
+                groups[name].append(event)
+        return groups
 
     @staticmethod
     def vnode_generator(events):
-        path = b''
+        path = bytearray()
         vnodeid = 0
         lookup_events = []
         for event in events:
             lookup_events.append(event)
-            if event.func_qualifier & DgbFuncQual.DBG_FUNC_START.value:
+            func_qualifier = event.func_qualifier
+            if func_qualifier & DBG_FUNC_START:
                 vnodeid = event.values[0]
                 path += event.data[8:]
             else:
                 path += event.data
 
-            if event.func_qualifier & DgbFuncQual.DBG_FUNC_END.value:
+            if func_qualifier & DBG_FUNC_END:
                 yield Vnode(lookup_events, vnodeid, path.replace(b'\x00', b'').decode())
-                path = b''
+                path = bytearray()
                 vnodeid = 0
                 lookup_events = []
 
@@ -86,29 +508,107 @@ class TracesParser:
             return Vnode([], 0, '')
 
     def parse_vnodes(self, events):
-        return list(self.vnode_generator([e for e in events if self.trace_codes.get(e.eventid) == 'VFS_LOOKUP']))
+        vfs_lookup_eventids = self.vfs_lookup_eventids
+        vnodes = list(self.vnode_generator([e for e in events if e.eventid in vfs_lookup_eventids]))
+        vnode_paths = self.vnode_paths
+        for vnode in vnodes:
+            vnode_paths[vnode.vnode_id] = vnode.path
+            vnode_paths.move_to_end(vnode.vnode_id)
+        while len(vnode_paths) > VNODE_PATHS_CACHE_SIZE:
+            vnode_paths.popitem(last=False)
+        return vnodes
 
-    def _feed_start_event(self, event, state):
-        if event.tid not in state:
+    def vnode_path(self, vnode_id: int) -> Optional[str]:
+        """
+        Get the path of a vnode from the previous VFS lookups.
+        Only the lookups already parsed are known, with lazy traces those of the traces used so far.
+        :param vnode_id: Vnode ID.
+        :return: Last looked up path of the vnode, None if it was not looked up recently.
+        """
+        path = self.vnode_paths.get(vnode_id)
+        if path is not None:
+            self.vnode_paths.move_to_end(vnode_id)
+        return path
+
+    def _feed_start_event(self, event, handler, state):
+        thread = state.get(event.tid)
+        if thread is None:
             # New tid
-            state[event.tid] = {}
+            thread = state[event.tid] = self._thread_events()
+        if event.eventid not in thread.starts:
+            self.open_events += 1
+            if self.open_events > self.peak_open_events:
+                self.peak_open_events = self.open_events
+        thread.start(event)
+        if self.max_open_per_tid is not None and len(thread.starts) > self.max_open_per_tid:
+            self._evict(thread, min(thread.starts, key=thread.starts.get), EvictionReason.COUNT)
 
-        state[event.tid][event.eventid] = []
-        for eventid in state[event.tid]:
-            state[event.tid][eventid].append(event)
+    def _feed_end_event(self, event, handler, state):
+        thread = state.get(event.tid)
+        if thread is None or event.eventid not in thread.starts:
+            # Event end without start.
+            return
+        self.open_events -= 1
+        return handler(self, thread.end(event))
+
+    def _feed_single_event(self, event, handler, state):
+        thread = state.get(event.tid)
+        if thread is not None and thread.starts:
+            thread.append(event)
+        return handler(self, [event])
 
-    def _feed_end_event(self, event, state):
-        if event.tid not in state or event.eventid not in state[event.tid]:
+    def _feed_end_event_retained(self, event, handler, state):
+        thread = state.get(event.tid)
+        if thread is None or event.eventid not in thread.starts:
             # Event end without start.
             return
+        self.open_events -= 1
+        events = thread.end(event)
+        trace = handler(self, events)
+        if trace is not None:
+            trace.ktraces = self._retained_ktraces(thread, events)
+        return trace
 
-        for eventid in state[event.tid]:
-            state[event.tid][eventid].append(event)
+    def _feed_single_event_retained(self, event, handler, state):
+        thread = state.get(event.tid)
+        if thread is not None and thread.starts:
+            thread.append(event)
+        if self.retention == KtracesRetention.INDICES:
+            if thread is not None and thread.starts:
+                store = thread.store
+            else:
+                store = self._single_events_store
+                if len(store) >= KEVENT_STORE_SIZE:
+                    store = self._single_events_store = KeventStore()
+                store.append(event)
+            ktraces = KeventsRef(store, len(store) - 1, len(store))
+        else:
+            ktraces = [event] if self.retention == KtracesRetention.BOUNDARIES else []
+        trace = handler(self, [event])
+        if trace is not None:
+            trace.ktraces = ktraces
+        return trace
 
-        events = state[event.tid].pop(event.eventid)
-        return self.parse_event_list(events)
+    def _retained_ktraces(self, thread, events):
+        # Kevents of a closed event, according to the retention.
+        if self.retention == KtracesRetention.INDICES:
+            return thread.ended
+        if self.retention == KtracesRetention.BOUNDARIES:
+            # Evicted events might not have more than their start.
+            return [events[0], events[-1]] if len(events) > 1 else events
+        return []
 
-    def _feed_single_event(self, event, state):
-        for eventid in state.get(event.tid, {}):
-            state[event.tid][eventid].append(event)
-        return self.parse_event_list([event])
+    def _feed_unhandled_event(self, event):
+        # Nothing is parsed, the event only has to be collected into the open events of its thread.
+        func_qualifier = event.func_qualifier
+        if func_qualifier == DBG_FUNC_START:
+            self.on_going_unhandled.setdefault(event.tid, set()).add(event.eventid)
+        elif func_qualifier == DBG_FUNC_END:
+            starts = self.on_going_unhandled.get(event.tid)
+            if not starts or event.eventid not in starts:
+                # Event end without start.
+                return
+            starts.remove(event.eventid)
+        thread = self.on_going_events.get(event.tid)
+        if thread is not None and thread.starts:
+            thread.append(event)
@@ -0,0 +1,78 @@
+from contextlib import contextmanager
+import os
+import plistlib
+import threading
+
+from construct import Aligned, Int32ul, Int64ul, Prefixed, GreedyBytes
+
+from pykdebugparser.kd_buf_parser import kd_header_v3, kd_threadmap, RAW_VERSION2_BYTES, RAW_VERSION3_BYTES, \
+    TRACEV3_STACKSHOT_END, TRACEV3_THREADMAP_TAG, TRACEV3_EVENTS_TAG, TRACEV3_MORE_EVENTS
+
+
+def build_threadmap(threadmap) -> bytes:
+    return b''.join(kd_threadmap.build({'tid': tid, 'pid': pid, 'process': name}) for tid, pid, name in threadmap)
+
+
+def build_trace_v2(events, threadmap=()):
+    """
+    Build a minimal trace version 2.
+    :param events: Raw kd_buf events, their timestamps must not be zero.
+    :param threadmap: List of (tid, pid, process name) tuples.
+    :return: Built trace.
+    """
+    return (RAW_VERSION2_BYTES + Int32ul.build(len(threadmap)) + b'\x00' * 0x118 + build_threadmap(threadmap) +
+            b'\x00' * 0x40 + events)
+
+
+def build_trace_v3(chunks, threadmap=(), blocks=(), stackshot=b''):
+    """
+    Build a minimal trace version 3.
+    :param chunks: List of raw kd_buf chunks.
+    :param threadmap: List of (tid, pid, process name) tuples.
+    :param blocks: List of (tag, data) additional data blocks, plist blocks can be given as dicts.
+    :param stackshot: Stackshot data preceding the threadmap.
+    :return: Built trace.
+    """
+    trace = RAW_VERSION3_BYTES + Aligned(8, kd_header_v3).build({
+        'tag': 0, 'sub_tag': 0, 'length': 0, 'timebase_numer': 125, 'timebase_denom': 3, 'timestamp': 0,
+        'walltime_secs': 0, 'walltime_usecs': 0, 'timezone_minuteswest': 0, 'timezone_dst': 0, 'flags': 0,
+        'tag2': 0, 'cpu_info': {},
+    }) + b'\x00' * 4
+    trace += stackshot + TRACEV3_STACKSHOT_END + b'\x00' * 8
+    threads = build_threadmap(threadmap)
+    trace += TRACEV3_THREADMAP_TAG + Int64ul.build(len(threads)) + threads
+    for i, chunk in enumerate(chunks):
+        if i:
+            trace += TRACEV3_MORE_EVENTS + Int64ul.build(0)
+        trace += TRACEV3_EVENTS_TAG + Int64ul.build(len(chunk)) + b'\x00' * 8 + chunk
+    for tag, data in blocks:
+        if isinstance(data, dict):
+            data = plistlib.dumps(data)
+        trace += tag + Aligned(8, Prefixed(Int64ul, GreedyBytes)).build(data)
+    return trace
+
+
+@contextmanager
+def pipe_reader(data: bytes):
+    """
+    Open a pipe fed with data by a thread, so the reader can read more than the pipe's buffer.
+    :param data: Data written to the pipe.
+    :return: Read end of the pipe.
+    """
+    read_fd, write_fd = os.pipe()
+
+    def write():
+        try:
+            with os.fdopen(write_fd, 'wb') as f:
+                f.write(data)
+        except BrokenPipeError:
+            # The reader stopped early.
+            pass
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        with os.fdopen(read_fd, 'rb') as f:
+            yield f
+    finally:
+        writer.join()
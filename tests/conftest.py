@@ -1,6 +1,8 @@
 import pytest
 
+from builders import build_trace_v2
 from pykdebugparser.callstacks_parser import CallstacksParser
+from pykdebugparser.kevent import kd_buf_struct
 from pykdebugparser.trace_codes import default_trace_codes
 from pykdebugparser.traces_parser import TracesParser
 
@@ -13,3 +15,13 @@ def traces_parser():
 @pytest.fixture(scope='function')
 def callstacks_parser():
     return CallstacksParser([], [])
+
+
+@pytest.fixture(scope='session')
+def trace_v2():
+    # Two threads of different processes, each reading once.
+    bsc_read = 0x40c000c
+    events = [(1, bsc_read | 1), (2, bsc_read | 1), (1, bsc_read | 2), (2, bsc_read | 2)]
+    return build_trace_v2(b''.join(kd_buf_struct.pack(i, b'\x00' * 32, tid, debugid, 0, 0)
+                                   for i, (tid, debugid) in enumerate(events, 1)),
+                          [(1, 10, 'launchd'), (2, 20, 'app')])
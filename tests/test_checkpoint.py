@@ -0,0 +1,88 @@
+from itertools import islice
+
+import pytest
+
+from builders import build_trace_v3
+from pykdebugparser.checkpoint import Checkpoint
+from pykdebugparser.kd_buf_parser import KdBufParser, TRACEV3_PROCESSES, RAW_VERSION2_BYTES
+from pykdebugparser import kevent
+from pykdebugparser.kevent import kd_buf_struct, KeventFilter
+from pykdebugparser.trace_codes import default_trace_codes
+from pykdebugparser.traces_parser import TracesParser
+
+BSC_READ = 0x40c000c
+UNHANDLED = 0x1234560
+
+
+def kd_buf(timestamp, debugid, tid=1):
+    return kd_buf_struct.pack(timestamp, b'\x00' * 32, tid, debugid, 0, 0)
+
+
+def traces_of(kd_buf_parser, traces_parser, reader):
+    return [t.ktraces for t in traces_parser.feed_generator(kd_buf_parser.parse_resumable(reader))]
+
+
+def test_resume_growing_trace(tmp_path):
+    chunks = [
+        kd_buf(0, BSC_READ | 1) + kd_buf(1, UNHANDLED) + kd_buf(2, BSC_READ | 1, tid=2),
+        kd_buf(3, UNHANDLED) + kd_buf(4, BSC_READ | 2) + kd_buf(5, BSC_READ | 2, tid=2),
+    ]
+    path = tmp_path / 'trace.ktrace'
+    path.write_bytes(build_trace_v3(chunks[:1], [(1, 2, 'launchd')]))
+    kd_buf_parser = KdBufParser()
+    traces_parser = TracesParser(default_trace_codes(), kd_buf_parser.threads_pids, kd_buf_parser.pids_names)
+    with open(path, 'rb') as reader:
+        assert traces_of(kd_buf_parser, traces_parser, reader) == []
+    Checkpoint.capture(kd_buf_parser, traces_parser).save(tmp_path / 'checkpoint')
+
+    trace = build_trace_v3(chunks, [(1, 2, 'launchd')], [(TRACEV3_PROCESSES, {'Processes': []})])
+    path.write_bytes(trace)
+    kd_buf_parser = KdBufParser()
+    traces_parser = TracesParser(default_trace_codes(), kd_buf_parser.threads_pids, kd_buf_parser.pids_names)
+    Checkpoint.load(tmp_path / 'checkpoint').restore(kd_buf_parser, traces_parser)
+    assert kd_buf_parser.threads_pids == {1: 2}
+    with open(path, 'rb') as reader:
+        resumed = traces_of(kd_buf_parser, traces_parser, reader)
+    assert kd_buf_parser.completed
+    assert kd_buf_parser.processes == {'Processes': []}
+
+    full_kd_buf_parser = KdBufParser()
+    full_traces_parser = TracesParser(default_trace_codes(), {}, {})
+    with open(path, 'rb') as reader:
+        assert resumed == traces_of(full_kd_buf_parser, full_traces_parser, reader)
+    assert [[e.timestamp for e in t] for t in resumed] == [[0, 1, 3, 4], [2, 5]]
+
+
+def test_resume_mid_chunk(tmp_path):
+    trace = RAW_VERSION2_BYTES + b'\x00' * 0x11c + b''.join(kd_buf(i, BSC_READ | (2 - i % 2)) for i in range(1, 11))
+    path = tmp_path / 'trace.ktrace'
+    path.write_bytes(trace)
+    kd_buf_parser = KdBufParser()
+    traces_parser = TracesParser(default_trace_codes(), {}, {})
+    with open(path, 'rb') as reader:
+        first = list(traces_parser.feed_generator(islice(kd_buf_parser.parse_resumable(reader), 3)))
+    checkpoint = Checkpoint.capture(kd_buf_parser, traces_parser)
+    kd_buf_parser = KdBufParser()
+    traces_parser = TracesParser(default_trace_codes(), {}, {})
+    checkpoint.restore(kd_buf_parser, traces_parser)
+    with open(path, 'rb') as reader:
+        rest = list(traces_parser.feed_generator(kd_buf_parser.parse_resumable(reader)))
+    assert [[e.timestamp for e in t.ktraces] for t in first + rest] == [[1, 2], [3, 4], [5, 6], [7, 8], [9, 10]]
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_resume_filtered(tmp_path, monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(kevent, 'numpy_module', lambda: None)
+    trace = RAW_VERSION2_BYTES + b'\x00' * 0x11c + b''.join(kd_buf(i, UNHANDLED, tid=i % 3) for i in range(1, 13))
+    path = tmp_path / 'trace.ktrace'
+    path.write_bytes(trace)
+    kd_buf_parser = KdBufParser(event_filter=KeventFilter(tid=1))
+    with open(path, 'rb') as reader:
+        first = [e.timestamp for e in islice(kd_buf_parser.parse_resumable(reader), 2)]
+        assert kd_buf_parser.offset == len(trace) - 8 * 64
+        rest = [e.timestamp for e in kd_buf_parser.parse_resumable(reader)]
+    assert first + rest == [1, 4, 7, 10]
+    assert kd_buf_parser.offset == len(trace)
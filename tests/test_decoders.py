@@ -0,0 +1,49 @@
+from enum import Enum
+
+import pytest
+
+from pykdebugparser import decoders
+from pykdebugparser.decoders import enum_decoder, flags_decoder
+
+
+class Color(Enum):
+    RED = 0x1
+    GREEN = 0x2
+    BLUE = 0x4
+
+
+@flags_decoder
+def to_colors(flags: int):
+    return [c for c in Color if c.value & flags]
+
+
+to_color = enum_decoder(Color)
+
+
+def test_flags_decoder():
+    assert to_colors(0x5) == [Color.RED, Color.BLUE]
+    colors = to_colors(0x5)
+    colors.append(Color.GREEN)
+    assert to_colors(0x5) == [Color.RED, Color.BLUE]
+    assert to_colors(0) == []
+    assert to_colors.__name__ == 'to_colors'
+
+
+def test_flags_decoder_cache_size(monkeypatch):
+    monkeypatch.setattr(decoders, 'DECODER_CACHE_SIZE', 2)
+    calls = []
+
+    @flags_decoder
+    def decode(flags):
+        calls.append(flags)
+        return [flags]
+
+    for flags in (1, 2, 3, 1, 3):
+        assert decode(flags) == [flags]
+    assert calls == [1, 2, 3, 3]
+
+
+def test_enum_decoder():
+    assert to_color(0x2) is Color.GREEN
+    with pytest.raises(ValueError):
+        to_color(0x3)
@@ -0,0 +1,151 @@
+import io
+from io import BytesIO
+
+import pytest
+
+from builders import build_trace_v3, pipe_reader
+from pykdebugparser import kd_buf_parser
+from pykdebugparser.kd_buf_parser import KdBufParser, seek_until, RAW_VERSION2_BYTES, TRACEV3_EVENTS_TAG, \
+    TRACEV3_THREADMAP_TAG, TRACEV3_PROCESSES, TRACEV3_IMAGES, TRACEV3_TRACE_CODES
+from pykdebugparser.kevent import from_kd_buf, KeventFilter
+from pykdebugparser.mmap_reader import MmapReader
+
+EVENTS_V2 = RAW_VERSION2_BYTES + b'\x00' * 0x11c + (
+    b'\xa50\x147_\x06\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+    b'\x00\x00\x00\x00\x00\x00\x00\x00\xc6\x01\x00\x00\x00\x00\x00\x00y\xd8\t\x00\x00\x00\x00'
+    b'\x00*\x03\x0c\x04\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+)
+
+
+class UnseekableReader(io.RawIOBase):
+    def __init__(self, data: bytes):
+        self._data = BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        return self._data.readinto(buffer)
+
+
+def unseekable(data: bytes, buffered=True):
+    reader = UnseekableReader(data)
+    return io.BufferedReader(reader) if buffered else reader
+
+
+def test_parse_arrays():
+    pytest.importorskip('numpy')
+    arrays = list(KdBufParser().parse_arrays(BytesIO(EVENTS_V2)))
+    assert len(arrays) == 1
+    assert list(arrays[0].tid) == [645241]
+    assert list(arrays[0]) == list(KdBufParser().parse(BytesIO(EVENTS_V2)))
+
+
+def test_parse_file(tmp_path):
+    path = tmp_path / 'trace.ktrace'
+    path.write_bytes(EVENTS_V2)
+    assert list(KdBufParser().parse_file(str(path))) == list(KdBufParser().parse(BytesIO(EVENTS_V2)))
+
+
+@pytest.mark.parametrize('window_size', [3, 8, 0x100000])
+def test_seek_until(monkeypatch, window_size):
+    monkeypatch.setattr(kd_buf_parser, 'SEEK_WINDOW_SIZE', window_size)
+    reader = BytesIO(b'\x01' * 21 + TRACEV3_EVENTS_TAG + b'\x02')
+    seek_until(reader, TRACEV3_EVENTS_TAG)
+    assert reader.read() == b'\x02'
+
+
+def test_seek_until_mapped(tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(b'\x01' * 21 + TRACEV3_EVENTS_TAG + b'\x02')
+    with MmapReader.open(str(path)) as reader:
+        seek_until(reader, TRACEV3_EVENTS_TAG)
+        assert reader.read() == b'\x02'
+
+
+@pytest.mark.parametrize('buffered', [True, False])
+@pytest.mark.parametrize('window_size', [3, 8, 0x100000])
+def test_seek_until_unseekable(monkeypatch, buffered, window_size):
+    monkeypatch.setattr(kd_buf_parser, 'SEEK_WINDOW_SIZE', window_size)
+    reader = unseekable(b'\x01' * 21 + TRACEV3_EVENTS_TAG + b'\x02', buffered)
+    seek_until(reader, TRACEV3_EVENTS_TAG)
+    assert reader.read() == b'\x02'
+
+
+@pytest.mark.parametrize('buffered', [True, False])
+def test_seek_until_not_found(buffered):
+    with pytest.raises(EOFError):
+        seek_until(BytesIO(b'\x01' * 21), TRACEV3_EVENTS_TAG)
+    with pytest.raises(EOFError):
+        seek_until(unseekable(b'\x01' * 21, buffered), TRACEV3_EVENTS_TAG)
+
+
+def test_parse_v3():
+    events = [bytes([i]) * 64 for i in range(3)]
+    trace = build_trace_v3([events[0] + events[1], events[2]], [(1, 2, 'launchd')],
+                           stackshot=TRACEV3_THREADMAP_TAG + b'\x00' * 0x1000)
+    parser = KdBufParser()
+    assert list(parser.parse(BytesIO(trace))) == [from_kd_buf(e) for e in events]
+    assert parser.threads_pids == {1: 2}
+    assert parser.pids_names == {2: 'launchd'}
+
+
+def test_parse_v3_unseekable():
+    trace = build_trace_v3([b'\x01' * 64, b'\x02' * 128], [(1, 2, 'launchd')], [
+        (TRACEV3_PROCESSES, {'Processes': [{'pid': 2}]}),
+        (TRACEV3_TRACE_CODES, b'0x40c0014\tBSC_open\n'),
+    ])
+    parser = KdBufParser()
+    assert list(parser.parse(unseekable(trace))) == list(KdBufParser().parse(BytesIO(trace)))
+    assert parser.threads_pids == {1: 2}
+    assert parser.processes == {'Processes': [{'pid': 2}]}
+    assert parser.trace_codes == '0x40c0014\tBSC_open\n'
+
+
+def test_parse_file_parallel(tmp_path):
+    chunks = [b''.join(bytes([i, j]) * 32 for j in range(3)) for i in range(5)]
+    trace = build_trace_v3(chunks, [(1, 2, 'launchd')], [(TRACEV3_PROCESSES, {'Processes': []})])
+    path = tmp_path / 'trace.ktrace'
+    path.write_bytes(trace)
+    serial = list(KdBufParser().parse(BytesIO(trace)))
+    parser = KdBufParser()
+    assert list(parser.parse_file(str(path), parallel=2)) == serial
+    # Chunks are walked over by their headers, without indexing their kevents first.
+    assert parser.index is None
+    assert parser.threads_pids == {1: 2}
+    event_filter = KeventFilter(tid=0x0201020102010201)
+    assert list(KdBufParser(event_filter=event_filter).parse_file(str(path), 2)) == list(filter(event_filter, serial))
+    parser = KdBufParser()
+    with open(path, 'rb') as f:
+        parser.build_index(f)
+    assert list(parser.parse_file(str(path), parallel=2)) == serial
+
+
+def test_read_metadata(monkeypatch):
+    trace = build_trace_v3([b'\x00' * 64, b'\x01' * 64], [(1, 2, 'launchd')], [
+        (TRACEV3_PROCESSES, {'Processes': [{'pid': 2}]}),
+        (TRACEV3_IMAGES, {'Images': []}),
+        (TRACEV3_TRACE_CODES, b'0x40c0014\tBSC_open\n'),
+    ])
+    monkeypatch.setattr(kd_buf_parser, 'iter_kd_bufs', None)
+    parser = KdBufParser()
+    parser.read_metadata(BytesIO(trace))
+    assert parser.processes == {'Processes': [{'pid': 2}]}
+    assert parser.images == {'Images': []}
+    assert parser.trace_codes == '0x40c0014\tBSC_open\n'
+    assert parser.threads_pids == {1: 2}
+    parser = KdBufParser()
+    parser.read_metadata(BytesIO(trace), {TRACEV3_IMAGES})
+    assert parser.images == {'Images': []}
+    assert parser.processes == {}
+
+
+def test_read_metadata_pipe():
+    # Chunks larger than the pipe's buffer, they must be read through.
+    chunks = [bytes([i]) * 64 * 0x800 for i in range(1, 4)]
+    trace = build_trace_v3(chunks, [(1, 2, 'launchd')], [(TRACEV3_PROCESSES, {'Processes': [{'pid': 2}]})])
+    parser = KdBufParser()
+    with pipe_reader(trace) as f:
+        parser.read_metadata(f, {TRACEV3_PROCESSES})
+    assert parser.processes == {'Processes': [{'pid': 2}]}
+    assert parser.threads_pids == {1: 2}
@@ -0,0 +1,97 @@
+from io import BytesIO
+
+import pytest
+
+from builders import build_trace_v3, pipe_reader
+from pykdebugparser.kd_buf_parser import KdBufParser, TRACEV3_THREADMAP_TAG, TRACEV3_PROCESSES, TRACEV3_TRACE_CODES
+from pykdebugparser.kd_buf_stream import KdBufStreamParser
+from pykdebugparser.kevent import KeventFilter
+from pykdebugparser.pykdebugparser import PyKdebugParser
+
+
+@pytest.mark.parametrize('piece_size', [1, 7, 64, 0x1000])
+def test_feed(trace_v2, piece_size):
+    parser = KdBufStreamParser()
+    events = []
+    for i in range(0, len(trace_v2), piece_size):
+        events += parser.feed(trace_v2[i:i + piece_size])
+    events += parser.close()
+    assert events == list(KdBufParser().parse(BytesIO(trace_v2)))
+    assert parser.threads_pids == {1: 10, 2: 20}
+    assert parser.pids_names == {10: 'launchd', 20: 'app'}
+
+
+def test_feed_filter(trace_v2):
+    parser = KdBufStreamParser(event_filter=KeventFilter(tid=2))
+    assert [e.timestamp for e in parser.feed(trace_v2)] == [2, 4]
+
+
+def test_feed_partial_kevent_dropped(trace_v2):
+    parser = KdBufStreamParser()
+    assert len(parser.feed(trace_v2[:-1])) == 3
+    assert parser.close() == []
+
+
+def test_close_in_header(trace_v2):
+    parser = KdBufStreamParser()
+    parser.feed(trace_v2[:0x100])
+    with pytest.raises(EOFError):
+        parser.close()
+
+
+def test_unknown_version():
+    with pytest.raises(ValueError):
+        KdBufStreamParser().feed(b'\x00\x09\xaa\x55')
+
+
+@pytest.fixture
+def trace_v3():
+    chunks = [b''.join(bytes([i, j]) * 32 for j in range(3)) for i in range(1, 4)]
+    return build_trace_v3(chunks, [(1, 2, 'launchd')], [
+        (TRACEV3_PROCESSES, {'Processes': [{'pid': 2}]}),
+        (TRACEV3_TRACE_CODES, b'0x40c0014\tBSC_open\n'),
+    ], stackshot=TRACEV3_THREADMAP_TAG + b'\x00' * 0x1000)
+
+
+@pytest.mark.parametrize('piece_size', [1, 5, 64, 0x1000, 0x100000])
+def test_feed_v3(trace_v3, piece_size):
+    parser = KdBufStreamParser()
+    events = []
+    for i in range(0, len(trace_v3), piece_size):
+        events += parser.feed(trace_v3[i:i + piece_size])
+    events += parser.close()
+    expected_parser = KdBufParser()
+    assert events == list(expected_parser.parse(BytesIO(trace_v3)))
+    assert len(events) == 9
+    assert parser.threads_pids == {1: 2}
+    assert parser.processes == expected_parser.processes == {'Processes': [{'pid': 2}]}
+    assert parser.trace_codes == '0x40c0014\tBSC_open\n'
+    assert parser.v3_header == expected_parser.v3_header
+
+
+def test_feed_v3_buffer_bounded(trace_v3):
+    parser = KdBufStreamParser()
+    for i in range(0, len(trace_v3), 0x100):
+        parser.feed(trace_v3[i:i + 0x100])
+        assert len(parser._buffer) < 0x100 + 64
+
+
+def test_kevents_pipe():
+    # Larger than the pipe's buffer, so it is written while being parsed.
+    chunks = [b''.join(bytes([i, j]) * 32 for j in range(0x100)) for i in range(1, 9)]
+    trace = build_trace_v3(chunks, [(1, 2, 'launchd')], [(TRACEV3_TRACE_CODES, b'0x40c0014\tBSC_open\n')])
+    assert len(trace) > 0x20000
+    with pipe_reader(trace) as f:
+        assert not f.seekable()
+        events = list(PyKdebugParser().kevents(f))
+    assert events == list(PyKdebugParser().kevents(BytesIO(trace)))
+
+
+def test_feed_v3_unpadded_last_block(trace_v3):
+    # The trace codes block is the last one, it is padded with 5 bytes.
+    trace = trace_v3[:-5]
+    parser = KdBufStreamParser()
+    events = parser.feed(trace) + parser.close()
+    expected_parser = KdBufParser()
+    assert events == list(expected_parser.parse(BytesIO(trace)))
+    assert parser.trace_codes == expected_parser.trace_codes == '0x40c0014\tBSC_open\n'
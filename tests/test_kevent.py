@@ -1,6 +1,12 @@
+import struct
+import subprocess
+import sys
+
 import pytest
 
-from pykdebugparser.kevent import from_kd_buf, Kevent
+from pykdebugparser import kevent
+from pykdebugparser.kevent import from_kd_buf, from_kd_bufs, iter_kd_bufs, kd_bufs_fields, Kevent, KeventFilter, \
+    KD_BUF_FORMAT
 
 
 @pytest.mark.parametrize('raw, parsed', [
@@ -24,3 +30,49 @@ from pykdebugparser.kevent import from_kd_buf, Kevent
 ])
 def test_from_kd_buf(raw, parsed):
     assert from_kd_buf(raw) == parsed
+
+
+def test_iter_kd_bufs():
+    raw = b'\x00' * 64 + b'\xff' * 64
+    assert list(iter_kd_bufs(raw)) == [from_kd_buf(b'\x00' * 64), from_kd_buf(b'\xff' * 64)]
+    assert list(map(Kevent._make, kd_bufs_fields(raw))) == list(iter_kd_bufs(raw))
+
+
+def test_from_kd_bufs():
+    pytest.importorskip('numpy')
+    raw = (b'\x8b\xf3\x8f1\x13\xeb\x03\x00ework_BusinessChat-7.0.1-py2.py3\xdeJ\x88\x00\x00\x00\x00\x00\x90\x00\x01'
+           b'\x03\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00') + b'\xff' * 64
+    kevents = from_kd_bufs(raw)
+    assert len(kevents) == 2
+    assert list(kevents.timestamp) == [0x3eb13318ff38b, 0xffffffffffffffff]
+    assert list(kevents.tid) == [8932062, 0xffffffffffffffff]
+    assert list(kevents.cpuid) == [1, 0xffffffff]
+    assert list(kevents.eventid) == [50397328, 0xfffffffc]
+    assert list(kevents.func_qualifier) == [0, 3]
+    assert list(kevents.args[1]) == [0xffffffffffffffff] * 4
+    assert kevents[0] == from_kd_buf(raw[:64])
+    assert list(kevents[kevents.tid == 8932062]) == [from_kd_buf(raw[:64])]
+    assert list(kevents) == [from_kd_buf(raw[:64]), from_kd_buf(raw[64:])]
+
+
+def test_numpy_imported_lazily():
+    code = 'import sys; import pykdebugparser.kevent; assert "numpy" not in sys.modules'
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+@pytest.mark.parametrize('event_filter, indices', [
+    (KeventFilter(tid=1), [0, 2]),
+    (KeventFilter(classes=[4]), [0, 1]),
+    (KeventFilter(subclasses=[0x40c]), [1]),
+    (KeventFilter(tid=1, classes=[3], subclasses=[0x40c]), [2]),
+])
+def test_iter_kd_bufs_filtered(monkeypatch, use_numpy, event_filter, indices):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(kevent, 'numpy_module', lambda: None)
+    raw = [struct.pack(KD_BUF_FORMAT, i, b'\x00' * 32, tid, debugid, 0, 0)
+           for i, (tid, debugid) in enumerate([(1, 0x40b0001), (2, 0x40c0002), (1, 0x3010090)])]
+    assert list(iter_kd_bufs(b''.join(raw), event_filter)) == [from_kd_buf(raw[i]) for i in indices]
+    assert list(map(Kevent._make, kd_bufs_fields(b''.join(raw), event_filter))) == [from_kd_buf(raw[i]) for i in indices]
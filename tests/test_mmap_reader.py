@@ -0,0 +1,22 @@
+import io
+
+from pykdebugparser.mmap_reader import MmapReader
+
+
+def test_mmap_reader(tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(bytes(range(16)))
+    with open(path, 'rb') as fd:
+        fd.seek(4)
+        reader = MmapReader(fd)
+    with reader:
+        assert len(reader) == 16
+        assert reader.name == str(path)
+        assert reader.tell() == 4
+        assert bytes(reader.read_view(4)) == bytes(range(4, 8))
+        assert reader.read(2) == bytes([8, 9])
+        assert reader.seek(-2, io.SEEK_END) == 14
+        assert reader.read() == bytes([14, 15])
+        assert reader.read(4) == b''
+        reader.seek(0)
+        assert reader.find(bytes([3])) == 3
@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+
+import pytest
+
+from pykdebugparser import parallel_traces_parser
+from pykdebugparser.kevent import Kevent
+from pykdebugparser.parallel_traces_parser import ParallelTracesParser
+from pykdebugparser.trace_codes import default_trace_codes
+from pykdebugparser.traces_parser import TracesParser
+
+BSC_READ = 0x40c000c
+BSC_OPEN = 0x40c0014
+VFS_LOOKUP = 0x3010090
+TRACE_DATA_NEWTHREAD = 0x7000004
+PERF_THD_CSWITCH = 0x25010014
+UNHANDLED = 0x1234560
+
+
+def kevent(i, eventid, func_qualifier, tid):
+    values = (i % 7, tid, i % 5, i % 3)
+    data = b''.join(v.to_bytes(8, 'little') for v in values)
+    return Kevent(i, data, values, tid, eventid | func_qualifier, eventid, func_qualifier)
+
+
+def build_events():
+    events = []
+    for i in range(40):
+        tid = i % 5
+        events += [
+            kevent(len(events), BSC_OPEN, 1, tid),
+            kevent(len(events) + 1, VFS_LOOKUP, 3, tid),
+            kevent(len(events) + 2, TRACE_DATA_NEWTHREAD, 0, tid),
+            kevent(len(events) + 3, PERF_THD_CSWITCH, 0, tid),
+            kevent(len(events) + 4, UNHANDLED, 0, tid),
+            kevent(len(events) + 5, BSC_OPEN, 2, tid),
+            kevent(len(events) + 6, BSC_READ, 1, tid + 1),
+            kevent(len(events) + 7, BSC_READ, 2, tid + 1),
+        ]
+    return events
+
+
+def test_parallel_traces_parser():
+    events = build_events()
+    serial_threads_pids = {}
+    serial = list(TracesParser(default_trace_codes(), serial_threads_pids, {}).feed_generator(events))
+    threads_pids = {}
+    parallel = list(ParallelTracesParser(default_trace_codes(), threads_pids, {}, 2, batch_size=7).feed_generator(events))
+    assert [(str(t), t.ktraces) for t in parallel] == [(str(t), t.ktraces) for t in serial]
+    assert threads_pids == serial_threads_pids
+
+
+@pytest.mark.parametrize('families', [{'bsd'}, {'bsd', 'perf'}, {'fsystem', 'trace'}])
+def test_parallel_traces_parser_families(families):
+    events = build_events()
+    serial = list(TracesParser(default_trace_codes(), {}, {}, families=families).feed_generator(events))
+    parallel = list(ParallelTracesParser(default_trace_codes(), {}, {}, 2, families=families,
+                                         batch_size=7).feed_generator(events))
+    assert [(str(t), t.ktraces) for t in parallel] == [(str(t), t.ktraces) for t in serial]
+
+
+def test_parallel_traces_parser_worker_error():
+    parser = ParallelTracesParser(default_trace_codes(), {}, {}, 2)
+    parser.sharded_families = frozenset(('unknown',))
+    with pytest.raises(KeyError):
+        list(parser.feed_generator([kevent(0, BSC_READ, 1, 1)]))
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork', reason='Workers must run the patched target')
+def test_parallel_traces_parser_worker_exit(monkeypatch):
+    monkeypatch.setattr(parallel_traces_parser, 'WORKERS_POLL_INTERVAL', 0.1)
+    monkeypatch.setattr(parallel_traces_parser, '_parse_shard', lambda *args: os._exit(3))
+    parser = ParallelTracesParser(default_trace_codes(), {}, {}, 2)
+    with pytest.raises(RuntimeError, match='exited with code 3'):
+        list(parser.feed_generator([kevent(0, BSC_READ, 1, 1)]))
@@ -1,8 +1,13 @@
+import asyncio
 from io import BytesIO
 
-from pykdebugparser.kd_buf_parser import RAW_VERSION2_BYTES
-from pykdebugparser.kevent import Kevent
+import pytest
+
+from builders import build_trace_v3, pipe_reader
+from pykdebugparser.kd_buf_parser import RAW_VERSION2_BYTES, TRACEV3_TRACE_CODES
+from pykdebugparser.kevent import Kevent, kd_buf_struct
 from pykdebugparser.pykdebugparser import PyKdebugParser
+from pykdebugparser.trace_handlers import bsd
 
 
 def test_kevents():
@@ -37,3 +42,100 @@ def test_kevents_filter_tid():
     parser.filter_tid = 3
     events = list(parser.kevents(BytesIO(events_buf)))
     assert events == []
+
+
+def test_formatted_kevents_embedded_trace_codes(monkeypatch, tmp_path):
+    monkeypatch.setenv('PYKDEBUGPARSER_CACHE_DIR', str(tmp_path))
+    event = kd_buf_struct.pack(1, b'\x00' * 32, 1, 0x1234560, 0, 0)
+    trace = build_trace_v3([event], [(1, 2, 'launchd')], [(TRACEV3_TRACE_CODES, b'0x1234560\tDEVICE_ONLY\n')])
+    parser = PyKdebugParser()
+    parser.show_timestamp = False
+    parser.show_func_qual = False
+    parser.show_process = False
+    parser.show_args = False
+    assert [e.strip() for e in parser.formatted_kevents(BytesIO(trace))] == ['DEVICE_ONLY (0x1234560)']
+
+
+def test_formatted_traces_lazy_ignored(monkeypatch):
+    monkeypatch.setitem(bsd.handlers, 'BSC_read', lambda parser, events: None)
+    args = b''.join(v.to_bytes(8, 'little') for v in (7, 0x11bf1c000, 25558, 0))
+    events = [kd_buf_struct.pack(1, args, 1, 0x40c000d, 0, 0), kd_buf_struct.pack(2, args, 1, 0x40c000e, 0, 0)]
+    trace = build_trace_v3(events, [(1, 2, 'launchd')])
+    parser = PyKdebugParser()
+    parser.lazy_traces = True
+    assert [t.resolve() for t in parser.traces(BytesIO(trace))] == [None]
+    assert list(parser.formatted_traces(BytesIO(trace))) == []
+
+
+@pytest.mark.parametrize('option, value', [
+    ('lazy_traces', True), ('max_open_age', 100), ('max_open_per_tid', 4), ('evict_on_terminate', True),
+    ('emit_partial_traces', True), ('track_fds', True),
+])
+def test_traces_parallel_unsupported_options(option, value):
+    parser = PyKdebugParser()
+    parser.parallel_traces = 2
+    setattr(parser, option, value)
+    with pytest.raises(ValueError):
+        parser.traces(BytesIO(b''), {})
+
+
+def test_kevents_parallel_fallback(trace_v2, tmp_path):
+    # Only trace version 3 files are filtered in parallel, other inputs are parsed serially.
+    parser = PyKdebugParser()
+    parser.parallel = 2
+    parser.filter_tid = 2
+    expected = [e for e in PyKdebugParser().kevents(BytesIO(trace_v2)) if e.tid == 2]
+    path = tmp_path / 'trace.ktrace'
+    path.write_bytes(trace_v2)
+    with open(path, 'rb') as f:
+        assert list(parser.kevents(f)) == expected
+    assert list(parser.kevents(BytesIO(trace_v2))) == expected
+    with pipe_reader(trace_v2) as f:
+        assert list(parser.kevents(f)) == expected
+
+    trace = build_trace_v3([trace_v2[-4 * 64:]], [(1, 10, 'launchd'), (2, 20, 'app')])
+    path.write_bytes(trace)
+    with open(path, 'rb') as f:
+        assert list(parser.kevents(f)) == expected
+
+
+async def collect(async_generator):
+    return [item async for item in async_generator]
+
+
+def test_akevents_socket(trace_v2):
+    async def replay(reader, writer):
+        # Pieces that don't match the kevents boundaries.
+        for i in range(0, len(trace_v2), 100):
+            writer.write(trace_v2[i:i + 100])
+            await writer.drain()
+        writer.close()
+
+    async def main():
+        server = await asyncio.start_server(replay, '127.0.0.1', 0)
+        async with server:
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            events = await collect(PyKdebugParser().akevents(reader))
+            writer.close()
+        return events
+
+    assert asyncio.run(main()) == list(PyKdebugParser().kevents(BytesIO(trace_v2)))
+
+
+def test_atraces_pipe(trace_v2):
+    async def main():
+        reader = asyncio.StreamReader()
+        loop = asyncio.get_running_loop()
+        with pipe_reader(trace_v2) as f:
+            transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), f)
+            parser = PyKdebugParser()
+            parser.filter_process = 'app'
+            traces = await collect(parser.atraces(reader))
+            transport.close()
+        return traces
+
+    parser = PyKdebugParser()
+    parser.filter_process = 'app'
+    traces = asyncio.run(main())
+    assert [str(t) for t in traces] == [str(t) for t in parser.traces(BytesIO(trace_v2))]
+    assert [t.ktraces[0].tid for t in traces] == [2]
@@ -0,0 +1,30 @@
+import pickle
+from typing import List
+
+import pytest
+
+from pykdebugparser.slots_dataclass import slots_dataclass
+
+
+@slots_dataclass
+class Record:
+    ktraces: List
+    fd: int
+    path: str = None
+
+    def __str__(self):
+        return f'record({self.fd})'
+
+
+def test_slots_dataclass():
+    record = Record([], 3)
+    assert not hasattr(record, '__dict__')
+    assert record.path is None
+    assert record == Record([], 3, None)
+    assert str(record) == 'record(3)'
+    assert repr(record) == "Record(ktraces=[], fd=3, path=None)"
+    assert pickle.loads(pickle.dumps(record)) == record
+    record.path = '/tmp'
+    assert record.path == '/tmp'
+    with pytest.raises(AttributeError):
+        record.name = 'record'
@@ -1,4 +1,8 @@
-from pykdebugparser.trace_codes import from_trace_codes_text
+import os
+import pickle
+
+from pykdebugparser.trace_codes import from_trace_codes_text, from_compiled_trace_codes_file, default_trace_codes, \
+    with_embedded_trace_codes, TraceCodes
 
 import pytest
 
@@ -8,6 +12,60 @@ import pytest
     (('0x80010068 ASPCORE_PUSH_PAGES                                          		'
       '#Params: flow band page size		#Matchby: Arg1'), {0x80010068: 'ASPCORE_PUSH_PAGES'}),
     ('0x40c0548	BSC_stat64\n0x40c054c	BSC_sys_fstat64', {0x40c0548: 'BSC_stat64', 0x40c054c: 'BSC_sys_fstat64'}),
+    ('0x40c0548	BSC_stat64\n\n\x00', {0x40c0548: 'BSC_stat64'}),
 ])
 def test_from_trace_codes_text(text, out):
     assert from_trace_codes_text(text) == out
+
+
+def test_trace_codes_indexes():
+    codes = TraceCodes({0x40c0548: 'BSC_stat64', 0x40c054c: 'BSC_sys_fstat64', 0x3010090: 'VFS_LOOKUP',
+                        0x3010094: 'VFS_LOOKUP'})
+    assert codes.by_name['VFS_LOOKUP'] == (0x3010090, 0x3010094)
+    assert codes.by_class[4] == (0x40c0548, 0x40c054c)
+    assert codes.by_subclass[0x301] == (0x3010090, 0x3010094)
+
+
+def test_from_compiled_trace_codes_file(tmp_path):
+    path = tmp_path / 'trace.codes'
+    path.write_text('0x40c0548	BSC_stat64\n')
+    cache_dir = tmp_path / 'cache'
+    assert from_compiled_trace_codes_file(str(path), str(cache_dir)) == {0x40c0548: 'BSC_stat64'}
+    assert len(os.listdir(cache_dir)) == 1
+    assert from_compiled_trace_codes_file(str(path), str(cache_dir)) == {0x40c0548: 'BSC_stat64'}
+    path.write_text('0x40c054c	BSC_sys_fstat64\n')
+    assert from_compiled_trace_codes_file(str(path), str(cache_dir)) == {0x40c054c: 'BSC_sys_fstat64'}
+
+
+def test_from_compiled_trace_codes_file_not_cached(monkeypatch, tmp_path):
+    monkeypatch.delenv('PYKDEBUGPARSER_CACHE_DIR', raising=False)
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    path = tmp_path / 'trace.codes'
+    path.write_text('0x40c0548	BSC_stat64\n')
+    assert from_compiled_trace_codes_file(str(path)) == {0x40c0548: 'BSC_stat64'}
+    assert os.listdir(tmp_path) == ['trace.codes']
+    monkeypatch.setenv('PYKDEBUGPARSER_CACHE_DIR', str(tmp_path / 'cache'))
+    assert from_compiled_trace_codes_file(str(path)) == {0x40c0548: 'BSC_stat64'}
+    assert len(os.listdir(tmp_path / 'cache')) == 1
+
+
+def test_default_trace_codes_shared():
+    codes = default_trace_codes()
+    assert codes is default_trace_codes()
+    assert codes[0x40c0548] == 'BSC_stat64'
+    assert codes.by_name is default_trace_codes().by_name
+    with pytest.raises(TypeError):
+        codes[0x40c0548] = 'CHANGED'
+    assert pickle.loads(pickle.dumps(codes)) == codes
+
+
+def test_with_embedded_trace_codes(tmp_path):
+    codes = with_embedded_trace_codes('0x40c0548	BSC_stat64_device\n0x1234560	DEVICE_ONLY\n', str(tmp_path))
+    assert codes[0x40c0548] == 'BSC_stat64_device'
+    assert codes[0x1234560] == 'DEVICE_ONLY'
+    assert codes[0x40c054c] == 'BSC_sys_fstat64'
+    assert with_embedded_trace_codes('0x40c0548	BSC_stat64_device\n0x1234560	DEVICE_ONLY\n') is codes
+    assert 0x1234560 not in default_trace_codes()
+    with pytest.raises(TypeError):
+        codes[0x1234560] = 'CHANGED'
@@ -0,0 +1,62 @@
+from io import BytesIO
+
+import pytest
+
+from builders import build_trace_v3
+from pykdebugparser.kd_buf_parser import KdBufParser, TRACEV3_PROCESSES
+from pykdebugparser.kevent import from_kd_buf
+from pykdebugparser.mmap_reader import MmapReader
+from pykdebugparser.trace_index import TraceIndex
+
+
+def kd_buf(timestamp, tid=1):
+    return timestamp.to_bytes(8, 'little') + b'\x00' * 32 + tid.to_bytes(8, 'little') + b'\x00' * 16
+
+
+@pytest.fixture
+def trace():
+    return build_trace_v3([kd_buf(5) + kd_buf(3), kd_buf(7), kd_buf(10) + kd_buf(12) + kd_buf(11)],
+                          [(1, 2, 'launchd')], [(TRACEV3_PROCESSES, {'Processes': []})])
+
+
+def test_build_index(trace):
+    index = KdBufParser().build_index(BytesIO(trace))
+    assert [(c.count, c.min_timestamp, c.max_timestamp) for c in index.chunks] == [(2, 3, 5), (1, 7, 7), (3, 10, 12)]
+    assert index.events_count == 6
+    assert index.size == len(trace)
+    assert trace[index.additional_data_offset:].startswith(TRACEV3_PROCESSES)
+    assert index.chunks_in_range(6, 10) == [1, 2]
+
+
+def test_random_access(trace):
+    reader = BytesIO(trace)
+    parser = KdBufParser()
+    parser.build_index(reader)
+    assert list(parser.events_in_chunk(reader, 2)) == [from_kd_buf(kd_buf(t)) for t in (10, 12, 11)]
+    assert parser.event_at(reader, 2) == from_kd_buf(kd_buf(7))
+    assert parser.event_at(reader, -1) == from_kd_buf(kd_buf(11))
+    with pytest.raises(IndexError):
+        parser.event_at(reader, 6)
+
+
+def test_load_index(trace, tmp_path):
+    path = str(tmp_path / 'trace.ktrace.index')
+    built = KdBufParser().load_index(BytesIO(trace), path)
+    parser = KdBufParser()
+    loaded = parser.load_index(BytesIO(trace), path)
+    assert loaded.chunks == built.chunks
+    assert parser.threads_pids == {1: 2}
+    assert TraceIndex.load(path).chunks == built.chunks
+
+
+def test_load_index_rewritten_trace(tmp_path):
+    # Same size and number of kevents, chunked differently.
+    trace_path = tmp_path / 'trace.ktrace'
+    index_path = str(tmp_path / 'trace.ktrace.index')
+    trace_path.write_bytes(build_trace_v3([kd_buf(5) + kd_buf(3), kd_buf(7)], [(1, 2, 'launchd')]))
+    with MmapReader.open(str(trace_path)) as reader:
+        assert [c.count for c in KdBufParser().load_index(reader, index_path).chunks] == [2, 1]
+    trace_path.write_bytes(build_trace_v3([kd_buf(5), kd_buf(3) + kd_buf(7)], [(1, 2, 'launchd')]))
+    with MmapReader.open(str(trace_path)) as reader:
+        assert [c.count for c in KdBufParser().load_index(reader, index_path).chunks] == [1, 2]
+        assert [c.count for c in KdBufParser().load_index(reader, index_path).chunks] == [1, 2]
@@ -0,0 +1,354 @@
+from functools import partial
+
+import pytest
+
+from pykdebugparser.kevent import Kevent
+from pykdebugparser.trace_codes import default_trace_codes
+from pykdebugparser.trace_handlers.bsd import handle_read
+from pykdebugparser.traces_parser import TracesParser, ThreadEvents, PartialTrace, EvictionReason, LazyTrace, \
+    KtracesRetention, THREAD_EVENTS_COMPACT_SIZE, KEVENT_STORE_SIZE
+
+BSC_READ = 0x40c000c
+UNHANDLED = 0x1234560
+MACH_VM_FAULT = 0x1300008
+TRACE_DATA_NEWTHREAD = 0x7000004
+TRACE_DATA_THREAD_TERMINATE = 0x700000c
+VFS_LOOKUP = 0x3010090
+BSC_OPEN = 0x40c0014
+BSC_OPENAT = 0x40c073c
+BSC_SYS_CLOSE = 0x40c0018
+BSC_SYS_DUP2 = 0x40c0168
+HFS_UPDATE = 0x3018000
+PERF_THD_DATA = 0x25010004
+PERF_THD_CSWITCH = 0x25010014
+
+
+def kevent(eventid, func_qualifier, tid=1, timestamp=0, values=(0, 0, 0, 0)):
+    data = b''.join(v.to_bytes(8, 'little') for v in values)
+    return Kevent(timestamp, data, values, tid, eventid | func_qualifier, eventid, func_qualifier)
+
+
+def test_dispatch_table(traces_parser):
+    traces_parser.enable_family('bsd')
+    assert traces_parser.dispatch_table[BSC_READ] == (handle_read, traces_parser.on_going_events)
+    assert UNHANDLED not in traces_parser.dispatch_table
+
+
+def test_unhandled_events_collected(traces_parser):
+    events = [
+        kevent(BSC_READ, 1),
+        kevent(UNHANDLED, 2),  # End without start.
+        kevent(UNHANDLED, 1),
+        kevent(UNHANDLED, 0, tid=2),
+        kevent(UNHANDLED, 2),
+        kevent(BSC_READ, 2),
+    ]
+    ret = list(traces_parser.feed_generator(events))
+    assert len(ret) == 1
+    assert ret[0].ktraces == [events[0], events[2], events[4], events[5]]
+
+
+def test_nested_events(traces_parser):
+    events = [
+        kevent(BSC_READ, 1, timestamp=0),
+        kevent(BSC_READ + 4, 1, timestamp=1),
+        kevent(UNHANDLED, 0, timestamp=2),
+        kevent(BSC_READ + 4, 2, timestamp=3),
+        kevent(BSC_READ, 2, timestamp=4),
+    ]
+    ret = list(traces_parser.feed_generator(events))
+    assert [t.ktraces for t in ret] == [events[1:4], events]
+    assert traces_parser.on_going_events[1].events == []
+
+
+def test_thread_events_compact():
+    thread = ThreadEvents()
+    thread.start(kevent(BSC_READ, 1))
+    thread.append(kevent(UNHANDLED, 0))
+    start = kevent(BSC_READ + 4, 1)
+    thread.start(start)
+    thread.end(kevent(BSC_READ, 2))
+    for i in range(THREAD_EVENTS_COMPACT_SIZE):
+        thread.append(kevent(UNHANDLED, 0, timestamp=i))
+    end = kevent(BSC_READ + 4, 2)
+    # Events preceding the open start were dropped.
+    assert thread.starts == {BSC_READ + 4: 0}
+    events = thread.end(end)
+    assert events[0] == start
+    assert events[-1] == end
+    assert len(events) == THREAD_EVENTS_COMPACT_SIZE + 3
+    assert thread.events == []
+
+
+def test_evict_by_count(traces_parser):
+    traces_parser.max_open_per_tid = 1
+    traces_parser.emit_partial = True
+    events = [
+        kevent(BSC_READ, 1, timestamp=0),
+        kevent(BSC_READ + 4, 1, timestamp=1),
+        kevent(BSC_READ, 2, timestamp=2),
+    ]
+    ret = list(traces_parser.feed_generator(events))
+    assert ret == [PartialTrace(events[:2], 'BSC_read', EvictionReason.COUNT)]
+    assert traces_parser.evictions[EvictionReason.COUNT] == 1
+    assert traces_parser.open_events == 1
+    assert traces_parser.peak_open_events == 2
+
+
+def test_evict_by_age():
+    parser = TracesParser(default_trace_codes(), {}, {}, max_open_age=100)
+    events = [
+        kevent(BSC_READ, 1, timestamp=0),
+        kevent(BSC_READ + 4, 1, tid=2, timestamp=150),
+        kevent(UNHANDLED, 0, timestamp=200),
+        kevent(BSC_READ, 2, timestamp=201),
+        kevent(BSC_READ + 4, 2, tid=2, timestamp=202),
+    ]
+    ret = list(parser.feed_generator(events))
+    assert [t.ktraces for t in ret] == [[events[1], events[4]]]
+    assert parser.evictions[EvictionReason.AGE] == 1
+    assert parser.open_events == 0
+
+
+def test_evict_on_terminate():
+    parser = TracesParser(default_trace_codes(), {}, {}, evict_on_terminate=True, emit_partial=True)
+    events = [
+        kevent(BSC_READ, 1, tid=5),
+        kevent(TRACE_DATA_THREAD_TERMINATE, 0, tid=6, values=(5, 0, 0, 0)),
+    ]
+    ret = list(parser.feed_generator(events))
+    assert str(ret[0]) == 'Thread terminated tid: 5'
+    assert ret[1] == PartialTrace(events[:1], 'BSC_read', EvictionReason.THREAD_TERMINATE)
+    assert parser.open_events == 0
+
+
+def test_lazy_traces(monkeypatch):
+    handled = []
+    parser = TracesParser(default_trace_codes(), {}, {}, lazy=True)
+    parser.enable_family('bsd')
+    dispatch_handler, state = parser.dispatch_table[BSC_READ]
+    monkeypatch.setitem(parser.dispatch_table, BSC_READ, (
+        partial(dispatch_handler.func, lambda p, e: handled.append(e) or handle_read(p, e)), state))
+    events = [
+        kevent(BSC_READ, 1, timestamp=10, values=(7, 0x11bf1c000, 25558, 0)),
+        kevent(BSC_READ, 2, timestamp=25, values=(0, 25558, 0, 0)),
+    ]
+    trace, = parser.feed_generator(events)
+    assert isinstance(trace, LazyTrace)
+    assert (trace.eventid, trace.tid, trace.duration) == (BSC_READ, 1, 15)
+    assert handled == []
+    assert str(trace) == 'read(7, 0x11bf1c000, 25558), count: 25558'
+    assert trace.size == 25558
+    assert handled == [events]
+
+
+def test_lazy_traces_ignored_by_handler(monkeypatch):
+    parser = TracesParser(default_trace_codes(), {}, {}, lazy=True)
+    parser.enable_family('bsd')
+    dispatch_handler, state = parser.dispatch_table[BSC_READ]
+    monkeypatch.setitem(parser.dispatch_table, BSC_READ, (partial(dispatch_handler.func, lambda p, e: None), state))
+    events = [kevent(BSC_READ, 1, timestamp=10), kevent(BSC_READ, 2, timestamp=25)]
+    trace, = parser.feed_generator(events)
+    assert trace.resolve() is None
+    assert str(trace) == 'None'
+
+
+def test_process_filter():
+    parser = TracesParser(default_trace_codes(), {1: 10, 2: 20}, {10: 'app', 20: 'other'}, process_filter='app')
+    events = [
+        kevent(BSC_READ, 1, tid=1),
+        kevent(BSC_READ, 1, tid=2),
+        kevent(BSC_READ, 2, tid=2),
+        kevent(BSC_READ, 2, tid=1),
+        kevent(TRACE_DATA_NEWTHREAD, 0, tid=2, values=(3, 10, 0, 0)),
+        kevent(BSC_READ, 1, tid=3),
+        kevent(BSC_READ, 2, tid=3),
+    ]
+    ret = list(parser.feed_generator(events))
+    assert [t.ktraces for t in ret] == [[events[0], events[3]], [events[4]], events[5:]]
+    assert 2 not in parser.on_going_events
+
+
+def test_process_filter_perf():
+    parser = TracesParser(default_trace_codes(), {1: 10, 2: 20}, {10: 'app', 20: 'other'}, process_filter='app')
+    events = [
+        kevent(PERF_THD_CSWITCH, 0, tid=2, values=(2, 20, 0, 0)),
+        kevent(PERF_THD_CSWITCH, 0, tid=1, values=(1, 10, 0, 0)),
+        kevent(PERF_THD_DATA, 0, tid=2, values=(10, 3, 0, 0)),
+        kevent(PERF_THD_CSWITCH, 0, tid=3, values=(3, 10, 0, 0)),
+    ]
+    ret = list(parser.feed_generator(events))
+    assert [t.ktraces for t in ret] == [[events[1]], [events[2]], [events[3]]]
+    assert parser.threads_pids[3] == 10
+
+
+def test_families_loaded_on_demand():
+    parser = TracesParser(default_trace_codes(), {}, {}, families={'bsd', 'trace'})
+    assert parser.families == set()
+    events = [kevent(BSC_READ, 1), kevent(MACH_VM_FAULT, 1), kevent(MACH_VM_FAULT, 2), kevent(BSC_READ, 2)]
+    ret = list(parser.feed_generator(events))
+    assert [t.ktraces for t in ret] == [events]
+    assert parser.families == {'bsd'}
+    assert MACH_VM_FAULT not in parser.dispatch_table
+
+
+def test_families_bookkeeping_left_out():
+    events = [
+        kevent(BSC_READ, 1, values=(3, 0x1000, 8, 0)),
+        kevent(TRACE_DATA_NEWTHREAD, 0, values=(2, 10, 0, 0)),
+        kevent(BSC_READ, 2, values=(0, 8, 0, 0)),
+        kevent(BSC_READ, 1, tid=2, values=(4, 0x1000, 8, 0)),
+        kevent(BSC_READ, 2, tid=2, values=(0, 8, 0, 0)),
+    ]
+    full_parser = TracesParser(default_trace_codes(), {1: 10}, {10: 'app'})
+    full = [t for t in full_parser.feed_generator(events) if t.ktraces[0].eventid == BSC_READ]
+    parser = TracesParser(default_trace_codes(), {1: 10}, {10: 'app'}, families={'bsd'})
+    restricted = list(parser.feed_generator(events))
+    assert [t.ktraces for t in restricted] == [t.ktraces for t in full] == [events[0:1] + events[2:3], events[3:]]
+    assert parser.families == {'bsd'}
+    assert parser.threads_pids == full_parser.threads_pids == {1: 10, 2: 10}
+    assert not parser.on_going_events[1].starts
+
+
+def vfs_lookup(vnode_id, path):
+    path = path.encode()
+    chunks = [path[:24]] + [path[i:i + 32] for i in range(24, len(path), 32)]
+    events = []
+    for i, chunk in enumerate(chunks):
+        data = (vnode_id.to_bytes(8, 'little') + chunk.ljust(24, b'\x00')) if i == 0 else chunk.ljust(32, b'\x00')
+        func_qualifier = (1 if i == 0 else 0) | (2 if i == len(chunks) - 1 else 0)
+        events.append(Kevent(0, data, (vnode_id, 0, 0, 0), 1, VFS_LOOKUP | func_qualifier, VFS_LOOKUP, func_qualifier))
+    return events
+
+
+def test_parse_vnodes(traces_parser, monkeypatch):
+    monkeypatch.setattr('pykdebugparser.traces_parser.VNODE_PATHS_CACHE_SIZE', 2)
+    path = '/System/Library/Frameworks/Foundation.framework/Resources/Info.plist'
+    vnodes = traces_parser.parse_vnodes([kevent(UNHANDLED, 0)] + vfs_lookup(0x10, path) + [kevent(BSC_READ, 1)])
+    assert [(v.vnode_id, v.path) for v in vnodes] == [(0x10, path)]
+    traces_parser.parse_vnodes(vfs_lookup(0x20, '/tmp/a'))
+    assert traces_parser.vnode_path(0x10) == path
+    traces_parser.parse_vnodes(vfs_lookup(0x30, '/tmp/b'))
+    assert traces_parser.vnode_path(0x20) is None
+    assert traces_parser.vnode_path(0x10) == path
+    assert traces_parser.vnode_path(0x30) == '/tmp/b'
+
+
+def syscall(eventid, args, result=0, errno=0, lookup=()):
+    return [kevent(eventid, 1, values=args)] + list(lookup) + [kevent(eventid, 2, values=(errno, result, 0, 0))]
+
+
+def test_vnode_path_resolved(monkeypatch):
+    monkeypatch.setattr('pykdebugparser.traces_parser.VNODE_PATHS_CACHE_SIZE', 2)
+    parser = TracesParser(default_trace_codes(), {1: 10}, {10: 'app'})
+    events = (
+        syscall(BSC_OPEN, (0, 0, 0, 0), 3, lookup=vfs_lookup(0x10, '/var/log/system.log')) +
+        [kevent(HFS_UPDATE, 1, values=(0x10, 0, 0, 0)), kevent(HFS_UPDATE, 2, values=(0x10, 0, 0, 0))] +
+        syscall(BSC_OPEN, (0, 0, 0, 0), 4, lookup=vfs_lookup(0x20, '/tmp/a') + vfs_lookup(0x30, '/tmp/b')) +
+        [kevent(HFS_UPDATE, 1, values=(0x10, 0, 0, 0)), kevent(HFS_UPDATE, 2, values=(0x10, 0, 0, 0))]
+    )
+    updates = [t for t in parser.feed_generator(events) if t.ktraces[0].eventid == HFS_UPDATE]
+    assert [t.path for t in updates] == ['/var/log/system.log', None]
+    assert str(updates[0]) == 'hfs_update("/var/log/system.log"), vnode id: 16'
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_track_fds(lazy):
+    parser = TracesParser(default_trace_codes(), {1: 10}, {10: 'app'}, lazy=lazy, track_fds=True)
+    events = (
+        syscall(BSC_OPEN, (0, 0, 0, 0), 3, lookup=vfs_lookup(0x10, '/var/log')) +
+        syscall(BSC_OPENAT, (3, 0, 0, 0), 4, lookup=vfs_lookup(0x20, 'system.log')) +
+        syscall(BSC_READ, (4, 0, 8, 0), 8) +
+        syscall(BSC_SYS_DUP2, (4, 5, 0, 0)) +
+        syscall(BSC_SYS_CLOSE, (4, 0, 0, 0)) +
+        syscall(BSC_READ, (4, 0, 8, 0), errno=9) +
+        syscall(BSC_READ, (5, 0, 8, 0), 8)
+    )
+    reads = [t for t in parser.feed_generator(events) if t.ktraces[0].eventid == BSC_READ]
+    assert [t.path for t in reads] == ['/var/log/system.log', None, '/var/log/system.log']
+    assert str(reads[0]) == 'read(4, 0x0, 8), count: 8, path: "/var/log/system.log"'
+    assert parser.fd_table.pids_fds == {10: {3: '/var/log', 5: '/var/log/system.log'}}
+
+
+def test_perf_event_callstack(traces_parser):
+    events = [
+        kevent(0x25000000, 1, values=(0x9, 1, 0, 0)),
+        kevent(0x25010004, 0, values=(10, 1, 0, 1)),
+        kevent(0x25020018, 0, values=(0x5, 6, 0, 0)),
+        kevent(0x25020010, 0, values=(1, 2, 3, 4)),
+        kevent(UNHANDLED, 0),
+        kevent(0x25020010, 0, values=(5, 6, 0, 0)),
+        kevent(0x25000000, 2),
+    ]
+    event = traces_parser.parse_event_list(events)
+    assert event.cs_frames == [1, 2, 3, 4, 5, 6]
+    assert (event.th_info.pid, event.th_info.tid) == (10, 1)
+
+
+def retention_events():
+    return [
+        kevent(BSC_READ, 1, timestamp=1, values=(3, 0x1000, 8, 0)),
+        kevent(UNHANDLED, 0, timestamp=2),
+        kevent(TRACE_DATA_NEWTHREAD, 0, timestamp=3, values=(2, 10, 0, 0)),
+        kevent(BSC_READ, 2, timestamp=4, values=(0, 8, 0, 0)),
+        kevent(TRACE_DATA_NEWTHREAD, 0, timestamp=5, values=(3, 10, 0, 0)),
+    ]
+
+
+@pytest.mark.parametrize('retention, expected', [
+    (KtracesRetention.FULL, [[2], [0, 1, 3], [4]]),
+    (KtracesRetention.BOUNDARIES, [[2], [0, 3], [4]]),
+    (KtracesRetention.NONE, [[], [], []]),
+    (KtracesRetention.INDICES, [[2], [0, 1, 3], [4]]),
+])
+def test_ktraces_retention(retention, expected):
+    events = retention_events()
+    parser = TracesParser(default_trace_codes(), {}, {}, retention=retention.value)
+    traces = list(parser.feed_generator(events))
+    assert [t.ktraces for t in traces] == [[events[i] for i in indices] for indices in expected]
+    assert str(traces[1]) == 'read(3, 0x1000, 8), count: 8'
+
+
+def test_ktraces_retention_indices():
+    events = retention_events()
+    parser = TracesParser(default_trace_codes(), {}, {}, retention=KtracesRetention.INDICES)
+    read = list(parser.feed_generator(events))[1]
+    assert read.ktraces.store is parser.on_going_events[1].store
+    assert len(read.ktraces) == 3
+    assert read.ktraces[-1] == events[3]
+    assert read.ktraces[1:] == events[1:2] + events[3:4]
+
+
+def test_ktraces_retention_indices_stores_freed():
+    parser = TracesParser(default_trace_codes(), {}, {}, retention=KtracesRetention.INDICES)
+    events = []
+    for i in range(KEVENT_STORE_SIZE + 1):
+        events += [kevent(BSC_READ, 1, values=(3, 0x1000, 8, 0)), kevent(BSC_READ, 2, values=(0, 8, 0, 0)),
+                   kevent(TRACE_DATA_NEWTHREAD, 0, values=(2, 10, 0, 0))]
+    traces = list(parser.feed_generator(events))
+    reads, newthreads = traces[::2], traces[1::2]
+    assert reads[-1].ktraces == events[-3:-1]
+    assert newthreads[-1].ktraces == events[-1:]
+    # Stores are started again once full, the traces keep the older ones.
+    assert reads[-1].ktraces.store is not reads[0].ktraces.store
+    assert newthreads[-1].ktraces.store is not newthreads[0].ktraces.store
+    assert len(parser.on_going_events[1].store) < KEVENT_STORE_SIZE
+
+
+@pytest.mark.parametrize('retention, expected', [
+    (KtracesRetention.FULL, [0, 1, 2]),
+    (KtracesRetention.BOUNDARIES, [0, 2]),
+    (KtracesRetention.NONE, []),
+    (KtracesRetention.INDICES, [0, 1, 2]),
+])
+def test_ktraces_retention_partial(retention, expected):
+    parser = TracesParser(default_trace_codes(), {}, {}, max_open_per_tid=1, emit_partial=True, retention=retention)
+    events = [kevent(BSC_READ, 1), kevent(UNHANDLED, 0), kevent(BSC_OPEN, 1), kevent(BSC_OPEN, 2)]
+    partial_read = list(parser.feed_generator(events))[0]
+    assert isinstance(partial_read, PartialTrace)
+    assert partial_read.ktraces == [events[i] for i in expected]
+
+
+def test_ktraces_retention_lazy():
+    with pytest.raises(ValueError):
+        TracesParser(default_trace_codes(), {}, {}, lazy=True, retention=KtracesRetention.NONE)